@@ -0,0 +1,116 @@
+# quickmeet-backend/action_items.py
+import re
+
+# Abbreviations whose period does not end a sentence
+ABBREVIATIONS = ("Dr", "Mr", "Mrs", "Ms", "Prof", "St", "Jr", "Sr", "vs", "etc", "e.g", "i.e")
+
+# A period ends a sentence when whitespace and a capital letter (or the end of the line)
+# follow it and it does not close one of the ABBREVIATIONS, so "Dr. Smith" and "v1.2" stay
+# inside the task. Lookbehinds must have a fixed width, so there is one per abbreviation length.
+SENTENCE_END = "".join(
+    rf"(?<!\b(?:{'|'.join(re.escape(a) for a in ABBREVIATIONS if len(a) == width)}))"
+    for width in sorted({len(a) for a in ABBREVIATIONS})
+) + r"\.(?=\s+[A-Z]|[ \t]*$)"
+
+# One combined pattern, compiled once, so the text is scanned in a single pass.
+# The alternatives mirror the original rules: "<Name> will <task>.",
+# "<Name> is responsible for <task>." and "Deadline: <Month> <day>".
+# The shared "\b(?=[A-Z])" prefix rejects most positions before trying either branch,
+# and the task is an unrolled loop up to the first SENTENCE_END or end of line instead of a lazy ".*?".
+ACTION_PATTERN = re.compile(
+    r"\b(?=[A-Z])(?:"
+    r"(?P<owner>[A-Z][a-z]+)\s+(?:will|is\s+responsible\s+for)\s+"
+    rf"(?P<task>[^.\n]*(?:(?!{SENTENCE_END})\.[^.\n]*)*)(?:{SENTENCE_END}|$)"
+    r"|Deadline:\s*(?P<deadline>\w+\s+\d{1,2})"
+    r")",
+    re.MULTILINE,
+)
+
+# Owners that refer back to the previously named person
+PRONOUNS = frozenset({"He", "She", "They"})
+
+NO_ACTION_ITEMS = "No specific action items found."
+
+
+def extract(text, source=None):
+    """
+    Extracts action items from text in one pass.
+    Returns a list of records: {"owner", "task", "deadline", "start", "end"} where
+    start/end is the character span of the match in text. A "Deadline:" is attached
+    to the preceding task; pronoun owners resolve to the last named owner.
+    """
+    records = []
+    last_owner = None
+    for match in ACTION_PATTERN.finditer(text):
+        deadline = match.group("deadline")
+        if deadline is not None:
+            if records and records[-1]["deadline"] is None and records[-1]["task"] is not None:
+                records[-1]["deadline"] = deadline
+                records[-1]["end"] = match.end()
+            else:
+                records.append(_record(None, None, deadline, match, source))
+            continue
+
+        owner = match.group("owner")
+        if owner in PRONOUNS:
+            owner = last_owner or "Unknown"
+        else:
+            last_owner = owner
+        records.append(_record(owner, match.group("task").strip(), None, match, source))
+    return records
+
+
+def _record(owner, task, deadline, match, source):
+    record = {"owner": owner, "task": task, "deadline": deadline, "start": match.start(), "end": match.end()}
+    if source:
+        record["source"] = source
+    return record
+
+
+def merge(*record_lists):
+    """
+    Concatenates record lists, dropping tasks already seen for the same owner.
+    Fields only the dropped duplicate has (e.g. the audio position of a transcript
+    match) are copied to the record that is kept.
+    """
+    seen = {}
+    merged = []
+    for records in record_lists:
+        for record in records:
+            key = (record["owner"], (record["task"] or "").lower(), record["deadline"])
+            if key in seen:
+                for field, value in record.items():
+                    seen[key].setdefault(field, value)
+                continue
+            seen[key] = record
+            merged.append(record)
+    return merged
+
+
+def format_item(record):
+    """Formats one record as a "- Owner: task" line."""
+    if record.get("task") is None:
+        return f"- Deadline: {record['deadline']}"
+    line = f"- {record['owner']}: {record['task']}"
+    if record.get("deadline"):
+        line += f" (Deadline: {record['deadline']})"
+    return line
+
+
+def format_action_items(records):
+    """Formats records as the newline-separated text used by the UI and exports."""
+    return "\n".join(format_item(r) for r in records) if records else NO_ACTION_ITEMS
+
+
+def action_item_lines(action_items):
+    """
+    Returns display lines for action items given either structured records
+    or the legacy newline-separated string.
+    """
+    if not action_items:
+        return []
+    if isinstance(action_items, str):
+        if action_items.strip() == NO_ACTION_ITEMS:
+            return []
+        return [line.strip() for line in action_items.splitlines() if line.strip()]
+    return [format_item(record) for record in action_items]
@@ -1,17 +1,166 @@
-from flask import Flask, request, send_file, jsonify, render_template
+from flask import Flask, request, send_file, jsonify, render_template, Response, stream_with_context, g
 from flask_cors import CORS
 import os
 import io
-from email_sender import send_meeting_email
-from transcriber import transcribe_audio
-from nlp_processing import generate_summary, extract_action_items
-from ppt_generator import create_ppt
-from pdf_generator import generate_pdf_from_files
-from semantic_search import perform_semantic_search
+import zipfile
+import time
+import json
+from outbox import outbox
+from transcriber import transcribe_audio, transcribe_s3_audio, s3, BUCKET_NAME, watcher as transcription_watcher
+from nlp_processing import generate_summary, extract_action_item_records, stream_summary
+from action_items import format_action_items
+from ppt_generator import create_ppt, create_ppts, cache as ppt_cache
+from pdf_generator import generate_meeting_pdf, cache as pdf_cache, ENGINES as PDF_ENGINES
+from semantic_search import perform_semantic_search, index_meeting_text
+from vector_index import MAX_TOP_K
+from model_registry import registry
+from jobs import queue as job_queue, QueueFull
+from transcript_cache import cache as transcript_cache, save_and_hash
+from streaming_upload import UploadManager, UploadError, CHUNK_SIZE
+from transcription_watcher import estimate_duration_from_size
+from summary_cache import cache as summary_cache
+from embedding_store import store as embedding_store
+from meeting_store import store as meeting_store, MeetingNotFound, TRANSCRIPT, SUMMARY, ACTION_ITEMS, PPT, VIDEO
+from heygen_client import poller as video_poller
+from video_jobs import jobs as video_jobs, segment_cache as video_segment_cache
+from video import read_input_files
+from pipeline import process_meeting
+from metrics import registry as metrics_registry, http_request_seconds
+from transcript_model import Transcript, save_for_meeting as save_transcript_timing, load_for_meeting as load_transcript
+from live_transcription import sessions as live_sessions, LiveError, MAX_CHUNK_BYTES as LIVE_CHUNK_BYTES
+import aws_clients
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Resumable uploads streamed straight into S3 multipart uploads
+uploads = UploadManager(s3, BUCKET_NAME)
+
+# Load models in the background instead of at import; /readyz reports when they are warm.
+# This trades memory for startup time: the loading starts in each serving process, so under
+# a pre-forking server every worker holds its own copy (gunicorn.conf.py refuses it with preload_app)
+PRELOAD_IN_BACKGROUND = os.getenv("QUICKMEET_PRELOAD_IN_BACKGROUND", "0") == "1"
+# gunicorn.conf.py sets this to 0 and starts them in each worker process instead
+START_WORKERS_ON_IMPORT = os.getenv("QUICKMEET_START_WORKERS_ON_IMPORT", "1") == "1"
+# Create the AWS and HeyGen clients and import python-pptx before the first request needs them
+WARMUP = os.getenv("QUICKMEET_WARMUP", "0") == "1"
+
+def warm_up():
+    """Does the work deferred from import up front, so no request pays for it."""
+    aws_clients.warm_up()
+    video_poller.client.session
+    import pptx  # noqa: F401
+
+def start_background_workers():
+    """
+    Starts what must run in every serving process: delivery of emails left in the
+    outbox by a previous run, failing video jobs a stopped process left unfinished, the
+    sweep finishing idle live meetings, and model warm-up when it was deferred. Threads
+    do not survive fork(), so pre-forking servers call this in each worker.
+    """
+    outbox.start()
+    video_jobs.recover()
+    live_sessions.start()
+    if not registry.ready():
+        registry.preload_async()
+    if WARMUP:
+        warm_up()
+
+# Warm the models listed in QUICKMEET_PRELOAD_MODELS before serving requests. Under
+# gunicorn with preload this runs once in the master, and the forked workers share the
+# weights copy-on-write.
+if not PRELOAD_IN_BACKGROUND:
+    registry.preload()
+
+if START_WORKERS_ON_IMPORT:
+    start_background_workers()
+
+def _cache_stats():
+    return {
+        "summaries": summary_cache.stats(),
+        "transcripts": transcript_cache.stats(),
+        "embeddings": embedding_store.stats(),
+        "pdfs": pdf_cache.stats(),
+        "ppts": ppt_cache.stats(),
+        "video_segments": video_segment_cache.stats(),
+    }
+
+def _cache_counts(field):
+    # The summary cache splits its hits between memory and disk
+    counts = {}
+    for name, stats in _cache_stats().items():
+        value = stats.get(field)
+        if value is None and field == "hits":
+            value = stats["memory_hits"] + stats["disk_hits"]
+        counts[(name,)] = value
+    return counts
+
+def _queue_depths():
+    jobs, emails = job_queue.stats(), outbox.stats()
+    return {
+        ("jobs", "queued"): jobs["queued"],
+        ("jobs", "running"): jobs["running"],
+        **{("outbox", state): emails[state] for state in ("queued", "sending", "retrying", "dead")},
+        ("transcriptions", "in_flight"): transcription_watcher.in_flight(),
+        ("videos", "in_flight"): video_poller.stats()["in_flight"],
+        ("uploads", "in_progress"): uploads.stats()["in_progress"],
+        ("live_meetings", "in_progress"): live_sessions.stats()["live"],
+    }
+
+# Gauges read from the live queues and caches on every scrape of /metrics
+metrics_registry.gauge("quickmeet_queue_depth", "Items waiting or in progress per queue", ["queue", "state"],
+                       collect=_queue_depths)
+metrics_registry.gauge("quickmeet_cache_hit_ratio", "Hits per lookup since the process started", ["cache"],
+                       collect=lambda: {(name,): stats["hit_ratio"] for name, stats in _cache_stats().items()})
+metrics_registry.collected_counter("quickmeet_cache_hits_total", "Cache lookups answered from the cache", ["cache"],
+                                   collect=lambda: _cache_counts("hits"))
+metrics_registry.collected_counter("quickmeet_cache_misses_total", "Cache lookups that missed", ["cache"],
+                                   collect=lambda: _cache_counts("misses"))
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request_latency(response):
+    start = g.pop("request_start", None)
+    if start is not None:
+        # The route pattern, not the raw path, so ids do not create a series per request
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        http_request_seconds.observe(time.perf_counter() - start, method=request.method, endpoint=endpoint,
+                                     status=response.status_code)
+    return response
+
+def _meeting_for(data, transcript=None, summary=None):
+    """
+    Returns the meeting id a request refers to. Clients that only send a transcript (or
+    only a summary) get the meeting workspace holding that text, created on first use;
+    unknown ids raise MeetingNotFound.
+    """
+    meeting_id = data.get("meeting_id")
+    if meeting_id:
+        if not meeting_store.exists(meeting_id):
+            raise MeetingNotFound(f"Unknown meeting: {meeting_id}")
+        return meeting_id
+    if transcript:
+        return meeting_store.for_content(TRANSCRIPT, transcript)
+    return meeting_store.for_content(SUMMARY, summary)
+
+def _save_transcript(meeting_id, transcript):
+    # Timings first, so indexing can link transcript sentences to the audio
+    save_transcript_timing(meeting_id, transcript)
+    meeting_store.write(meeting_id, TRANSCRIPT, transcript.text)
+    _index_for_search(meeting_id, "transcript", transcript.text)
+
+def _index_for_search(meeting_id, source, text):
+    # Search indexing is best effort; it must never fail the request that produced the text
+    if not meeting_id or not text:
+        return
+    try:
+        index_meeting_text(meeting_id, source, text, date=meeting_store.meta(meeting_id).get("date"))
+    except Exception as e:
+        print(f"⚠️ Indexing {source} for meeting {meeting_id} failed: {e}")
+
 @app.route('/')
 def index():
     return render_template("index.html")  # For initial upload
@@ -21,6 +170,15 @@ def index():
 def dashboard():
     return render_template("dashboard.html")  # After transcription
 
+@job_queue.task("transcribe_audio")
+def transcribe_audio_task(meeting_id, file_path, audio_hash=None, filename=None):
+    """Background job: runs the full transcription flow for an uploaded file."""
+    transcript = transcribe_audio(file_path, audio_hash=audio_hash, original_filename=filename)
+    if not transcript:
+        raise Exception("Transcription failed")
+    _save_transcript(meeting_id, transcript)
+    return {"transcript": transcript.text, "meeting_id": meeting_id, "speakers": transcript.speakers}
+
 @app.route('/transcribe_audio', methods=['POST'])
 def transcribe_audio_endpoint():
     if 'file' not in request.files:
@@ -31,16 +189,134 @@ def transcribe_audio_endpoint():
         return jsonify({"message": "No file selected"}), 400
 
     upload_folder = os.path.join(os.getcwd(), 'uploads')
-    os.makedirs(upload_folder, exist_ok=True)
-    file_path = os.path.join(upload_folder, audio_file.filename)
-    audio_file.save(file_path)
+    # Hash the audio while it is written so duplicates are recognised by content, not by name
+    extension = os.path.splitext(audio_file.filename)[1].lower()
+    audio_hash, _, file_path = save_and_hash(audio_file.stream, upload_folder, suffix=extension)
+    # Every upload gets its own workspace, even when the recording was seen before
+    meeting_id = meeting_store.create(filename=audio_file.filename, audio_sha256=audio_hash)
 
-    transcript = transcribe_audio(file_path)
+    cached = transcript_cache.get(audio_hash)
+    if cached:
+        transcript = Transcript.from_cache_entry(cached)
+        _save_transcript(meeting_id, transcript)
+        return jsonify({"transcript": transcript.text, "meeting_id": meeting_id, "speakers": transcript.speakers,
+                        "cached": True})
 
-    if transcript:
-        return jsonify({"transcript": transcript})
-    else:
-        return jsonify({"message": "Transcription failed"}), 500
+    # Transcription takes minutes; run it in the background and let the client poll /jobs/<id>.
+    # The same recording already being transcribed is not sent to Transcribe again.
+    try:
+        job_id, job_args, queued = job_queue.submit_once(
+            "transcribe_audio", audio_hash, meeting_id=meeting_id, file_path=file_path,
+            audio_hash=audio_hash, filename=audio_file.filename)
+    except QueueFull as e:
+        meeting_store.delete(meeting_id)
+        return jsonify({"message": f"Server busy, try again later: {e}"}), 503
+    return _transcription_job_response(job_id, job_args, queued, meeting_id)
+
+def _transcription_job_response(job_id, job_args, queued, meeting_id, **extra):
+    # A duplicate of a recording in flight shares the meeting of the job transcribing it
+    if not queued:
+        meeting_store.delete(meeting_id)
+        meeting_id = job_args["meeting_id"]
+    return jsonify({"job_id": job_id, "meeting_id": meeting_id, "status_url": f"/jobs/{job_id}",
+                    **({} if queued else {"deduplicated": True}), **extra}), 202
+
+@job_queue.task("transcribe_s3_audio")
+def transcribe_s3_audio_task(meeting_id, s3_uri, audio_hash, audio_duration=None, filename=None, size_bytes=None):
+    """Background job: transcribes a recording that a streaming upload already put in S3."""
+    transcript = transcribe_s3_audio(s3_uri, audio_hash, audio_duration=audio_duration,
+                                     filename=filename, size_bytes=size_bytes)
+    if not transcript:
+        raise Exception("Transcription failed")
+    _save_transcript(meeting_id, transcript)
+    return {"transcript": transcript.text, "meeting_id": meeting_id, "speakers": transcript.speakers}
+
+def _upload_error_response(e):
+    return jsonify({"message": str(e), **e.details}), e.status
+
+@app.route('/uploads', methods=['POST'])
+def create_upload_endpoint():
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = uploads.create(filename=data.get("filename"), expected_size=data.get("size"))
+    except Exception as e:
+        return jsonify({"message": f"Could not start upload: {e}"}), 500
+    return jsonify({**upload.status(), "chunk_size": CHUNK_SIZE}), 201
+
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status_endpoint(upload_id):
+    # Clients resume an interrupted upload from next_offset
+    try:
+        return jsonify(uploads.get(upload_id).status())
+    except UploadError as e:
+        return _upload_error_response(e)
+
+@app.route('/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk_endpoint(upload_id):
+    try:
+        offset = int(request.args.get("offset", "0"))
+    except ValueError:
+        return jsonify({"message": "'offset' must be an integer"}), 400
+    try:
+        upload = uploads.get(upload_id)
+        # Read the raw body stream so Werkzeug never buffers the chunk as form data
+        upload.write_chunk(request.stream, offset)
+        return jsonify(upload.status())
+    except UploadError as e:
+        return _upload_error_response(e)
+    except Exception as e:
+        return jsonify({"message": f"Chunk upload failed: {e}"}), 500
+
+@app.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload_endpoint(upload_id):
+    uploads.discard(upload_id)
+    return jsonify({"message": "Upload aborted"})
+
+@app.route('/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload_endpoint(upload_id):
+    try:
+        upload = uploads.complete(upload_id)
+    except UploadError as e:
+        return _upload_error_response(e)
+    except Exception as e:
+        return jsonify({"message": f"Could not complete upload: {e}"}), 500
+
+    upload_stats = upload.status()
+    meeting_id = meeting_store.create(filename=upload.filename, audio_sha256=upload.sha256)
+    cached = transcript_cache.get(upload.sha256)
+    if cached:
+        # Duplicate recording: drop the new copy and answer from the cache
+        s3.delete_object(Bucket=BUCKET_NAME, Key=upload.key)
+        transcript = Transcript.from_cache_entry(cached)
+        _save_transcript(meeting_id, transcript)
+        return jsonify({"transcript": transcript.text, "meeting_id": meeting_id, "speakers": transcript.speakers,
+                        "cached": True, "upload": upload_stats})
+
+    try:
+        job_id, job_args, queued = job_queue.submit_once(
+            "transcribe_s3_audio",
+            upload.sha256,
+            meeting_id=meeting_id,
+            s3_uri=upload.s3_uri,
+            audio_hash=upload.sha256,
+            audio_duration=estimate_duration_from_size(upload.received_bytes),
+            filename=upload.filename,
+            size_bytes=upload.received_bytes,
+        )
+    except QueueFull as e:
+        meeting_store.delete(meeting_id)
+        return jsonify({"message": f"Server busy, try again later: {e}"}), 503
+    if not queued:
+        # The same recording is already being transcribed from another upload
+        s3.delete_object(Bucket=BUCKET_NAME, Key=upload.key)
+    return _transcription_job_response(job_id, job_args, queued, meeting_id, upload=upload_stats)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status_endpoint(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job)
 
 @app.route('/generate_summary', methods=['POST'])
 def generate_summary_endpoint():
@@ -49,20 +325,62 @@ def generate_summary_endpoint():
     if not transcript:
         return jsonify({"message": "No transcript provided"}), 400
     try:
-        summary_text = generate_summary(transcript)
-        return jsonify({"summary": summary_text})
+        meeting_id = _meeting_for(data, transcript)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    try:
+        summary_text, timings = generate_summary(transcript, meeting_id, return_timings=True)
+        _index_for_search(meeting_id, "summary", summary_text)
+        return jsonify({"summary": summary_text, "meeting_id": meeting_id, "timings": timings})
     except Exception as e:
         return jsonify({"message": f"Summary generation failed: {e}"}), 500
 
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/generate_summary/stream', methods=['POST'])
+def generate_summary_stream_endpoint():
+    data = request.get_json()
+    transcript = data.get("transcript")
+    if not transcript:
+        return jsonify({"message": "No transcript provided"}), 400
+    try:
+        meeting_id = _meeting_for(data, transcript)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+
+    def events():
+        # Sent straight away so the client sees the first byte before any inference
+        yield _sse("start", {"meeting_id": meeting_id})
+        for event, payload in stream_summary(transcript, meeting_id):
+            if event == "summary":
+                _index_for_search(meeting_id, "summary", payload["summary"])
+                payload["meeting_id"] = meeting_id
+            yield _sse(event, payload)
+        yield _sse("done", {})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.route('/extract_action_items', methods=['POST'])
 def extract_action_items_endpoint():
     data = request.get_json()
     summary_text = data.get("summary")
-    if not summary_text:
-        return jsonify({"message": "No summary provided"}), 400
+    transcript = data.get("transcript")
+    if not summary_text and not transcript:
+        return jsonify({"message": "No summary or transcript provided"}), 400
     try:
-        action_items = extract_action_items(summary_text)
-        return jsonify({"action_items": action_items})
+        meeting_id = _meeting_for(data, transcript, summary_text)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    try:
+        records = extract_action_item_records(summary_text, transcript, meeting_id)
+        action_items_text = format_action_items(records)
+        _index_for_search(meeting_id, "action_items", action_items_text)
+        return jsonify({"action_items": action_items_text, "records": records, "meeting_id": meeting_id})
     except Exception as e:
         return jsonify({"message": f"Action items extraction failed: {e}"}), 500
 
@@ -70,9 +388,10 @@ def extract_action_items_endpoint():
 def generate_ppt_endpoint():
     data = request.get_json()
     summary_text = data.get("summary", "")
-    action_items_text = data.get("action_items", "")
-    
-    ppt_io = create_ppt(summary_text, action_items_text)
+    # Either structured records or the newline-separated text
+    action_items = data.get("records") or data.get("action_items", "")
+
+    ppt_io = create_ppt(summary_text, action_items)
 
     return send_file(
         ppt_io,
@@ -81,37 +400,99 @@ def generate_ppt_endpoint():
         mimetype="application/vnd.openxmlformats-officedocument.presentationml.presentation"
     )
 
+@app.route('/generate_ppt/batch', methods=['POST'])
+def generate_ppt_batch_endpoint():
+    # Decks for many meetings in one call, returned as a zip of <meeting_id>.pptx files
+    data = request.get_json(silent=True) or {}
+    meeting_ids = data.get("meeting_ids")
+    if not meeting_ids or not isinstance(meeting_ids, list):
+        return jsonify({"message": "Invalid or missing 'meeting_ids' field"}), 400
+    decks = []
+    for meeting_id in meeting_ids:
+        try:
+            summary_text = meeting_store.read(meeting_id, SUMMARY)
+            action_items = meeting_store.read_json(meeting_id, ACTION_ITEMS, default=[])
+        except MeetingNotFound as e:
+            return jsonify({"message": str(e)}), 404
+        if summary_text is None:
+            return jsonify({"message": f"Meeting {meeting_id} has no summary yet"}), 409
+        decks.append((summary_text, action_items))
+
+    try:
+        rendered = create_ppts(decks)
+    except Exception as e:
+        return jsonify({"message": f"PPT generation failed: {e}"}), 500
+
+    zip_io = io.BytesIO()
+    with zipfile.ZipFile(zip_io, "w", zipfile.ZIP_STORED) as archive:
+        for meeting_id, ppt_data in zip(meeting_ids, rendered):
+            meeting_store.write(meeting_id, PPT, ppt_data)
+            archive.writestr(f"{meeting_id}.pptx", ppt_data)
+    zip_io.seek(0)
+    return send_file(zip_io, as_attachment=True, download_name="meetings.zip", mimetype="application/zip")
+
 @app.route('/send_email', methods=['POST'])
 def send_email_endpoint():
     data = request.get_json()
     to_addresses = data.get("to_addresses")
     subject = data.get("subject", "Meeting Summary & Action Items")
     summary_text = data.get("summary", "")
-    action_items_text = data.get("action_items", "")
+    action_items = data.get("records") or data.get("action_items", "")
 
     if not to_addresses or not isinstance(to_addresses, list):
         return jsonify({"message": "Invalid or missing 'to_addresses' field"}), 400
 
+    # Delivery (with retries) happens in the background; poll /outbox/<id> for the outcome
     try:
-        response = send_meeting_email(to_addresses, subject, summary_text, action_items_text)
-        return jsonify({"message": "Email sent successfully", "response": response})
+        outbox_id = outbox.enqueue(to_addresses, subject, summary_text, action_items)
     except Exception as e:
-        return jsonify({"message": f"Failed to send email: {e}"}), 500
+        return jsonify({"message": f"Failed to queue email: {e}"}), 500
+    return jsonify({"message": "Email queued for delivery", "outbox_id": outbox_id,
+                    "status_url": f"/outbox/{outbox_id}"}), 202
+
+@app.route('/outbox', methods=['GET'])
+def outbox_stats_endpoint():
+    # Message counts per delivery state
+    return jsonify(outbox.stats())
+
+@app.route('/outbox/<outbox_id>', methods=['GET'])
+def outbox_status_endpoint(outbox_id):
+    message = outbox.get(outbox_id)
+    if message is None:
+        return jsonify({"message": "Email not found"}), 404
+    return jsonify(message)
+
+@app.route('/outbox/<outbox_id>/retry', methods=['POST'])
+def outbox_retry_endpoint(outbox_id):
+    # Requeues a dead-lettered email
+    if not outbox.requeue(outbox_id):
+        return jsonify({"message": "Only dead-lettered emails can be retried"}), 409
+    return jsonify(outbox.get(outbox_id))
 
 @app.route('/generate_pdf', methods=['GET'])
 def generate_pdf_endpoint():
+    meeting_id = request.args.get("meeting_id")
+    if not meeting_id:
+        return jsonify({"message": "No meeting_id provided"}), 400
+    engine = request.args.get("engine")
+    if engine and engine not in PDF_ENGINES:
+        return jsonify({"message": f"Unknown PDF engine: {engine}"}), 400
     try:
-        pdf_data = generate_pdf_from_files()
+        pdf_data = generate_meeting_pdf(meeting_id, engine=engine)
         return send_file(
             io.BytesIO(pdf_data),
             as_attachment=True,
             download_name="meeting_summary.pdf",
             mimetype="application/pdf"
         )
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    except FileNotFoundError:
+        return jsonify({"message": "Generate the summary and action items first"}), 409
     except Exception as e:
         return jsonify({"message": f"PDF generation failed: {e}"}), 500
 
-# ✅ Final semantic search route with static file saving for frontend
+# ✅ Top-k semantic search across every indexed meeting
 @app.route('/semantic_search', methods=['POST'])
 def semantic_search_endpoint():
     data = request.get_json()
@@ -119,18 +500,225 @@ def semantic_search_endpoint():
     if not query:
         return jsonify({"message": "No query provided"}), 400
     try:
-        results = perform_semantic_search(query)
+        top_k = int(data.get("top_k", 5))
+    except (TypeError, ValueError):
+        return jsonify({"message": "'top_k' must be an integer"}), 400
+    if top_k < 1:
+        return jsonify({"message": "'top_k' must be at least 1"}), 400
+    top_k = min(top_k, MAX_TOP_K)
+    meeting_ids = data.get("meeting_ids") or ([data["meeting_id"]] if data.get("meeting_id") else None)
+    try:
+        start = time.perf_counter()
+        results = perform_semantic_search(
+            query,
+            top_k=top_k,
+            meeting_ids=meeting_ids,
+            date_from=data.get("date_from"),
+            date_to=data.get("date_to"),
+            sources=data.get("sources"),
+        )
+        took_ms = (time.perf_counter() - start) * 1000
+        return jsonify({"query": query, "results": results, "took_ms": round(took_ms, 1)})
+    except Exception as e:
+        return jsonify({"message": f"Semantic search failed: {e}"}), 500
 
-        # Save to static/search_results.txt for frontend
-        static_dir = os.path.join(os.getcwd(), "static")
-        os.makedirs(static_dir, exist_ok=True)
-        result_path = os.path.join(static_dir, "search_results.txt")
-        with open(result_path, "w") as f:
-            f.write(results)
+@app.route('/meetings/<meeting_id>', methods=['GET'])
+def meeting_endpoint(meeting_id):
+    # Metadata and the artifacts produced so far for one meeting
+    try:
+        return jsonify(meeting_store.meta(meeting_id))
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
 
-        return jsonify({"results": results})
+@app.route('/meetings/<meeting_id>/transcript', methods=['GET'])
+def meeting_transcript_endpoint(meeting_id):
+    # Speaker segments with audio positions; ?at=<seconds> returns only the segment spoken then
+    try:
+        text = meeting_store.read(meeting_id, TRANSCRIPT)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    if text is None:
+        return jsonify({"message": "The meeting has no transcript yet"}), 404
+    transcript = load_transcript(meeting_id, text)
+    at = request.args.get("at")
+    if at is not None:
+        try:
+            segment = transcript.segment_at(float(at))
+        except (ValueError, OverflowError):
+            return jsonify({"message": "'at' must be a number of seconds"}), 400
+        if segment is None:
+            return jsonify({"message": f"No transcript segment at {at}s"}), 404
+        return jsonify(segment.to_dict())
+    return jsonify({"meeting_id": meeting_id, "text": text, "timed": transcript.timed, **transcript.to_dict()})
+
+def _live_error_response(e):
+    return jsonify({"message": str(e), **e.details}), e.status
+
+@app.route('/meetings/live', methods=['POST'])
+def create_live_meeting_endpoint():
+    # Starts a meeting whose audio is streamed in while it runs
+    data = request.get_json(silent=True) or {}
+    try:
+        sample_rate = int(data.get("sample_rate", 16000))
+    except (TypeError, ValueError):
+        return jsonify({"message": "'sample_rate' must be an integer"}), 400
+    try:
+        session = live_sessions.create(sample_rate=sample_rate, media_encoding=data.get("media_encoding", "pcm"),
+                                       filename=data.get("filename"))
+    except LiveError as e:
+        return _live_error_response(e)
     except Exception as e:
-        return jsonify({"message": f"Semantic search failed: {e}"}), 500
+        return jsonify({"message": f"Could not start live transcription: {e}"}), 500
+    return jsonify({**session.status(), "chunk_size": LIVE_CHUNK_BYTES}), 201
+
+@app.route('/meetings/<meeting_id>/live', methods=['GET'])
+def live_meeting_status_endpoint(meeting_id):
+    try:
+        return jsonify(live_sessions.get(meeting_id).status())
+    except LiveError as e:
+        return _live_error_response(e)
+
+@app.route('/meetings/<meeting_id>/live/audio', methods=['PUT'])
+def live_meeting_audio_endpoint(meeting_id):
+    try:
+        offset = int(request.args.get("offset", "0"))
+    except ValueError:
+        return jsonify({"message": "'offset' must be an integer"}), 400
+    try:
+        session = live_sessions.get(meeting_id)
+        session.write_chunk(request.stream, offset)
+        return jsonify({"received_bytes": session.received_bytes, "next_offset": session.received_bytes})
+    except LiveError as e:
+        return _live_error_response(e)
+    except Exception as e:
+        return jsonify({"message": f"Sending audio failed: {e}"}), 500
+
+@app.route('/meetings/<meeting_id>/live/finish', methods=['POST'])
+def finish_live_meeting_endpoint(meeting_id):
+    # Flushes the stream and the last window; the summary of earlier windows is already done
+    try:
+        return jsonify(live_sessions.finish(meeting_id))
+    except LiveError as e:
+        return _live_error_response(e)
+    except Exception as e:
+        return jsonify({"message": f"Finishing live transcription failed: {e}"}), 500
+
+@job_queue.task("process_meeting")
+def process_meeting_task(meeting_id, to_addresses=None, subject=None):
+    """Background job: runs the full meeting pipeline."""
+    return process_meeting(meeting_id, to_addresses, subject or "Meeting Summary & Action Items")
+
+@app.route('/meetings/<meeting_id>/process', methods=['POST'])
+def process_meeting_endpoint(meeting_id):
+    # Summary, action items, PPT, PDF, search indexing (and email) in one request
+    data = request.get_json(silent=True) or {}
+    to_addresses = data.get("to_addresses")
+    if to_addresses is not None and not isinstance(to_addresses, list):
+        return jsonify({"message": "'to_addresses' must be a list"}), 400
+    subject = data.get("subject", "Meeting Summary & Action Items")
+    if not meeting_store.exists(meeting_id):
+        return jsonify({"message": f"Unknown meeting: {meeting_id}"}), 404
+    if not meeting_store.read(meeting_id, TRANSCRIPT):
+        return jsonify({"message": "The meeting has no transcript yet"}), 409
+
+    if data.get("async"):
+        try:
+            job_id = job_queue.submit("process_meeting", meeting_id=meeting_id, to_addresses=to_addresses,
+                                      subject=subject)
+        except QueueFull as e:
+            return jsonify({"message": f"Server busy, try again later: {e}"}), 503
+        return jsonify({"job_id": job_id, "meeting_id": meeting_id, "status_url": f"/jobs/{job_id}"}), 202
+
+    try:
+        result = process_meeting(meeting_id, to_addresses, subject)
+    except Exception as e:
+        return jsonify({"message": f"Processing failed: {e}"}), 500
+    failed = [name for name, stage in result["stages"].items() if stage["status"] != "completed"]
+    return jsonify(result), (207 if failed else 200)
+
+@app.route('/meetings/<meeting_id>/artifacts/<name>', methods=['GET'])
+def meeting_artifact_endpoint(meeting_id, name):
+    # Only files the store recorded as artifacts are served
+    try:
+        if name not in meeting_store.meta(meeting_id)["artifacts"]:
+            return jsonify({"message": f"No artifact {name} for this meeting"}), 404
+        return send_file(os.path.abspath(meeting_store.path(meeting_id, name)), as_attachment=True, download_name=name)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+
+@app.route('/videos', methods=['POST'])
+def create_video_endpoint():
+    # Starts a narrated video of a meeting (or of the given text); poll /videos/<id> for progress
+    data = request.get_json(silent=True) or {}
+    meeting_id = data.get("meeting_id")
+    text = data.get("text")
+    output_path = None
+    on_complete = None
+    try:
+        if meeting_id:
+            text = text or read_input_files(meeting_id)
+            output_path = meeting_store.path(meeting_id, VIDEO)
+            on_complete = lambda path: meeting_store.add_artifact(meeting_id, VIDEO)
+    except MeetingNotFound as e:
+        return jsonify({"message": str(e)}), 404
+    except FileNotFoundError as e:
+        return jsonify({"message": f"{e}; generate the summary and action items first"}), 409
+    if not text:
+        return jsonify({"message": "Provide a meeting_id or text"}), 400
+
+    try:
+        job_id = video_jobs.submit(text, output_path=output_path, meeting_id=meeting_id, on_complete=on_complete)
+    except ValueError as e:
+        # HeyGen errors happen on the poller and are reported in the job's status
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": f"Video generation failed: {e}"}), 500
+    return jsonify({"video_job_id": job_id, "status_url": f"/videos/{job_id}"}), 202
+
+@app.route('/videos/<job_id>', methods=['GET'])
+def video_status_endpoint(job_id):
+    job = video_jobs.get(job_id)
+    if job is None:
+        return jsonify({"message": "Video job not found"}), 404
+    job = {k: v for k, v in job.items() if k != "path"}
+    if job["status"] == "completed":
+        job["download_url"] = f"/videos/{job_id}/file"
+    return jsonify(job)
+
+@app.route('/videos/<job_id>/file', methods=['GET'])
+def video_file_endpoint(job_id):
+    job = video_jobs.get(job_id)
+    if job is None or job["status"] != "completed":
+        return jsonify({"message": "Video not ready"}), 404
+    # send_file streams the file with sendfile() where the server supports it
+    return send_file(os.path.abspath(job["path"]), mimetype="video/mp4", download_name="meeting_summary.mp4")
+
+@app.route('/metrics/caches', methods=['GET'])
+def cache_metrics_endpoint():
+    # Hit ratios and sizes of every cache in this process
+    return jsonify(_cache_stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    # Prometheus text format: request and stage latency histograms, queue depths, cache ratios
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/healthz', methods=['GET'])
+def healthz_endpoint():
+    # Liveness: the process is up and serving requests
+    return jsonify({"status": "ok"})
+
+@app.route('/readyz', methods=['GET'])
+def readyz_endpoint():
+    # Readiness: 200 only once the preloaded models are warm, so no request pays for a load
+    if not registry.ready():
+        return jsonify({"ready": False, "error": registry.preload_error}), 503
+    return jsonify({"ready": True, "models": [f"{m['kind']}:{m['model']}" for m in registry.stats()["models"]]})
+
+@app.route('/models', methods=['GET'])
+def models_endpoint():
+    # Load time and resident size per warm model, for sizing workers
+    return jsonify(registry.stats())
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
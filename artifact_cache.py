@@ -0,0 +1,97 @@
+# quickmeet-backend/artifact_cache.py
+import os
+import tempfile
+import threading
+
+
+class ArtifactCache:
+    """
+    Generated documents (PDF, PPTX) on disk, keyed by a hash of their content and
+    rendering options, so regenerating an unchanged meeting returns the stored bytes.
+    File mtimes track last use for LRU eviction.
+    """
+
+    def __init__(self, cache_dir, suffix, max_entries=1000):
+        self.cache_dir = cache_dir
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def get_path(self, key):
+        """Returns the path of a cached file without reading it, or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put_file(self, key, source_path):
+        """Moves a finished file (on the same filesystem) into the cache and returns its new path."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        os.replace(source_path, path)
+        self._evict()
+        return path
+
+    def put(self, key, data):
+        # Write to a temp file first so readers never see a partial document
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=self.suffix + ".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.suffix):
+                try:
+                    entries.append((os.stat(os.path.join(self.cache_dir, name)).st_mtime, name))
+                except FileNotFoundError:
+                    continue
+        entries.sort()
+        for _, name in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        try:
+            entries = sum(1 for name in os.listdir(self.cache_dir) if name.endswith(self.suffix))
+        except FileNotFoundError:
+            entries = 0
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
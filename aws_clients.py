@@ -0,0 +1,59 @@
+# quickmeet-backend/aws_clients.py
+"""
+AWS clients created on first use. Importing boto3 and building a client takes a large
+share of the app's import time, which every process paid even when it served no route
+that calls AWS.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_clients = []
+
+
+class LazyClient:
+    """
+    Stands in for a boto3 client: factory() builds the real one the first time an
+    attribute is used, and every later call goes straight to it.
+    """
+
+    def __init__(self, service_name, factory):
+        self.service_name = service_name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+        _clients.append(self)
+
+    def get(self):
+        """Returns the real client, creating it if needed."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __repr__(self):
+        state = "created" if self._client is not None else "not created"
+        return f"<LazyClient {self.service_name} ({state})>"
+
+
+def client(service_name, **kwargs):
+    """Lazy equivalent of boto3.client(service_name, **kwargs)."""
+    def factory():
+        import boto3
+        return boto3.client(service_name, **kwargs)
+
+    return LazyClient(service_name, factory)
+
+
+def warm_up():
+    """Creates every client declared so far, e.g. in each worker before it takes traffic."""
+    for lazy in _clients:
+        try:
+            lazy.get()
+        except Exception as e:
+            logger.warning(f"Could not create the {lazy.service_name} client: {e}")
@@ -0,0 +1,119 @@
+# quickmeet-backend/benchmarks/bench_action_items.py
+"""
+Throughput of action item extraction on large synthetic transcripts.
+Compares the single-pass engine in action_items.py with the previous
+three-pass regex implementation.
+
+    python benchmarks/bench_action_items.py --mb 1 10 50
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import action_items  # noqa: E402
+
+NAMES = ["Alice", "Bob", "Priya", "Chen", "Maria", "Omar", "Sofia", "Liam"]
+FILLER = [
+    "We reviewed the numbers from last quarter.",
+    "The team agreed the rollout went smoothly.",
+    "There was some discussion about hiring.",
+    "Everyone should read the design doc before Friday.",
+    "The customer feedback was mostly positive.",
+]
+MONTHS = ["January", "March", "May", "July", "October"]
+
+
+def synthetic_transcript(size_bytes, seed=0):
+    """Builds a transcript of roughly size_bytes with an action item every few sentences."""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_bytes:
+        roll = rng.random()
+        if roll < 0.15:
+            sentence = f"{rng.choice(NAMES)} will {rng.choice(['send', 'draft', 'review'])} the {rng.choice(['report', 'budget', 'plan'])}."
+        elif roll < 0.2:
+            sentence = f"{rng.choice(['He', 'She'])} will follow up with the vendor."
+        elif roll < 0.25:
+            sentence = f"{rng.choice(NAMES)} is responsible for the launch checklist."
+        elif roll < 0.28:
+            sentence = f"Deadline: {rng.choice(MONTHS)} {rng.randint(1, 28)}."
+        else:
+            sentence = rng.choice(FILLER)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def legacy_extract(summary_text):
+    """The previous implementation: three findall passes plus a pronoun fix-up loop."""
+    action_items_list = []
+    task_patterns = [
+        r"(\b[A-Z][a-z]+)\s+will\s+(.*?)(?:\.\s|$)",
+        r"(\b[A-Z][a-z]+)\s+is\s+responsible\s+for\s+(.*?)(?:\.\s|$)",
+        r"Deadline:\s*(\w+\s+\d{1,2})",
+    ]
+    names = set()
+    for pattern in task_patterns:
+        for match in re.findall(pattern, summary_text):
+            if isinstance(match, tuple):
+                name, task = match
+                names.add(name)
+                action_items_list.append(f"- {name}: {task.strip()}")
+            else:
+                action_items_list.append(f"- {match.strip()}")
+    name_list = list(names)
+    for i, item in enumerate(action_items_list):
+        if item.startswith("- He") or item.startswith("- She"):
+            previous_name = next((name for name in reversed(name_list) if name in action_items_list[i - 1]), "Unknown")
+            action_items_list[i] = item.replace("He: ", f"{previous_name}: ").replace("She: ", f"{previous_name}: ")
+    return "\n".join(action_items_list)
+
+
+def measure(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, nargs="+", default=[1, 10], help="transcript sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best is reported")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for mb in args.mb:
+        text = synthetic_transcript(int(mb * 1024 * 1024))
+        size_mb = len(text.encode("utf-8")) / 1e6
+        engine_seconds, records = measure(action_items.extract, text, args.repeat)
+        legacy_seconds, legacy_text = measure(legacy_extract, text, args.repeat)
+        row = {
+            "size_mb": round(size_mb, 2),
+            "engine_mb_s": round(size_mb / engine_seconds, 1),
+            "legacy_mb_s": round(size_mb / legacy_seconds, 1),
+            "speedup": round(legacy_seconds / engine_seconds, 2),
+            "engine_items": len(records),
+            "legacy_items": legacy_text.count("\n") + 1 if legacy_text else 0,
+        }
+        results.append(row)
+        print(f"{row['size_mb']:8.2f} MB  engine {row['engine_mb_s']:8.1f} MB/s  "
+              f"legacy {row['legacy_mb_s']:8.1f} MB/s  speedup {row['speedup']:.2f}x  "
+              f"items {row['engine_items']}/{row['legacy_items']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
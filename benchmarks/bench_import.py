@@ -0,0 +1,154 @@
+# quickmeet-backend/benchmarks/bench_import.py
+"""
+Import time of app.py, measured with `python -X importtime` in a fresh interpreter, and
+a gate for CI: exits with status 1 when the import takes longer than --max-ms or pulls
+in one of the --forbid modules, which should only be imported on first use.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --ref HEAD~1          # compare with an earlier commit
+    python benchmarks/bench_import.py --max-ms 500 --forbid boto3 pptx requests torch
+
+The first run of each tree compiles bytecode and is discarded; the median of --runs
+runs is reported.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_suite import RESULTS_DIR, REPO_DIR, _git_commit  # noqa: E402
+
+# Loaded on first use since they take a large share of a cold start
+DEFAULT_FORBIDDEN = ["boto3", "botocore.session", "pptx", "requests", "pdfkit", "fpdf",
+                     "torch", "transformers", "sentence_transformers"]
+
+
+def parse_importtime(stderr):
+    """Returns [(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def measure(tree, module="app"):
+    """Imports module from tree in a fresh interpreter; returns (wall seconds, parsed importtime)."""
+    workdir = tempfile.mkdtemp(prefix="quickmeet-import-")
+    env = dict(os.environ, PYTHONPATH=tree, QUICKMEET_START_WORKERS_ON_IMPORT="0")
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    env.pop("QUICKMEET_PRELOAD_MODELS", None)
+    try:
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=workdir, env=env,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        wall = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr[-2000:]}")
+    return wall, parse_importtime(process.stderr)
+
+
+def _import_block(parsed, module):
+    """The entries of importing module itself: everything nested under its depth-0 line."""
+    end = next(i for i, (name, _, _, depth) in enumerate(parsed) if name == module and depth == 0)
+    start = end
+    while start > 0 and parsed[start - 1][3] > 0:
+        start -= 1
+    return parsed[start:end + 1]
+
+
+def run_tree(tree, runs, module="app"):
+    measure(tree, module)  # compiles bytecode
+    samples = [(wall, _import_block(parsed, module)) for wall, parsed in (measure(tree, module) for _ in range(runs))]
+    totals = [block[-1][2] for _, block in samples]
+    block = samples[totals.index(sorted(totals)[len(totals) // 2])][1]
+    return {
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "interpreter_ms": round(statistics.median(wall for wall, _ in samples) * 1000, 1),
+        "modules": {name: round(cumulative / 1000, 2) for name, _, cumulative, _ in block},
+        # Modules app.py imports directly, slowest first
+        "top": sorted(((name, round(cumulative / 1000, 1)) for name, _, cumulative, depth in block if depth == 1),
+                      key=lambda item: -item[1]),
+    }
+
+
+def export_ref(ref):
+    """Extracts the tree of a git ref into a temporary directory."""
+    directory = tempfile.mkdtemp(prefix="quickmeet-ref-")
+    archive = subprocess.run(["git", "archive", ref], cwd=REPO_DIR, capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory)
+    return directory
+
+
+def _print(label, result, top):
+    print(f"{label}: import app {result['import_ms']} ms, interpreter total {result['interpreter_ms']} ms")
+    for name, ms in result["top"][:top]:
+        print(f"    {name:<28} {ms:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ref", help="also measure this git ref, e.g. HEAD~1 or main")
+    parser.add_argument("--max-ms", type=float, help="fail when importing app takes longer than this")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN,
+                        help="fail when importing app imports any of these modules")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/import-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    current = run_tree(REPO_DIR, args.runs)
+    _print("working tree", current, args.top)
+    result = {"meta": {"commit": _git_commit(), "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                       "python": sys.version.split()[0], "runs": args.runs},
+              "current": current}
+
+    if args.ref:
+        directory = export_ref(args.ref)
+        try:
+            baseline = run_tree(directory, args.runs)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        _print(args.ref, baseline, args.top)
+        saved = baseline["import_ms"] - current["import_ms"]
+        print(f"\nimport app: {baseline['import_ms']} ms -> {current['import_ms']} ms "
+              f"({saved:.1f} ms saved, {saved / baseline['import_ms']:.0%})")
+        result["baseline"] = dict(baseline, ref=args.ref)
+
+    failures = [f"imports {name}" for name in args.forbid if name in current["modules"]]
+    if args.max_ms is not None and current["import_ms"] > args.max_ms:
+        failures.append(f"takes {current['import_ms']} ms, above the {args.max_ms} ms budget")
+    result["failures"] = failures
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"import-{result['meta']['commit'] or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: import app {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
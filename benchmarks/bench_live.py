@@ -0,0 +1,118 @@
+# quickmeet-backend/benchmarks/bench_live.py
+"""
+Time from the end of a meeting to its recap (transcript, summary and action items),
+for a meeting streamed through live mode against the same meeting uploaded afterwards
+and transcribed as a batch job.
+
+Live audio is sent as the meeting would produce it: after each chunk the benchmark
+waits until the session has processed every closed window, as it would have in the
+real time between chunks. The slowest window is reported against the window length;
+live mode keeps up with the meeting as long as it is shorter.
+
+    python benchmarks/bench_live.py --words 2000 10000 --summarize-ms 1500 --transcribe-seconds 60
+
+Transcribe, S3 and the models are the stand-ins in stubs.py with the given latencies;
+the live meeting uses the stub streaming backend of live_transcription.py.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpus  # noqa: E402
+import stubs  # noqa: E402
+from bench_suite import _expect, _wait_for  # noqa: E402
+
+
+def live_meeting(client, text, chunk_bytes):
+    audio = text.encode("utf-8")
+    meeting_id = _expect(client.post("/meetings/live", json={}), 201).get_json()["meeting_id"]
+    slowest_window = 0.0
+    for offset in range(0, len(audio), chunk_bytes):
+        _expect(client.put(f"/meetings/{meeting_id}/live/audio?offset={offset}",
+                            data=audio[offset:offset + chunk_bytes]), 200)
+        started = time.perf_counter()
+        while _expect(client.get(f"/meetings/{meeting_id}/live"), 200).get_json()["windows_pending"]:
+            time.sleep(0.005)
+        slowest_window = max(slowest_window, time.perf_counter() - started)
+    started = time.perf_counter()
+    recap = _expect(client.post(f"/meetings/{meeting_id}/live/finish"), 200).get_json()
+    return time.perf_counter() - started, slowest_window, recap
+
+
+def batch_meeting(client, text):
+    started = time.perf_counter()
+    response = _expect(client.post("/transcribe_audio", data={"file": (io.BytesIO(text.encode("utf-8")), "meeting.mp3")},
+                                   content_type="multipart/form-data"), 202).get_json()
+    _wait_for(client, response["status_url"])
+    transcribed = time.perf_counter()
+    meeting_id = response["meeting_id"]
+    summary = _expect(client.post("/generate_summary", json={"meeting_id": meeting_id, "transcript": text}),
+                      200).get_json()["summary"]
+    _expect(client.post("/extract_action_items", json={"meeting_id": meeting_id, "summary": summary,
+                                                       "transcript": text}), 200)
+    done = time.perf_counter()
+    return done - started, done - transcribed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--window-seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-bytes", type=int, default=256,
+                        help="audio sent per request; stub audio is text, so 256 bytes are about 15 seconds")
+    parser.add_argument("--summarize-ms", type=float, default=stubs.LATENCIES["summarize_ms_per_1k_tokens"],
+                        help="stub summarizer latency per 1k tokens")
+    parser.add_argument("--transcribe-seconds", type=float, default=stubs.LATENCIES["transcribe_seconds"],
+                        help="stub batch Transcribe job latency")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    latencies = dict(stubs.LATENCIES, summarize_ms_per_1k_tokens=args.summarize_ms,
+                     transcribe_seconds=args.transcribe_seconds)
+    os.chdir(tempfile.mkdtemp(prefix="quickmeet-live-"))
+    os.environ.setdefault("QUICKMEET_LIVE_BACKEND", "stub")
+    os.environ["QUICKMEET_LIVE_WINDOW_SECONDS"] = str(args.window_seconds)
+    stubs.install_aws(latencies)
+    logging.disable(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as app_module
+    stubs.install_models(latencies)
+    client = app_module.app.test_client()
+
+    results = []
+    for words in args.words:
+        # Different content for each path, so neither is answered from the other's caches
+        with contextlib.redirect_stdout(io.StringIO()):
+            finish_seconds, slowest_window, recap = live_meeting(
+                client, corpus.transcript(words, seed="live"), args.chunk_bytes)
+            batch_seconds, batch_nlp_seconds = batch_meeting(client, corpus.transcript(words, seed="batch"))
+        row = {
+            "words": words,
+            "live_recap_seconds": round(finish_seconds, 3),
+            "live_slowest_window_seconds": round(slowest_window, 3),
+            "window_seconds": args.window_seconds,
+            "batch_recap_seconds": round(batch_seconds, 3),
+            "batch_after_transcription_seconds": round(batch_nlp_seconds, 3),
+            "action_items": len(recap["records"] or []),
+        }
+        results.append(row)
+        print(f"{words:>7} words  live recap {row['live_recap_seconds']:7.2f}s "
+              f"(slowest window {row['live_slowest_window_seconds']:.2f}s of {args.window_seconds:.0f}s audio)  "
+              f"batch recap {row['batch_recap_seconds']:7.2f}s "
+              f"({row['batch_after_transcription_seconds']:.2f}s after transcription)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# quickmeet-backend/benchmarks/bench_pdf.py
+"""
+PDF rendering time for large action item lists.
+Compares the in-process fpdf engine with wkhtmltopdf (skipped when the binary
+is not installed), and a hit in the rendered-PDF cache.
+
+    python benchmarks/bench_pdf.py --items 10 100 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pdf_generator  # noqa: E402
+from artifact_cache import ArtifactCache  # noqa: E402
+
+NAMES = ["Alice", "Bob", "Priya", "Chen", "Maria", "Omar", "Sofia", "Liam"]
+TASKS = ["send the report", "draft the budget", "review the rollout plan", "follow up with the vendor",
+         "update the launch checklist", "schedule the customer interviews"]
+MONTHS = ["January", "March", "May", "July", "October"]
+SUMMARY = ("The team reviewed last quarter's numbers and agreed the rollout went smoothly. "
+           "Hiring, vendor contracts and the launch checklist were discussed. ") * 8
+
+
+def synthetic_records(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "owner": rng.choice(NAMES),
+            "task": rng.choice(TASKS),
+            "deadline": f"{rng.choice(MONTHS)} {rng.randint(1, 28)}" if rng.random() < 0.3 else None,
+        }
+        for _ in range(count)
+    ]
+
+
+def measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def wkhtmltopdf_available():
+    try:
+        pdf_generator._wkhtmltopdf_config()
+        return True
+    except (IOError, OSError, ImportError):
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000], help="action item counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per engine; the best is reported")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    engines = ["fpdf"] + (["wkhtmltopdf"] if wkhtmltopdf_available() else [])
+    if len(engines) == 1:
+        print("wkhtmltopdf not found; set WKHTMLTOPDF_PATH to include it")
+    # Keep the benchmark's cache entries out of the real cache
+    pdf_generator.cache = ArtifactCache(tempfile.mkdtemp(prefix="bench-pdf-"), ".pdf")
+
+    results = []
+    for count in args.items:
+        records = synthetic_records(count)
+        row = {"items": count}
+        for engine in engines:
+            seconds, data = measure(
+                lambda: pdf_generator.render_pdf(SUMMARY, records, engine=engine, use_cache=False), args.repeat,
+            )
+            row[f"{engine}_ms"] = round(seconds * 1000, 1)
+            row[f"{engine}_kb"] = round(len(data) / 1024, 1)
+        pdf_generator.render_pdf(SUMMARY, records, engine=engines[0])
+        seconds, _ = measure(lambda: pdf_generator.render_pdf(SUMMARY, records, engine=engines[0]), args.repeat)
+        row["cached_ms"] = round(seconds * 1000, 2)
+        results.append(row)
+        print("  ".join(f"{key} {value}" for key, value in row.items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# quickmeet-backend/benchmarks/bench_startup.py
+"""
+Startup time and per-worker memory of the production server (gunicorn.conf.py), with
+the app and its models preloaded in the master and without.
+
+For every setting it starts gunicorn and records:
+- the seconds until /healthz and then /readyz answer 200;
+- RSS, PSS and USS of the master and of each worker, straight after start and again
+  after some summary requests.
+PSS splits shared pages between the processes that map them, so total PSS is the real
+memory cost of the server. Copy-on-write sharing shows up as worker USS well below RSS.
+
+    python benchmarks/bench_startup.py --workers 1 2 4 --model-mb 500
+    python benchmarks/bench_startup.py --real-models    # the configured models (needs transformers)
+
+Stub models (the default) hold --model-mb of memory each in place of real weights.
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpus  # noqa: E402
+from bench_suite import RESULTS_DIR, REPO_DIR, _git_commit  # noqa: E402
+
+START_TIMEOUT_SECONDS = 600
+
+
+def _get(url, data=None, timeout=5):
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def _wait_until_ok(url, deadline, process):
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if _get(url, timeout=1)[0] == 200:
+                return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} was not ready within {START_TIMEOUT_SECONDS}s")
+
+
+def memory(pid):
+    """RSS, PSS and USS (private pages) of a process in MB, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    mb = lambda kb: round(kb / 1024, 1)  # noqa: E731
+    return {
+        "rss_mb": mb(fields.get("Rss", 0)),
+        "pss_mb": mb(fields.get("Pss", 0)),
+        "uss_mb": mb(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)),
+    }
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def snapshot(master_pid):
+    workers = [memory(pid) for pid in _children(master_pid)]
+    master = memory(master_pid)
+    return {
+        "master": master,
+        "workers": workers,
+        "total_pss_mb": round(master["pss_mb"] + sum(w["pss_mb"] for w in workers), 1),
+        "total_rss_mb": round(master["rss_mb"] + sum(w["rss_mb"] for w in workers), 1),
+    }
+
+
+def run_server(workers, preload, port, args):
+    workdir = tempfile.mkdtemp(prefix="quickmeet-startup-")
+    env = dict(os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join([REPO_DIR, os.path.dirname(os.path.abspath(__file__))]),
+        QUICKMEET_BIND=f"127.0.0.1:{port}",
+        QUICKMEET_WEB_WORKERS=str(workers),
+        QUICKMEET_WEB_PRELOAD="1" if preload else "0",
+        QUICKMEET_BENCH_MODEL_MB=str(args.model_mb),
+    )
+    if not args.real_models:
+        # Stub models run without torch, so leave its thread count alone
+        env["QUICKMEET_TORCH_THREADS"] = "0"
+    module = "wsgi:app" if args.real_models else "stub_wsgi:app"
+    command = [sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_DIR, "gunicorn.conf.py"),
+               "--access-logfile", "/dev/null", module]
+    start = time.monotonic()
+    process = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE if not args.verbose else None)
+    try:
+        deadline = start + START_TIMEOUT_SECONDS
+        base = f"http://127.0.0.1:{port}"
+        _wait_until_ok(base + "/healthz", deadline, process)
+        healthy = time.monotonic() - start
+        _wait_until_ok(base + "/readyz", deadline, process)
+        ready = time.monotonic() - start
+        # Let every worker finish booting before measuring
+        while len(_children(process.pid)) < workers and time.monotonic() < deadline:
+            time.sleep(0.05)
+        after_start = snapshot(process.pid)
+
+        transcript = json.dumps({"transcript": corpus.transcript(args.words)}).encode("utf-8")
+        for _ in range(args.requests):
+            _get(base + "/generate_summary", data=transcript, timeout=120)
+        after_requests = snapshot(process.pid)
+    except Exception:
+        if process.stderr is not None and process.poll() is not None:
+            sys.stderr.write(process.stderr.read().decode("utf-8", "replace")[-4000:])
+        raise
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "workers": workers,
+        "preload": preload,
+        "healthy_seconds": round(healthy, 2),
+        "ready_seconds": round(ready, 2),
+        "memory_after_start": after_start,
+        "memory_after_requests": after_requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--preload", choices=["on", "off", "both"], default="both")
+    parser.add_argument("--model-mb", type=float, default=300, help="memory held by each stub model")
+    parser.add_argument("--real-models", action="store_true", help="serve wsgi:app with the configured models")
+    parser.add_argument("--requests", type=int, default=10, help="summary requests before the second snapshot")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/startup-<commit>-<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="show gunicorn's log")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("Memory is read from /proc/<pid>/smaps_rollup, which needs Linux 4.14 or later")
+
+    preloads = {"on": [True], "off": [False], "both": [True, False]}[args.preload]
+    runs = []
+    for preload in preloads:
+        for workers in args.workers:
+            run = run_server(workers, preload, args.port, args)
+            runs.append(run)
+            start, after = run["memory_after_start"], run["memory_after_requests"]
+            worker_uss = [w["uss_mb"] for w in after["workers"]]
+            print(f"preload={'on ' if preload else 'off'} workers={workers}: ready in {run['ready_seconds']}s, "
+                  f"total PSS {start['total_pss_mb']} MB after start, {after['total_pss_mb']} MB after "
+                  f"{args.requests} requests (worker USS {worker_uss} MB)")
+
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "cpu_count": os.cpu_count(),
+            "models": "configured" if args.real_models else f"stub, {args.model_mb} MB each",
+            "requests": args.requests,
+            "words": args.words,
+        },
+        "runs": runs,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"startup-{commit or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
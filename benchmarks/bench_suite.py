@@ -0,0 +1,598 @@
+# quickmeet-backend/benchmarks/bench_suite.py
+"""
+End-to-end benchmark of every app.py endpoint, fully offline.
+S3, Transcribe, SES, HeyGen and the models are replaced by the stand-ins in stubs.py,
+and live meetings use the stub streaming backend of live_transcription.py.
+Transcripts come from corpus.py, so runs are reproducible. Each scenario runs at every
+--concurrency level (and at every --sizes transcript length where the input size matters).
+Results go to JSON: p50/p95/p99 latency, throughput, errors and peak RSS per run, plus
+the git commit and settings. Pass --compare to diff the run against an earlier file.
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --quick
+    python benchmarks/bench_suite.py --scenarios 'generate_summary*' --sizes 1000 200000 --concurrency 1 8
+    python benchmarks/bench_suite.py --compare benchmarks/results/<earlier>.json --fail-on-regression
+
+The app's state (meetings, caches, index, queues) lives in a fresh temporary directory
+unless --workdir is given. Peak RSS covers this process only, not PPT pool workers.
+"""
+import argparse
+import contextlib
+import fnmatch
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import corpus  # noqa: E402
+import stubs  # noqa: E402
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Transcript length for scenarios whose input size is not swept
+DEFAULT_WORDS = 2000
+RECIPIENTS_PER_EMAIL = 20
+PPT_BATCH_SIZE = 8
+SEARCH_MEETINGS = 50
+ASYNC_TIMEOUT_SECONDS = 120
+
+_unique = itertools.count()
+
+
+class BenchmarkError(Exception):
+    """Raised when a request returns an unexpected status or an async operation fails."""
+
+
+def _expect(response, *statuses):
+    if response.status_code not in statuses:
+        raise BenchmarkError(f"{response.request.method} {response.request.path} returned "
+                             f"{response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def _wait_for(client, url, done=("completed",), failed=("failed", "dead"), interval=0.05):
+    """Polls a status URL until its status is in done; raises if it fails or times out."""
+    deadline = time.monotonic() + ASYNC_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        status = _expect(client.get(url), 200).get_json()
+        if status["status"] in done:
+            return status
+        if status["status"] in failed:
+            raise BenchmarkError(f"{url} {status['status']}: {status.get('error') or status.get('last_error')}")
+        time.sleep(interval)
+    raise BenchmarkError(f"{url} did not finish within {ASYNC_TIMEOUT_SECONDS}s")
+
+
+class Scenario:
+    """
+    One benchmarked operation. run(ctx, words) performs a single request (or a
+    request and its async completion) and raises on failure; setup(ctx, words, count)
+    prepares state outside the timed region for `count` runs.
+    """
+
+    def __init__(self, name, run, setup=None, sized=False, requires=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.sized = sized
+        self.requires = requires
+
+
+class Bench:
+    """The app, its test clients and helpers shared by the scenarios."""
+
+    def __init__(self, app_module):
+        self.app_module = app_module
+        self.app = app_module.app
+        self._local = threading.local()
+
+    @property
+    def client(self):
+        # One test client per thread
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def prepared_meetings(self, count, words, summary=True, seed_prefix="m"):
+        """Creates meetings straight in the store, each with unique content."""
+        from meeting_store import store, TRANSCRIPT, SUMMARY, ACTION_ITEMS, ACTION_ITEMS_TEXT
+        import action_items
+
+        meeting_ids = []
+        for _ in range(count):
+            text = corpus.transcript(words, seed=f"{seed_prefix}{next(_unique)}")
+            meeting_id = store.create()
+            store.write(meeting_id, TRANSCRIPT, text)
+            if summary:
+                records = action_items.extract(text, source="transcript")
+                store.write(meeting_id, SUMMARY, " ".join(text.split()[:300]))
+                store.write_json(meeting_id, ACTION_ITEMS, records)
+                store.write(meeting_id, ACTION_ITEMS_TEXT, action_items.format_action_items(records))
+            meeting_ids.append(meeting_id)
+        return meeting_ids
+
+
+def _pool(ctx, key):
+    return ctx[key].pop()
+
+
+def build_scenarios(bench):
+    c = lambda: bench.client  # noqa: E731
+
+    def unique_transcript(words):
+        return corpus.transcript(words, seed=f"u{next(_unique)}")
+
+    # Transcription
+    def transcribe_audio(ctx, words):
+        audio = unique_transcript(words).encode("utf-8")
+        response = _expect(c().post("/transcribe_audio", data={"file": (io.BytesIO(audio), "meeting.mp3")},
+                                    content_type="multipart/form-data"), 202)
+        _wait_for(c(), response.get_json()["status_url"])
+
+    def transcribe_audio_cached_setup(ctx, words, count):
+        ctx["audio"] = unique_transcript(words).encode("utf-8")
+        response = _expect(c().post("/transcribe_audio", data={"file": (io.BytesIO(ctx["audio"]), "meeting.mp3")},
+                                    content_type="multipart/form-data"), 202)
+        _wait_for(c(), response.get_json()["status_url"])
+
+    def transcribe_audio_cached(ctx, words):
+        response = _expect(c().post("/transcribe_audio", data={"file": (io.BytesIO(ctx["audio"]), "meeting.mp3")},
+                                    content_type="multipart/form-data"), 200)
+        if not response.get_json().get("cached"):
+            raise BenchmarkError("Expected a transcript cache hit")
+
+    def streaming_upload(ctx, words):
+        audio = unique_transcript(words).encode("utf-8")
+        upload = _expect(c().post("/uploads", json={"filename": "meeting.mp3", "size": len(audio)}), 201).get_json()
+        chunk_size = upload["chunk_size"]
+        for offset in range(0, len(audio), chunk_size):
+            _expect(c().put(f"/uploads/{upload['upload_id']}?offset={offset}",
+                            data=audio[offset:offset + chunk_size]), 200)
+        response = _expect(c().post(f"/uploads/{upload['upload_id']}/complete"), 202)
+        _wait_for(c(), response.get_json()["status_url"])
+
+    def live_meeting(ctx, words):
+        # A whole live meeting: audio chunks in, then the recap
+        audio = unique_transcript(words).encode("utf-8")
+        live = _expect(c().post("/meetings/live", json={}), 201).get_json()
+        chunk_size = min(live["chunk_size"], 16 * 1024)
+        for offset in range(0, len(audio), chunk_size):
+            _expect(c().put(f"/meetings/{live['meeting_id']}/live/audio?offset={offset}",
+                            data=audio[offset:offset + chunk_size]), 200)
+        _expect(c().post(f"/meetings/{live['meeting_id']}/live/finish"), 200)
+
+    def upload_status_setup(ctx, words, count):
+        ctx["upload"] = _expect(c().post("/uploads", json={"filename": "meeting.mp3"}), 201).get_json()
+
+    def upload_status(ctx, words):
+        _expect(c().get(f"/uploads/{ctx['upload']['upload_id']}"), 200)
+
+    def upload_abort(ctx, words):
+        upload = _expect(c().post("/uploads", json={"filename": "meeting.mp3"}), 201).get_json()
+        _expect(c().delete(f"/uploads/{upload['upload_id']}"), 200)
+
+    def job_status_setup(ctx, words, count):
+        response = _expect(c().post("/meetings/" + bench.prepared_meetings(1, words)[0] + "/process",
+                                    json={"async": True}), 202)
+        ctx["job_url"] = response.get_json()["status_url"]
+        _wait_for(c(), ctx["job_url"])
+
+    def job_status(ctx, words):
+        _expect(c().get(ctx["job_url"]), 200)
+
+    # Summaries and action items
+    def generate_summary(ctx, words):
+        _expect(c().post("/generate_summary", json={"transcript": unique_transcript(words)}), 200)
+
+    def fixed_transcript_setup(ctx, words, count):
+        ctx["transcript"] = unique_transcript(words)
+        _expect(c().post("/generate_summary", json={"transcript": ctx["transcript"]}), 200)
+
+    def generate_summary_cached(ctx, words):
+        response = _expect(c().post("/generate_summary", json={"transcript": ctx["transcript"]}), 200)
+        if not response.get_json()["timings"].get("cached"):
+            raise BenchmarkError("Expected a summary cache hit")
+
+    def generate_summary_stream(ctx, words):
+        response = _expect(c().post("/generate_summary/stream", json={"transcript": unique_transcript(words)}), 200)
+        body = response.get_data(as_text=True)
+        if "event: done" not in body or "event: error" in body:
+            raise BenchmarkError(f"Stream did not complete: {body[-200:]}")
+
+    def extract_action_items(ctx, words):
+        text = unique_transcript(words)
+        _expect(c().post("/extract_action_items", json={"transcript": text, "summary": text[:2000]}), 200)
+
+    # Documents
+    def meetings_setup(key, count_per_run=1):
+        def setup(ctx, words, count):
+            ctx[key] = bench.prepared_meetings(count * count_per_run, words)
+        return setup
+
+    def generate_ppt(ctx, words):
+        text = unique_transcript(words)
+        _expect(c().post("/generate_ppt", json={"summary": text[:3000], "action_items": text}), 200)
+
+    def generate_ppt_batch(ctx, words):
+        meeting_ids = [_pool(ctx, "meetings") for _ in range(PPT_BATCH_SIZE)]
+        _expect(c().post("/generate_ppt/batch", json={"meeting_ids": meeting_ids}), 200)
+
+    def generate_pdf(ctx, words):
+        _expect(c().get(f"/generate_pdf?meeting_id={_pool(ctx, 'meetings')}"), 200)
+
+    # Email
+    def send_email(ctx, words):
+        n = next(_unique)
+        response = _expect(c().post("/send_email", json={
+            "to_addresses": [f"user{n}-{i}@example.com" for i in range(RECIPIENTS_PER_EMAIL)],
+            "summary": corpus.transcript(200, seed=n), "action_items": "Alice will send the notes.",
+        }), 202)
+        _wait_for(c(), response.get_json()["status_url"], done=("sent",))
+
+    def outbox_setup(ctx, words, count):
+        response = _expect(c().post("/send_email", json={"to_addresses": ["bench@example.com"], "summary": "s"}), 202)
+        ctx["outbox_url"] = response.get_json()["status_url"]
+        _wait_for(c(), ctx["outbox_url"], done=("sent",))
+
+    def outbox_status(ctx, words):
+        _expect(c().get(ctx["outbox_url"]), 200)
+
+    def outbox_stats(ctx, words):
+        _expect(c().get("/outbox"), 200)
+
+    def outbox_retry(ctx, words):
+        # Only dead-lettered messages can be retried; this times the rejection path
+        _expect(c().post(ctx["outbox_url"] + "/retry"), 409)
+
+    # Search
+    def search_setup(ctx, words, count):
+        from semantic_search import index_meeting_text
+        for meeting_id in bench.prepared_meetings(SEARCH_MEETINGS, words):
+            index_meeting_text(meeting_id, "transcript", corpus.transcript(words, seed=meeting_id))
+
+    def semantic_search(ctx, words):
+        query = corpus.transcript(12, seed=next(_unique))
+        _expect(c().post("/semantic_search", json={"query": query, "top_k": 5}), 200)
+
+    # Meetings
+    def meeting_meta_setup(ctx, words, count):
+        ctx["meeting_id"] = bench.prepared_meetings(1, words)[0]
+
+    def meeting_meta(ctx, words):
+        _expect(c().get(f"/meetings/{ctx['meeting_id']}"), 200)
+
+    def meeting_transcript_setup(ctx, words, count):
+        from meeting_store import store, TRANSCRIPT
+        from transcript_model import Transcript, save_for_meeting
+
+        meeting_id = ctx["meeting_id"] = bench.prepared_meetings(1, words, summary=False)[0]
+        text = store.read(meeting_id, TRANSCRIPT)
+        transcript = Transcript.from_transcribe(
+            {"results": {"transcripts": [{"transcript": text}], "items": stubs.transcribe_items(text)}})
+        save_for_meeting(meeting_id, transcript)
+        ctx["duration"] = transcript.segments[-1].end
+
+    def meeting_transcript(ctx, words):
+        _expect(c().get(f"/meetings/{ctx['meeting_id']}/transcript"), 200)
+
+    def meeting_transcript_at(ctx, words):
+        seconds = next(_unique) * 7.3 % ctx["duration"]
+        _expect(c().get(f"/meetings/{ctx['meeting_id']}/transcript?at={seconds:.2f}"), 200)
+
+    def process_meeting(ctx, words):
+        _expect(c().post(f"/meetings/{_pool(ctx, 'meetings')}/process", json={}), 200)
+
+    def process_meeting_async(ctx, words):
+        response = _expect(c().post(f"/meetings/{_pool(ctx, 'meetings')}/process", json={"async": True}), 202)
+        _wait_for(c(), response.get_json()["status_url"])
+
+    def artifact_setup(ctx, words, count):
+        ctx["meeting_id"] = bench.prepared_meetings(1, words, summary=False)[0]
+        _expect(c().post(f"/meetings/{ctx['meeting_id']}/process", json={}), 200)
+
+    def meeting_artifact(ctx, words):
+        _expect(c().get(f"/meetings/{ctx['meeting_id']}/artifacts/meeting_summary.pdf"), 200)
+
+    # Videos
+    def video(ctx, words):
+        text = corpus.transcript(150, seed=f"v{next(_unique)}")
+        response = _expect(c().post("/videos", json={"text": text}), 202)
+        _wait_for(c(), response.get_json()["status_url"])
+        _expect(c().get(response.get_json()["status_url"] + "/file"), 200)
+
+    def video_status_setup(ctx, words, count):
+        response = _expect(c().post("/videos", json={"text": "Benchmark status video."}), 202)
+        ctx["video_url"] = response.get_json()["status_url"]
+        _wait_for(c(), ctx["video_url"])
+
+    def video_status(ctx, words):
+        _expect(c().get(ctx["video_url"]), 200)
+
+    # Pages and operational endpoints
+    def get(path):
+        return lambda ctx, words: _expect(c().get(path), 200)
+
+    return [
+        Scenario("index", get("/")),
+        Scenario("dashboard", get("/dashboard")),
+        Scenario("transcribe_audio", transcribe_audio, sized=True),
+        Scenario("transcribe_audio_cached", transcribe_audio_cached, setup=transcribe_audio_cached_setup),
+        Scenario("streaming_upload", streaming_upload, sized=True),
+        Scenario("live_meeting", live_meeting, sized=True),
+        Scenario("upload_status", upload_status, setup=upload_status_setup),
+        Scenario("upload_abort", upload_abort),
+        Scenario("job_status", job_status, setup=job_status_setup),
+        Scenario("generate_summary", generate_summary, sized=True),
+        Scenario("generate_summary_cached", generate_summary_cached, setup=fixed_transcript_setup, sized=True),
+        Scenario("generate_summary_stream", generate_summary_stream, sized=True, requires="transformers"),
+        Scenario("extract_action_items", extract_action_items, sized=True),
+        Scenario("generate_ppt", generate_ppt),
+        Scenario("generate_ppt_batch", generate_ppt_batch, setup=meetings_setup("meetings", PPT_BATCH_SIZE)),
+        Scenario("generate_pdf", generate_pdf, setup=meetings_setup("meetings")),
+        Scenario("send_email", send_email),
+        Scenario("outbox_status", outbox_status, setup=outbox_setup),
+        Scenario("outbox_stats", outbox_stats),
+        Scenario("outbox_retry", outbox_retry, setup=outbox_setup),
+        Scenario("semantic_search", semantic_search, setup=search_setup),
+        Scenario("meeting_meta", meeting_meta, setup=meeting_meta_setup),
+Scenario("meeting_transcript", meeting_transcript, setup=meeting_transcript_setup, sized=True),
+        Scenario("meeting_transcript_at", meeting_transcript_at, setup=meeting_transcript_setup, sized=True),
+                Scenario("process_meeting", process_meeting, setup=meetings_setup("meetings"), sized=True),
+        Scenario("process_meeting_async", process_meeting_async, setup=meetings_setup("meetings")),
+        Scenario("meeting_artifact", meeting_artifact, setup=artifact_setup),
+        Scenario("video", video),
+        Scenario("video_status", video_status, setup=video_status_setup),
+        Scenario("metrics", get("/metrics")),
+        Scenario("metrics_caches", get("/metrics/caches")),
+        Scenario("models", get("/models")),
+        Scenario("healthz", get("/healthz")),
+        Scenario("readyz", get("/readyz")),
+    ]
+
+
+def _max_rss_bytes():
+    # ru_maxrss is the peak so far: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return _max_rss_bytes()
+
+
+class RSSSampler:
+    """Samples this process's resident set size in the background and keeps the peak."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_scenario(scenario, ctx, words, concurrency, requests):
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            scenario.run(ctx, words)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    with RSSSampler() as rss, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(one, range(requests)))
+        wall = time.perf_counter() - start
+
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 2) if value is not None else None  # noqa: E731
+    return {
+        "scenario": scenario.name,
+        "words": words,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "max": ms(latencies[-1]) if latencies else None,
+        },
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "wall_seconds": round(wall, 3),
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_key(run):
+    return run["scenario"], run["words"], run["concurrency"]
+
+
+def compare(baseline_path, runs, threshold):
+    """Prints p95 and throughput changes against a previous result file; returns the regressions."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_run_key(run): run for run in json.load(f)["runs"]}
+    regressions = []
+    print(f"\nCompared with {baseline_path} (regression threshold {threshold:.0%}):")
+    for run in runs:
+        old = baseline.get(_run_key(run))
+        if old is None or not old["latency_ms"]["p95"] or not run["latency_ms"]["p95"]:
+            continue
+        p95_change = run["latency_ms"]["p95"] / old["latency_ms"]["p95"] - 1
+        rps_change = (run["throughput_rps"] / old["throughput_rps"] - 1) if old["throughput_rps"] else 0.0
+        regressed = p95_change > threshold or rps_change < -threshold
+        label = f"{run['scenario']} words={run['words']} c={run['concurrency']}"
+        print(f"  {'REGRESSION ' if regressed else ''}{label}: p95 {p95_change:+.1%}, throughput {rps_change:+.1%}")
+        if regressed:
+            regressions.append(label)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=["*"], help="names or glob patterns (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 200000],
+                        help="transcript words for size-sensitive scenarios")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=20, help="requests per scenario, size and concurrency")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed requests before each scenario")
+    parser.add_argument("--quick", action="store_true", help="--sizes 1000 10000 --concurrency 1 4 --requests 5")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own output while it runs")
+    parser.add_argument("--workdir", help="directory for the app's state (default: a new temporary directory)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/bench-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    for name, default in stubs.LATENCIES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=default, dest=name,
+                            help=f"simulated latency (default {default})")
+    args = parser.parse_args()
+    if args.quick:
+        args.sizes, args.concurrency, args.requests = [1000, 10000], [1, 4], 5
+    latencies = {name: getattr(args, name) for name in stubs.LATENCIES}
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    # The app reads its settings and creates its clients at import time
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="quickmeet-bench-"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    os.environ.setdefault("QUICKMEET_VIDEO_POLL_SECONDS", "0.2")
+    # The real SES quota would dominate every email scenario; the stub's latency stands in for it
+    os.environ.setdefault("QUICKMEET_SES_RATE", "1000")
+    os.environ.setdefault("QUICKMEET_LIVE_BACKEND", "stub")
+    stubs.install_aws(latencies)
+    stubs.start_heygen(latencies)
+    import logging
+    logging.disable(logging.WARNING)
+    # The app still reports progress with print()
+    quiet = contextlib.nullcontext if args.verbose else lambda: contextlib.redirect_stdout(io.StringIO())
+    import app as app_module
+    stubs.install_models(latencies)
+    bench = Bench(app_module)
+
+    scenarios = [s for s in build_scenarios(bench)
+                 if any(fnmatch.fnmatch(s.name, pattern) for pattern in args.scenarios)]
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.name + ("  (sized)" if scenario.sized else ""))
+        return
+
+    runs, skipped = [], {}
+    for scenario in scenarios:
+        if scenario.requires:
+            try:
+                __import__(scenario.requires)
+            except ImportError:
+                skipped[scenario.name] = f"needs {scenario.requires}"
+                print(f"{scenario.name}: skipped ({skipped[scenario.name]})")
+                continue
+        for words in (args.sizes if scenario.sized else [DEFAULT_WORDS]):
+            ctx = {}
+            total = args.warmup + args.requests * len(args.concurrency)
+            try:
+                with quiet():
+                    if scenario.setup:
+                        scenario.setup(ctx, words, total)
+                    for _ in range(args.warmup):
+                        scenario.run(ctx, words)
+            except Exception as e:
+                skipped[f"{scenario.name}/{words}"] = f"setup failed: {e}"
+                print(f"{scenario.name} words={words}: setup failed: {e}")
+                continue
+            for concurrency in args.concurrency:
+                with quiet():
+                    run = run_scenario(scenario, ctx, words, concurrency, args.requests)
+                runs.append(run)
+                lat = run["latency_ms"]
+                print(f"{scenario.name:<24} words={words:<7} c={concurrency:<3} p50={lat['p50']}ms p95={lat['p95']}ms "
+                      f"p99={lat['p99']}ms {run['throughput_rps']} req/s rss={run['peak_rss_mb']}MB "
+                      f"errors={run['errors']}")
+
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": args.sizes,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "latencies": latencies,
+            "max_rss_mb": round(_max_rss_bytes() / (1024 * 1024), 1),
+            "skipped": skipped,
+        },
+        "runs": runs,
+    }
+    output = output or os.path.join(RESULTS_DIR, f"bench-{commit or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline:
+        regressions = compare(baseline, runs, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
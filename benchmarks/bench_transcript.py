@@ -0,0 +1,96 @@
+# quickmeet-backend/benchmarks/bench_transcript.py
+"""
+Cost of the timestamped transcript model (transcript_model.py) on long meetings:
+parsing Transcribe's output JSON, the size of the stored timing columns next to that
+JSON, and time-to-segment lookups by binary search against a linear scan.
+
+    python benchmarks/bench_transcript.py --words 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import corpus  # noqa: E402
+import stubs  # noqa: E402
+from transcript_model import Transcript  # noqa: E402
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def linear_segment_at(segments, seconds):
+    found = None
+    for segment in segments:
+        if segment.start > seconds:
+            break
+        found = segment
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best is reported")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for words in args.words:
+        text = corpus.transcript(words)
+        output = json.dumps({"results": {"transcripts": [{"transcript": text}], "items": stubs.transcribe_items(text)}})
+
+        parse_seconds, transcript = best_of(lambda: Transcript.from_transcribe(json.loads(output)), args.repeat)
+        timing = transcript.to_bytes()
+        load_seconds, _ = best_of(lambda: Transcript.from_bytes(timing, text), args.repeat)
+
+        tracemalloc.start()
+        transcript._segments = None
+        segments = transcript.segments
+        segment_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        duration = transcript.end_ms[-1] / 1000
+        rng = random.Random(0)
+        times = [rng.uniform(0, duration) for _ in range(args.lookups)]
+        bisect_seconds, found = best_of(lambda: [transcript.segment_at(t) for t in times], args.repeat)
+        linear_seconds, expected = best_of(lambda: [linear_segment_at(segments, t) for t in times[:200]], 1)
+        assert found[:200] == expected
+
+        row = {
+            "words": len(transcript.word_start),
+            "segments": len(segments),
+            "transcribe_json_mb": round(len(output) / 1e6, 2),
+            "timing_npz_mb": round(len(timing) / 1e6, 3),
+            "columns_mb": round(sum(getattr(transcript, c).nbytes for c in
+                                    ("word_start", "word_end", "start_ms", "end_ms", "speaker", "confidence")) / 1e6, 3),
+            "segments_mb": round(segment_bytes / 1e6, 2),
+            "parse_ms": round(parse_seconds * 1000, 1),
+            "load_ms": round(load_seconds * 1000, 2),
+            "lookup_us": round(bisect_seconds / len(times) * 1e6, 2),
+            "linear_lookup_us": round(linear_seconds / 200 * 1e6, 2),
+        }
+        results.append(row)
+        print(f"{row['words']:>8} words {row['segments']:>7} segments  json {row['transcribe_json_mb']:7.2f} MB  "
+              f"npz {row['timing_npz_mb']:6.3f} MB  parse {row['parse_ms']:8.1f} ms  load {row['load_ms']:6.2f} ms  "
+              f"lookup {row['lookup_us']:6.2f} us (linear {row['linear_lookup_us']:9.2f} us)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
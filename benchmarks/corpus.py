@@ -0,0 +1,46 @@
+# quickmeet-backend/benchmarks/corpus.py
+"""
+Synthetic meeting transcripts of a given length, reproducible from a seed. About one
+sentence in twelve is an action item ("Priya will ...", with an occasional deadline),
+so action item extraction and the artifacts built from it have realistic work to do.
+"""
+import random
+
+NAMES = ["Alice", "Bob", "Priya", "Chen", "Maria", "Omar", "Sofia", "Liam", "Yuki", "Daniel"]
+TOPICS = ["the Q3 roadmap", "the vendor contract", "the onboarding flow", "the hiring plan",
+          "the launch checklist", "customer churn", "the data migration", "the pricing page",
+          "the incident review", "the marketing budget"]
+OPENERS = ["I think", "Honestly", "From the numbers I saw", "As we discussed last week", "To be fair",
+           "If I remember correctly", "Looking at the dashboard", "Just to recap"]
+CLAIMS = ["we are behind schedule on {topic}", "{topic} looks healthier than expected",
+          "we need more data before deciding on {topic}", "the team is split on {topic}",
+          "{topic} depends on the security review", "customers keep asking about {topic}",
+          "{topic} should be simpler than it is", "we underestimated the effort for {topic}"]
+TASKS = ["send the summary of {topic} to the team", "draft a proposal for {topic}",
+         "follow up with finance about {topic}", "schedule a review of {topic}",
+         "update the tracker for {topic}", "collect customer feedback on {topic}"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+
+def _sentence(rng):
+    topic = rng.choice(TOPICS)
+    if rng.random() < 1 / 12:
+        task = rng.choice(TASKS).format(topic=topic)
+        sentence = f"{rng.choice(NAMES)} will {task}."
+        if rng.random() < 0.3:
+            sentence += f" Deadline: {rng.choice(MONTHS)} {rng.randint(1, 28)}."
+        return sentence
+    claim = rng.choice(CLAIMS).format(topic=topic)
+    return f"{rng.choice(OPENERS)}, {claim}."
+
+
+def transcript(words, seed=0):
+    """Returns a transcript of about `words` words (never fewer)."""
+    rng = random.Random(f"{words}:{seed}")
+    sentences, count = [], 0
+    while count < words:
+        sentence = _sentence(rng)
+        sentences.append(sentence)
+        count += len(sentence.split())
+    return " ".join(sentences)
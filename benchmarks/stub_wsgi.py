@@ -0,0 +1,17 @@
+# quickmeet-backend/benchmarks/stub_wsgi.py
+"""
+wsgi:app with the offline stand-ins from stubs.py, for benchmarking the production
+server without AWS or model downloads (see bench_startup.py):
+
+    PYTHONPATH=.:benchmarks gunicorn -c gunicorn.conf.py stub_wsgi:app
+
+QUICKMEET_BENCH_MODEL_MB sets the memory each stub model holds.
+"""
+import os
+
+import stubs
+
+stubs.install_aws()
+stubs.install_models(weights_mb=float(os.getenv("QUICKMEET_BENCH_MODEL_MB", "0")))
+
+from app import app  # noqa: E402,F401
@@ -0,0 +1,304 @@
+# quickmeet-backend/benchmarks/stubs.py
+"""
+Offline stand-ins for the services QuickMeet calls, so the whole app can be benchmarked
+without AWS credentials, HeyGen or model downloads:
+
+- S3, Transcribe and SES clients returned by boto3.client() (install_aws, before the app
+  modules are imported). Transcribe "transcribes" an upload by reading its bytes as text.
+- HeyGen, served by heygen_mock.py (start_heygen, before the app modules are imported).
+- Tiny summarization and embedding models (install_models, after embedding_store is
+  imported and before the models are loaded), optionally holding weights_mb of memory
+  to stand in for real weights.
+
+Each stand-in sleeps for a configurable latency, so results model the waiting the app
+does on its dependencies; they do not model the CPU those services would use.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Defaults for the simulated latencies, overridable from bench_suite.py
+LATENCIES = {
+    "s3_ms": 15.0,            # per S3 call
+    "transcribe_seconds": 1.0,  # from start_transcription_job to COMPLETED
+    "ses_ms": 40.0,           # per SendEmail call
+    "heygen_render_seconds": 1.0,
+    "summarize_ms_per_1k_tokens": 20.0,
+    "embed_ms_per_1k_tokens": 5.0,
+}
+
+
+def _sleep_ms(ms):
+    if ms > 0:
+        time.sleep(ms / 1000)
+
+
+class StubS3:
+    """In-memory S3: objects and multipart uploads for any bucket."""
+
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.objects = {}
+        self._multipart = {}
+        self._lock = threading.Lock()
+
+    def put(self, bucket, key, data):
+        with self._lock:
+            self.objects[(bucket, key)] = bytes(data)
+
+    def upload_file(self, filename, bucket, key, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        with open(filename, "rb") as f:
+            self.put(bucket, key, f.read())
+
+    def get_object(self, Bucket, Key, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        with self._lock:
+            data = self.objects[(Bucket, Key)]
+        return {"Body": io.BytesIO(data), "ContentLength": len(data)}
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._multipart[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        data = bytes(Body)
+        with self._lock:
+            self._multipart[UploadId][PartNumber] = data
+        return {"ETag": hashlib.md5(data).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload=None, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        with self._lock:
+            parts = self._multipart.pop(UploadId)
+        self.put(Bucket, Key, b"".join(parts[number] for number in sorted(parts)))
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        with self._lock:
+            self._multipart.pop(UploadId, None)
+        return {}
+
+
+def transcribe_items(text, seconds_per_word=0.4, speakers=3, sentences_per_turn=3):
+    """
+    Transcribe output items for text: one per word and punctuation mark, with times at a
+    steady speaking rate and the speaker changing every few sentences.
+    """
+    items, sentence, clock = [], 0, 0.0
+    for token in text.split():
+        word = token.rstrip(".,?!")
+        speaker = f"spk_{sentence // sentences_per_turn % speakers}"
+        if word:
+            items.append({"type": "pronunciation", "start_time": f"{clock:.3f}",
+                          "end_time": f"{clock + seconds_per_word * 0.8:.3f}", "speaker_label": speaker,
+                          "alternatives": [{"confidence": "0.98", "content": word}]})
+            clock += seconds_per_word
+        for mark in token[len(word):]:
+            items.append({"type": "punctuation", "speaker_label": speaker,
+                          "alternatives": [{"confidence": "0.0", "content": mark}]})
+            sentence += mark in ".?!"
+    return items
+
+
+class StubTranscribe:
+    """
+    Transcribe jobs complete latencies["transcribe_seconds"] after they start. The
+    "transcript" is the uploaded object decoded as UTF-8, written back to S3 as the job output
+    with word items from transcribe_items().
+    """
+
+    def __init__(self, s3, latencies):
+        self.s3 = s3
+        self.latencies = latencies
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def start_transcription_job(self, TranscriptionJobName, Media, OutputBucketName, **kwargs):
+        _sleep_ms(self.latencies["s3_ms"])
+        bucket, key = Media["MediaFileUri"][len("s3://"):].split("/", 1)
+        with self._lock:
+            self.jobs[TranscriptionJobName] = {
+                "source": (bucket, key),
+                "output": (OutputBucketName, f"{TranscriptionJobName}.json"),
+                "done_at": time.monotonic() + self.latencies["transcribe_seconds"],
+                "written": False,
+            }
+        return {"TranscriptionJob": {"TranscriptionJobName": TranscriptionJobName,
+                                     "TranscriptionJobStatus": "IN_PROGRESS"}}
+
+    def get_transcription_job(self, TranscriptionJobName):
+        _sleep_ms(self.latencies["s3_ms"])
+        with self._lock:
+            job = self.jobs[TranscriptionJobName]
+        if time.monotonic() < job["done_at"]:
+            return {"TranscriptionJob": {"TranscriptionJobName": TranscriptionJobName,
+                                         "TranscriptionJobStatus": "IN_PROGRESS"}}
+        bucket, key = job["output"]
+        if not job["written"]:
+            text = self.s3.objects[job["source"]].decode("utf-8", "replace")
+            results = {"transcripts": [{"transcript": text}], "items": transcribe_items(text)}
+            self.s3.put(bucket, key, json.dumps({"results": results}).encode("utf-8"))
+            job["written"] = True
+        return {"TranscriptionJob": {
+            "TranscriptionJobName": TranscriptionJobName,
+            "TranscriptionJobStatus": "COMPLETED",
+            "Transcript": {"TranscriptFileUri": f"https://s3.us-east-1.amazonaws.com/{bucket}/{key}"},
+        }}
+
+
+class StubSES:
+    def __init__(self, latencies):
+        self.latencies = latencies
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def send_email(self, Source, Destination, Message, **kwargs):
+        _sleep_ms(self.latencies["ses_ms"])
+        with self._lock:
+            self.sent += sum(len(Destination.get(field, [])) for field in ("ToAddresses", "CcAddresses", "BccAddresses"))
+        return {"MessageId": uuid.uuid4().hex}
+
+
+def install_aws(latencies=LATENCIES):
+    """
+    Makes boto3.client() return the stand-ins for s3, transcribe and ses. Call it before
+    the app creates its clients (on first use), e.g. before importing it. Returns the stubs by name.
+    """
+    import boto3
+
+    s3 = StubS3(latencies)
+    clients = {"s3": s3, "transcribe": StubTranscribe(s3, latencies), "ses": StubSES(latencies)}
+    real_client = boto3.client
+
+    def client(service_name, *args, **kwargs):
+        if service_name in clients:
+            return clients[service_name]
+        return real_client(service_name, *args, **kwargs)
+
+    boto3.client = client
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("SOURCE_EMAIL", "bench@example.com")
+    return clients
+
+
+def start_heygen(latencies=LATENCIES):
+    """Serves the HeyGen mock and points heygen_client at it (before the app is imported)."""
+    from heygen_mock import start_mock_server
+
+    server = start_mock_server(render_seconds=latencies["heygen_render_seconds"], video_bytes=256 * 1024)
+    os.environ["HEYGEN_BASE_URL"] = server.base_url
+    os.environ.setdefault("HEYGEN_API_KEY", "bench")
+    return server
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the parts of the transformers API the summarization engine uses."""
+
+    model_max_length = 1024
+
+    def __init__(self):
+        self._ids = {}
+        self._words = []
+        self._lock = threading.Lock()
+
+    def _encode(self, text):
+        ids = []
+        with self._lock:
+            for word in text.split():
+                token_id = self._ids.get(word)
+                if token_id is None:
+                    token_id = self._ids[word] = len(self._words)
+                    self._words.append(word)
+                ids.append(token_id)
+        return ids
+
+    def __call__(self, texts, add_special_tokens=True, **kwargs):
+        if isinstance(texts, str):
+            return {"input_ids": self._encode(texts)}
+        return {"input_ids": [self._encode(text) for text in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(self._words[i] for i in ids)
+
+
+def _weights(mb):
+    # Written once, so the pages are resident like loaded model weights
+    return np.ones(int(mb * 1024 * 1024 / 4), dtype=np.float32) if mb else None
+
+
+class StubSummarizer:
+    """
+    Extractive stand-in for a transformers summarization pipeline: keeps leading sentences
+    up to max_length words, after sleeping in proportion to the input tokens.
+    """
+
+    def __init__(self, ms_per_1k_tokens, weights_mb=0):
+        self.tokenizer = StubTokenizer()
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.weights = _weights(weights_mb)
+
+    def __call__(self, texts, min_length=None, max_length=None, streamer=None, **kwargs):
+        tokens = sum(len(text.split()) for text in texts)
+        _sleep_ms(tokens / 1000 * self.ms_per_1k_tokens)
+        outputs = []
+        for text in texts:
+            words = []
+            for sentence in re.split(r"(?<=[.?!])\s+", text):
+                if words and len(words) + len(sentence.split()) > (max_length or 150):
+                    break
+                words.extend(sentence.split())
+            outputs.append({"summary_text": " ".join(words[:max_length or 150])})
+        return outputs
+
+
+class StubEncoder:
+    """Hashed bag-of-words vectors with the SentenceTransformer.encode signature."""
+
+    def __init__(self, ms_per_1k_tokens, dim=384, weights_mb=0):
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.dim = dim
+        self.weights = _weights(weights_mb)
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True, **kwargs):
+        _sleep_ms(sum(len(text.split()) for text in texts) / 1000 * self.ms_per_1k_tokens)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest()
+                vectors[row, int.from_bytes(digest, "little") % self.dim] += 1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1.0, norms)
+        return vectors
+
+
+def install_models(latencies=LATENCIES, weights_mb=0):
+    """Registers the stub summarization and embedding loaders in place of the real ones."""
+    import embedding_store  # noqa: F401  (registers the real embedding loader, replaced below)
+    from model_registry import registry
+
+    registry.register_loader("summarization",
+                             lambda name: StubSummarizer(latencies["summarize_ms_per_1k_tokens"], weights_mb))
+    registry.register_loader("sentence-transformer",
+                             lambda name: StubEncoder(latencies["embed_ms_per_1k_tokens"], weights_mb=weights_mb))
@@ -1,10 +1,17 @@
 # quickmeet-backend/email_sender.py
 
-import boto3
+import html
 import os
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.exceptions import BotoCoreError, ClientError
 from dotenv import load_dotenv
+from action_items import action_item_lines
+from metrics import timed
+import aws_clients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,69 +26,191 @@ SOURCE_EMAIL = os.getenv("SOURCE_EMAIL")  # Your verified sender email
 if not SOURCE_EMAIL:
     logger.error("SOURCE_EMAIL is not set. Please verify your .env file.")
 
-# Create an SES client
-ses_client = boto3.client("ses", region_name=AWS_REGION)
+# Recipients per SendEmail call (the SES limit for one message)
+SES_MAX_RECIPIENTS = 50
+# Recipients per second across all sends (the account's SES maximum send rate)
+SES_RATE_LIMIT = float(os.getenv("QUICKMEET_SES_RATE", "14"))
+# Concurrent SendEmail calls for bulk sends
+SES_WORKERS = int(os.getenv("QUICKMEET_SES_WORKERS", "4"))
+SES_MAX_RETRIES = int(os.getenv("QUICKMEET_SES_MAX_RETRIES", "5"))
+RETRY_BASE_SECONDS = 0.5
+RETRYABLE_ERRORS = {"Throttling", "ThrottlingException", "TooManyRequestsException", "ServiceUnavailable",
+                    "RequestTimeout", "InternalFailure"}
 
 
-def send_meeting_email(to_addresses, subject, summary_text, action_items_text):
+def _create_ses_client():
+    import boto3
+    from botocore.config import Config
+    return boto3.client(
+        "ses",
+        region_name=AWS_REGION,
+        config=Config(max_pool_connections=max(10, SES_WORKERS), retries={"mode": "standard", "max_attempts": 1}),
+    )
+
+
+# One SES client (and its connection pool) is shared by every send, created on first use.
+# Retries are handled below so throttling backs off across the whole batch.
+ses_client = aws_clients.LazyClient("ses", _create_ses_client)
+
+
+class EmailDeliveryError(Exception):
+    """Raised when some recipients could not be sent to; result holds the per-batch outcome."""
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+class RateLimiter:
+    """
+    Spaces out sends so that at most rate recipients per second are submitted,
+    shared by every thread sending through it.
     """
-    Sends an email using AWS SES with both plain text and HTML content.
-    The HTML content includes the meeting summary and action items, with checkboxes next to each action item.
 
-    Note: SES in sandbox mode requires that both SOURCE_EMAIL and each recipient
-    address be verified. Check AWS SES console for your sandbox status.
+    def __init__(self, rate):
+        self.rate = rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + amount / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+# Shared limiter, so concurrent requests together stay under the SES send rate
+rate_limiter = RateLimiter(SES_RATE_LIMIT)
+
+
+def render_email(summary_text, action_items):
+    """
+    Renders the plain text and HTML bodies once for all recipients.
+    The HTML lists the action items with checkboxes next to each one.
+    Returns (plain_body, html_body).
     """
-    # Fallback to empty strings
     summary_text = summary_text or ""
-    action_items_text = action_items_text or ""
-
-    # Log inputs
-    logger.info(f"Sending email from {SOURCE_EMAIL} to {to_addresses}")
-    logger.debug(f"Subject: {subject}")
-    logger.debug(f"Summary Text: {summary_text}")
-    logger.debug(f"Action Items Text: {action_items_text}")
+    action_lines = action_item_lines(action_items)
 
     # Plain text version of the email
-    plain_body = f"Meeting Summary:\n{summary_text}\n\nAction Items:\n{action_items_text}"
-
-    # Convert action_items_text (newline-separated) into HTML with checkboxes
-    action_items_html = ""
-    for item in action_items_text.splitlines():
-        if item.strip():
-            action_items_html += f'<label><input type="checkbox" disabled> {item}</label><br>'
+    plain_body = f"Meeting Summary:\n{summary_text}\n\nAction Items:\n" + "\n".join(action_lines)
 
-    if not action_items_html:
-        action_items_html = "<p>No action items.</p>"
+    # Convert the action items into HTML with checkboxes
+    action_items_html = "".join(
+        f'<label><input type="checkbox" disabled> {html.escape(item)}</label><br>' for item in action_lines
+    ) or "<p>No action items.</p>"
 
     # HTML version of the email
     html_body = f"""
     <html>
       <body>
         <h2>Meeting Summary</h2>
-        <p>{summary_text}</p>
+        <p>{html.escape(summary_text)}</p>
         <h2>Action Items</h2>
         {action_items_html}
       </body>
     </html>
     """
+    return plain_body, html_body
+
+
+def _is_retryable(error):
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        message = error.response.get("Error", {}).get("Message", "")
+        return code in RETRYABLE_ERRORS or "Maximum sending rate exceeded" in message
+    # Connection errors and timeouts
+    return isinstance(error, BotoCoreError)
 
-    try:
-        response = ses_client.send_email(
-            Source=SOURCE_EMAIL,
-            Destination={'ToAddresses': to_addresses},
-            Message={
-                'Subject': {'Data': subject, 'Charset': 'UTF-8'},
-                'Body': {
-                    'Text': {'Data': plain_body, 'Charset': 'UTF-8'},
-                    'Html': {'Data': html_body, 'Charset': 'UTF-8'}
-                }
-            }
-        )
-        message_id = response.get('MessageId')
-        logger.info(f"Email sent! Message ID: {message_id}")
-        return response
-
-    except (BotoCoreError, ClientError) as e:
-        logger.error(f"Failed to send email: {e}")
-        # Re-raise or return a structured error
-        raise
+
+def _send_batch(client, recipients, message, limiter, max_retries):
+    """
+    Sends one message to up to SES_MAX_RECIPIENTS recipients, backing off on throttling.
+    Recipients go in Bcc, so they do not see each other's addresses.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire(len(recipients))
+        try:
+            with timed("ses_send"):
+                response = client.send_email(Source=SOURCE_EMAIL, Destination={"BccAddresses": recipients}, Message=message)
+            return response.get("MessageId")
+        except (BotoCoreError, ClientError) as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                raise
+            delay = RETRY_BASE_SECONDS * (2 ** attempt) * (0.5 + random.random())
+            logger.warning(f"SES send failed ({e}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def send_bulk_email(to_addresses, subject, summary_text, action_items, client=None, limiter=None,
+                    workers=SES_WORKERS, batch_size=SES_MAX_RECIPIENTS, max_retries=SES_MAX_RETRIES,
+                    on_batch_sent=None):
+    """
+    Sends the meeting email to any number of recipients.
+    The bodies are rendered once; recipients are split into batches of batch_size
+    (the SES per-call limit), sent concurrently under the shared rate limit, and
+    throttled calls are retried with exponential backoff.
+    on_batch_sent(recipients, message_id) is called as each batch is delivered.
+    A batch that fails with any error does not stop the others.
+    Returns {"sent", "failed", "message_ids", "batches", "results"} where failed lists
+    {"recipients", "error"} for batches that could not be delivered, and results holds
+    {"recipients", "message_id", "error"} for every batch in order.
+    """
+    client = client or ses_client
+    limiter = limiter or rate_limiter
+    plain_body, html_body = render_email(summary_text, action_items)
+    message = {
+        "Subject": {"Data": subject, "Charset": "UTF-8"},
+        "Body": {
+            "Text": {"Data": plain_body, "Charset": "UTF-8"},
+            "Html": {"Data": html_body, "Charset": "UTF-8"},
+        },
+    }
+    batches = [to_addresses[i:i + batch_size] for i in range(0, len(to_addresses), batch_size)]
+    logger.info(f"Sending email from {SOURCE_EMAIL} to {len(to_addresses)} recipients in {len(batches)} batches")
+
+    result = {"sent": 0, "failed": [], "message_ids": [], "batches": len(batches), "results": []}
+    batch_results = [{"recipients": batch, "message_id": None, "error": None} for batch in batches]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as pool:
+        futures = {pool.submit(_send_batch, client, batch_result["recipients"], message, limiter, max_retries):
+                   batch_result for batch_result in batch_results}
+        for future in as_completed(futures):
+            batch_result = futures[future]
+            batch = batch_result["recipients"]
+            try:
+                batch_result["message_id"] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to send email to {len(batch)} recipients: {e}")
+                batch_result["error"] = str(e)
+                result["failed"].append({"recipients": batch, "error": str(e)})
+                continue
+            result["message_ids"].append(batch_result["message_id"])
+            result["sent"] += len(batch)
+            if on_batch_sent:
+                on_batch_sent(batch, batch_result["message_id"])
+    result["results"] = batch_results
+    return result
+
+
+def send_meeting_email(to_addresses, subject, summary_text, action_items):
+    """
+    Sends an email using AWS SES with both plain text and HTML content.
+    The HTML content includes the meeting summary and action items, with checkboxes next to each action item.
+    action_items may be structured records or the newline-separated text.
+    Large recipient lists are sent in batches; raises EmailDeliveryError if any batch failed.
+
+    Note: SES in sandbox mode requires that both SOURCE_EMAIL and each recipient
+    address be verified. Check AWS SES console for your sandbox status.
+    """
+    result = send_bulk_email(to_addresses, subject, summary_text, action_items)
+    if result["failed"]:
+        failed = sum(len(batch["recipients"]) for batch in result["failed"])
+        raise EmailDeliveryError(f"Failed to send email to {failed} of {len(to_addresses)} recipients", result)
+    logger.info(f"Email sent! Message IDs: {result['message_ids']}")
+    return result
@@ -0,0 +1,155 @@
+# quickmeet-backend/embedding_store.py
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from model_registry import registry
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("QUICKMEET_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_CACHE_DIR = os.getenv("QUICKMEET_EMBEDDING_CACHE_DIR", os.path.join("cache", "embeddings"))
+# Number of recently used corpora kept in memory in front of the on-disk store
+MEMORY_CACHE_SIZE = int(os.getenv("QUICKMEET_EMBEDDING_MEMORY_CACHE", "32"))
+# Eviction policy for the files on disk: beyond either limit the least recently used go first (0 disables a limit)
+DISK_MAX_ENTRIES = int(os.getenv("QUICKMEET_EMBEDDING_CACHE_MAX_ENTRIES", "5000"))
+DISK_MAX_BYTES = int(os.getenv("QUICKMEET_EMBEDDING_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+
+def _load_sentence_transformer(model_name):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+registry.register_loader("sentence-transformer", _load_sentence_transformer)
+
+
+def get_encoder(model_name=EMBEDDING_MODEL):
+    """Returns the resident SentenceTransformer, loading it once per process."""
+    return registry.get("sentence-transformer", model_name)
+
+
+def encode(texts, model_name=EMBEDDING_MODEL):
+    """Encodes a list of texts into L2-normalised float32 vectors (one row per text)."""
+    encoder = get_encoder(model_name)
+    with timed("embed"):
+        vectors = encoder.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def encode_query(query, model_name=EMBEDDING_MODEL):
+    """Encodes a single query into a normalised float32 vector."""
+    return encode([query], model_name)[0]
+
+
+def corpus_hash(sentences, model_name=EMBEDDING_MODEL):
+    """Content hash of a sentence list; the key under which its embeddings are stored."""
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for sentence in sentences:
+        digest.update(b"\x00")
+        digest.update(sentence.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Content-hash keyed store of sentence embeddings.
+    Embeddings live as .npy files on disk with a small LRU in memory in front,
+    so a corpus that has not changed is never encoded twice. File mtimes track last
+    use; the least recently used files are deleted beyond max_entries or max_bytes.
+    """
+
+    def __init__(self, cache_dir=EMBEDDING_CACHE_DIR, memory_cache_size=MEMORY_CACHE_SIZE,
+                 max_entries=DISK_MAX_ENTRIES, max_bytes=DISK_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.memory_cache_size = memory_cache_size
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def get_embeddings(self, sentences, model_name=EMBEDDING_MODEL):
+        """Returns the (n, dim) embedding matrix for sentences, encoding only on a cache miss."""
+        key = corpus_hash(sentences, model_name)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            embeddings = np.load(path)
+            os.utime(path)  # mark as recently used
+            with self._lock:
+                self.hits += 1
+        except FileNotFoundError:
+            embeddings = encode(sentences, model_name)
+            self._save(path, embeddings)
+            self._evict()
+            with self._lock:
+                self.misses += 1
+            logger.info(f"Encoded {len(sentences)} sentences into {path}")
+
+        with self._lock:
+            self._memory[key] = embeddings
+            while len(self._memory) > self.memory_cache_size:
+                self._memory.popitem(last=False)
+        return embeddings
+
+    def _save(self, path, embeddings):
+        # Write to a temp file first so readers never see a partial array
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, embeddings)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        if not self.max_entries and not self.max_bytes:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npy"):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, name in entries:
+            if (not self.max_entries or count <= self.max_entries) and \
+                    (not self.max_bytes or total_bytes <= self.max_bytes):
+                break
+            try:
+                os.unlink(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total_bytes -= size
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "in_memory": len(self._memory),
+        }
+
+
+# Shared store for the whole process
+store = EmbeddingStore()
@@ -0,0 +1,61 @@
+# quickmeet-backend/gunicorn.conf.py
+"""
+gunicorn settings for serving QuickMeet: gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is imported once in the master (preload_app), which loads the models in
+QUICKMEET_PRELOAD_MODELS before forking. Workers then share the weights copy-on-write
+instead of each loading its own copy. Background threads (outbox delivery) do not
+survive fork(), so every worker starts its own once it has loaded the app.
+"""
+import gc
+import os
+
+# Address to listen on
+bind = os.getenv("QUICKMEET_BIND", "0.0.0.0:5000")
+# Worker processes; each holds a share of the models and runs CPU-bound inference
+workers = int(os.getenv("QUICKMEET_WEB_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Threads per worker, so slow requests (streaming summaries, PDF downloads) do not block the worker
+worker_class = "gthread"
+threads = int(os.getenv("QUICKMEET_WEB_THREADS", "4"))
+# Summaries of long meetings can take minutes on CPU
+timeout = int(os.getenv("QUICKMEET_WEB_TIMEOUT", "300"))
+graceful_timeout = 30
+# Load the app and its models in the master; set to 0 to load them in every worker instead
+preload_app = os.getenv("QUICKMEET_WEB_PRELOAD", "1") == "1"
+accesslog = "-"
+
+# Job status is polled through any worker, so jobs go through the queue they all share
+os.environ.setdefault("QUICKMEET_JOB_BACKEND", "sqlite")
+if workers > 1 and os.environ["QUICKMEET_JOB_BACKEND"] == "inprocess":
+    raise RuntimeError("QUICKMEET_JOB_BACKEND=inprocess keeps jobs in the worker that queued them; "
+                       "use the sqlite backend or QUICKMEET_WEB_WORKERS=1")
+# Deferred loading would happen in each worker after the fork, so every worker would hold its own copy of the models
+if preload_app and os.getenv("QUICKMEET_PRELOAD_IN_BACKGROUND", "0") == "1":
+    raise RuntimeError("QUICKMEET_PRELOAD_IN_BACKGROUND=1 loads the models in every worker instead of once in the "
+                       "master; unset it, or set QUICKMEET_WEB_PRELOAD=0 to load them per worker on purpose")
+# The app starts its background threads in post_worker_init, not at import in the master
+os.environ["QUICKMEET_START_WORKERS_ON_IMPORT"] = "0"
+# Split the cores between the workers so concurrent inference does not oversubscribe the CPU
+os.environ.setdefault("QUICKMEET_TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+import model_registry  # noqa: E402
+from summarization_engine import SUMMARY_MODEL  # noqa: E402
+from embedding_store import EMBEDDING_MODEL  # noqa: E402
+
+if not model_registry.PRELOAD_MODELS:
+    # Warm both models the app uses unless QUICKMEET_PRELOAD_MODELS says otherwise
+    model_registry.PRELOAD_MODELS = f"summarization:{SUMMARY_MODEL},sentence-transformer:{EMBEDDING_MODEL}"
+
+
+def when_ready(server):
+    if preload_app:
+        # Move everything loaded so far out of the garbage collector's reach; otherwise
+        # collections in the workers write to every object and un-share their pages
+        gc.collect()
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # Runs in the worker after the app is loaded, whether it was preloaded or not
+    import app
+    app.start_background_workers()
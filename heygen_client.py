@@ -0,0 +1,201 @@
+# quickmeet-backend/heygen_client.py
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+HEYGEN_API_KEY = os.getenv("HEYGEN_API_KEY")
+# Point this at heygen_mock.py (e.g. http://localhost:5002) to run without the real API
+HEYGEN_BASE_URL = os.getenv("HEYGEN_BASE_URL", "https://api.heygen.com")
+VOICE_ID = os.getenv("HEYGEN_VOICE_ID", "1bd001e7e50f421d891986aad5158bc8")
+AVATAR_ID = os.getenv("HEYGEN_AVATAR_ID", "fc860c2705d244c787e8ea0188bc4c97")
+# HeyGen rejects narration text of this many characters or more
+MAX_TEXT_CHARS = 1500
+
+# A video not finished within this many seconds is reported as failed
+VIDEO_DEADLINE_SECONDS = int(os.getenv("QUICKMEET_VIDEO_DEADLINE", "1800"))
+# Status polling starts at the initial interval and backs off to the maximum
+POLL_INITIAL_SECONDS = float(os.getenv("QUICKMEET_VIDEO_POLL_SECONDS", "5"))
+POLL_MAX_SECONDS = 30.0
+POLL_BACKOFF = 1.5
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+REQUEST_TIMEOUT = 30
+
+PROCESSING, DOWNLOADING = "processing", "downloading"
+
+
+class HeyGenError(Exception):
+    """Raised when HeyGen rejects a request or a video fails to render."""
+
+
+class HeyGenClient:
+    """
+    Thin client for the HeyGen video API. One requests session (and its connection
+    pool) is reused for every call; it is created, and requests imported, on first use.
+    """
+
+    def __init__(self, api_key=HEYGEN_API_KEY, base_url=HEYGEN_BASE_URL, avatar_id=AVATAR_ID, voice_id=VOICE_ID):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.avatar_id = avatar_id
+        self.voice_id = voice_id
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session = requests.Session()
+                    session.headers.update({"X-Api-Key": self.api_key or "", "Accept": "application/json"})
+                    self._session = session
+        return self._session
+
+    def submit(self, text):
+        """Starts rendering a video of the avatar reading text and returns HeyGen's video id."""
+        if len(text) >= MAX_TEXT_CHARS:
+            raise HeyGenError(f"Narration text must be shorter than {MAX_TEXT_CHARS} characters")
+        payload = {
+            "video_inputs": [
+                {
+                    "character": {"type": "avatar", "avatar_id": self.avatar_id, "avatar_style": "normal"},
+                    "voice": {"type": "text", "input_text": text, "voice_id": self.voice_id, "speed": 1.0},
+                }
+            ],
+            "dimension": {"width": 1280, "height": 720},
+        }
+        response = self.session.post(f"{self.base_url}/v2/video/generate", json=payload, timeout=REQUEST_TIMEOUT)
+        try:
+            data = response.json()
+        except ValueError:
+            raise HeyGenError(f"Invalid response from HeyGen ({response.status_code}): {response.text[:200]}")
+        video_id = (data.get("data") or {}).get("video_id")
+        if response.status_code != 200 or not video_id:
+            raise HeyGenError(f"Video generation was rejected ({response.status_code}): {data.get('error') or data}")
+        return video_id
+
+    def status(self, video_id):
+        """Returns (status, video_url, error) for a video."""
+        response = self.session.get(
+            f"{self.base_url}/v2/video/status", params={"video_id": video_id}, timeout=REQUEST_TIMEOUT,
+        )
+        if response.status_code != 200:
+            raise HeyGenError(f"Status check failed with {response.status_code}")
+        data = response.json().get("data")
+        if data is None:
+            raise HeyGenError("'data' key missing in HeyGen response")
+        return data.get("status"), data.get("video_url"), data.get("error")
+
+    def download(self, video_url, output_path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Streams the video to output_path in large chunks straight from the socket,
+        writing to a temporary file that is renamed into place when complete.
+        """
+        directory = os.path.dirname(output_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self.session.get(video_url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code != 200:
+                raise HeyGenError(f"Failed to download video: {response.status_code}")
+            response.raw.decode_content = True
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".mp4.part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, chunk_size)
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        return output_path
+
+
+class VideoPoller:
+    """
+    One asyncio event loop, on its own thread, tracks every in-flight HeyGen video.
+    Each video is polled with backoff until it completes, fails or passes its deadline;
+    the blocking HTTP calls run in the loop's default executor.
+    """
+
+    def __init__(self, client, initial_interval=POLL_INITIAL_SECONDS, max_interval=POLL_MAX_SECONDS,
+                 backoff=POLL_BACKOFF):
+        self.client = client
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._loop = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="quickmeet-video-poller", daemon=True).start()
+            return self._loop
+
+    def track(self, video_id, deadline_seconds=VIDEO_DEADLINE_SECONDS, download_to=None, on_update=None):
+        """
+        Starts tracking a video and returns a concurrent Future resolving to the
+        video URL (or to download_to once the file has been downloaded there).
+        on_update(status) is called from the poller thread on every status change.
+        """
+        return self.run(self.poll(video_id, time.monotonic() + deadline_seconds, download_to, on_update))
+
+    def run(self, coroutine):
+        """Schedules a coroutine on the poller's loop and returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    async def poll(self, video_id, deadline, download_to=None, on_update=None):
+        """Coroutine form of track(); deadline is a time.monotonic() value."""
+        import requests
+        loop = asyncio.get_running_loop()
+        interval = self.initial_interval
+        last_status = None
+        self._in_flight += 1
+        try:
+            while True:
+                try:
+                    status, video_url, error = await loop.run_in_executor(None, self.client.status, video_id)
+                except (requests.RequestException, HeyGenError) as e:
+                    # Transient API errors are retried until the deadline
+                    logger.warning(f"Status check for video {video_id} failed: {e}")
+                    status, video_url, error = last_status, None, None
+
+                if status != last_status and on_update:
+                    on_update(status)
+                last_status = status
+
+                if status == "completed":
+                    if not download_to:
+                        return video_url
+                    if on_update:
+                        on_update(DOWNLOADING)
+                    return await loop.run_in_executor(None, self.client.download, video_url, download_to)
+                if status == "failed":
+                    raise HeyGenError(f"Video generation failed: {error or 'no reason given'}")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise HeyGenError(f"Video {video_id} was not ready before the deadline")
+                await asyncio.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_interval)
+        finally:
+            self._in_flight -= 1
+
+    def stats(self):
+        return {"in_flight": self._in_flight}
+
+
+# Shared client and poller for the whole process
+client = HeyGenClient()
+poller = VideoPoller(client)
@@ -0,0 +1,126 @@
+# quickmeet-backend/heygen_mock.py
+"""
+Local stand-in for the HeyGen API, for tests and development without an API key.
+
+    python heygen_mock.py --port 5002 --render-seconds 3
+    HEYGEN_BASE_URL=http://localhost:5002 python app.py
+
+Videos report "processing" for render_seconds and then "completed" with a URL
+served by this server. Narration containing "FAIL" renders as "failed".
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class MockHeyGenServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, render_seconds=2.0, video_bytes=4 * 1024 * 1024):
+        super().__init__(address, MockHeyGenHandler)
+        self.render_seconds = render_seconds
+        self.video_bytes = video_bytes
+        self.videos = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class MockHeyGenHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/v2/video/generate":
+            return self._json(404, {"error": "not found"})
+        if not self.headers.get("X-Api-Key"):
+            return self._json(401, {"error": "missing api key", "data": None})
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        text = body["video_inputs"][0]["voice"]["input_text"]
+        if len(text) >= 1500:
+            return self._json(400, {"error": "input_text too long", "data": None})
+        video_id = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.videos[video_id] = {"text": text, "created_at": time.monotonic()}
+            self.server.requests.append(("generate", text))
+        self._json(200, {"error": None, "data": {"video_id": video_id}})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/v2/video/status":
+            video_id = parse_qs(url.query).get("video_id", [""])[0]
+            with self.server.lock:
+                video = self.server.videos.get(video_id)
+                self.server.requests.append(("status", video_id))
+            if video is None:
+                return self._json(404, {"error": "unknown video", "data": None})
+            if "FAIL" in video["text"]:
+                data = {"status": "failed", "error": "mock render failure"}
+            elif time.monotonic() - video["created_at"] < self.server.render_seconds:
+                data = {"status": "processing"}
+            else:
+                data = {"status": "completed", "video_url": f"{self.server.base_url}/files/{video_id}.mp4"}
+            return self._json(200, {"error": None, "data": data})
+
+        if url.path.startswith("/files/"):
+            video_id = os.path.splitext(os.path.basename(url.path))[0]
+            with self.server.lock:
+                video = self.server.videos.get(video_id)
+            if video is None:
+                return self._json(404, {"error": "unknown video"})
+            # Deterministic content per video so tests can compare downloads
+            block = (video_id.encode("ascii") * 2048)[:64 * 1024]
+            remaining = self.server.video_bytes
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(remaining))
+            self.end_headers()
+            while remaining > 0:
+                chunk = block[:remaining]
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+            return
+        self._json(404, {"error": "not found"})
+
+
+def start_mock_server(host="127.0.0.1", port=0, **options):
+    """Starts the mock server on a background thread and returns it (see server.base_url)."""
+    server = MockHeyGenServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="heygen-mock", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5002)
+    parser.add_argument("--render-seconds", type=float, default=2.0, help="time before a video completes")
+    parser.add_argument("--video-mb", type=float, default=4, help="size of the served video")
+    args = parser.parse_args()
+    server = MockHeyGenServer((args.host, args.port), render_seconds=args.render_seconds,
+                              video_bytes=int(args.video_mb * 1024 * 1024))
+    print(f"Mock HeyGen API listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# quickmeet-backend/jobs.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+# "inprocess" runs jobs on a thread pool in this process; "sqlite" is a local stand-in
+# for a Redis-style queue that several processes can share.
+JOB_BACKEND = os.getenv("QUICKMEET_JOB_BACKEND", "inprocess")
+JOB_WORKERS = int(os.getenv("QUICKMEET_JOB_WORKERS", "2"))
+# Jobs allowed to wait for a worker before submissions are rejected
+JOB_QUEUE_SIZE = int(os.getenv("QUICKMEET_JOB_QUEUE_SIZE", "16"))
+JOB_DB_PATH = os.getenv("QUICKMEET_JOB_DB", "jobs.db")
+# Finished jobs are kept for status polling for this many seconds
+JOB_TTL_SECONDS = int(os.getenv("QUICKMEET_JOB_TTL", "3600"))
+# A running sqlite job whose process stopped renewing its lease for this long is run again
+JOB_LEASE_SECONDS = int(os.getenv("QUICKMEET_JOB_LEASE_SECONDS", "60"))
+# Runs of a sqlite job whose worker died each time before it is failed instead
+JOB_MAX_ATTEMPTS = 3
+
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+def _new_job(task, args, key=None):
+    return {
+        "id": uuid.uuid4().hex,
+        "task": task,
+        "args": args,
+        "key": key,
+        "status": QUEUED,
+        "result": None,
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+
+def _public(job):
+    """The job fields exposed through the status endpoint."""
+    return {k: v for k, v in job.items() if k not in ("args", "key")}
+
+
+class InProcessBackend:
+    """Runs jobs on a thread pool inside this process. Job state lives in memory."""
+
+    name = "inprocess"
+
+    def __init__(self, run_task, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE, ttl=JOB_TTL_SECONDS):
+        self._run_task = run_task
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task, args, key=None):
+        with self._lock:
+            self._prune()
+            if key is not None:
+                for j in self._jobs.values():
+                    if j["key"] == key and j["status"] in (QUEUED, RUNNING):
+                        return j["id"], j["args"], False
+            pending = sum(1 for j in self._jobs.values() if j["status"] in (QUEUED, RUNNING))
+            if pending >= self.workers + self.queue_size:
+                raise QueueFull(f"Job queue is full ({pending} pending)")
+            if self._executor is None:
+                # Created on first use so forked server workers each get their own threads
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="quickmeet-job")
+            job = _new_job(task, args, key)
+            self._jobs[job["id"]] = job
+        self._executor.submit(self._execute, job)
+        return job["id"], args, True
+
+    def _execute(self, job):
+        with self._lock:
+            job["status"], job["started_at"] = RUNNING, time.time()
+        try:
+            result = self._run_task(job["task"], job["args"])
+            update = {"status": COMPLETED, "result": result}
+        except Exception as e:
+            logger.error(f"Job {job['id']} ({job['task']}) failed: {e}\n{traceback.format_exc()}")
+            update = {"status": FAILED, "error": str(e)}
+        with self._lock:
+            job.update(update, finished_at=time.time())
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, j in self._jobs.items() if j["finished_at"] and j["finished_at"] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return _public(job) if job else None
+
+    def depth(self):
+        with self._lock:
+            return {
+                QUEUED: sum(1 for j in self._jobs.values() if j["status"] == QUEUED),
+                RUNNING: sum(1 for j in self._jobs.values() if j["status"] == RUNNING),
+            }
+
+
+class SQLiteQueueBackend:
+    """
+    Local stand-in for a Redis-style queue: jobs are pushed into a SQLite table and
+    claimed by worker threads in any process pointing at the same database file.
+    Task arguments and results must be JSON serialisable.
+    Each process renews the lease of the jobs it runs; a job whose lease ran out (its
+    process died) is claimed again, up to JOB_MAX_ATTEMPTS runs.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, run_task, db_path=JOB_DB_PATH, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE,
+                 ttl=JOB_TTL_SECONDS, poll_interval=0.5, lease_seconds=JOB_LEASE_SECONDS):
+        self._run_task = run_task
+        self.db_path = db_path
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    task TEXT NOT NULL,
+                    args TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    lease_until REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    key TEXT
+                )"""
+            )
+            # Databases from earlier versions lack the lease columns and the key
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("lease_until", "REAL"), ("attempts", "INTEGER NOT NULL DEFAULT 0"), ("key", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key) WHERE key IS NOT NULL")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _ensure_workers(self):
+        # Started on first use so forked server workers each get their own threads
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"quickmeet-job-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._heartbeat_loop, name="quickmeet-job-lease", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, task, args, key=None):
+        self._ensure_workers()
+        job = _new_job(task, args, key)
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (time.time() - self.ttl,))
+            if key is not None:
+                row = conn.execute(
+                    "SELECT id, args FROM jobs WHERE key = ? AND status IN (?, ?) LIMIT 1", (key, QUEUED, RUNNING),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("COMMIT")
+                    return row["id"], json.loads(row["args"]), False
+            # Only waiting jobs count: running ones hold a worker in some process, and how many
+            # workers all processes have together is not known here. A running job whose lease
+            # ran out waits to be claimed again, so it counts as queued.
+            queued = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? OR (status = ? AND COALESCE(lease_until, 0) < ?)",
+                (QUEUED, RUNNING, time.time()),
+            ).fetchone()[0]
+            if queued >= self.queue_size:
+                conn.execute("ROLLBACK")
+                raise QueueFull(f"Job queue is full ({queued} queued)")
+            conn.execute(
+                "INSERT INTO jobs (id, task, args, status, created_at, key) VALUES (?, ?, ?, ?, ?, ?)",
+                (job["id"], task, json.dumps(args), QUEUED, job["created_at"], key),
+            )
+            conn.execute("COMMIT")
+        self._wakeup.set()
+        return job["id"], args, True
+
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            """UPDATE jobs SET status = ?, error = ?, finished_at = ?
+               WHERE status = ? AND COALESCE(lease_until, 0) < ? AND attempts >= ?""",
+            (FAILED, f"The worker running the job stopped {JOB_MAX_ATTEMPTS} times", now, RUNNING, now,
+             JOB_MAX_ATTEMPTS),
+        )
+        row = conn.execute(
+            """SELECT id, task, args FROM jobs
+               WHERE status = ? OR (status = ? AND COALESCE(lease_until, 0) < ?)
+               ORDER BY created_at LIMIT 1""",
+            (QUEUED, RUNNING, now),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = ?, started_at = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+            (RUNNING, now, now + self.lease_seconds, row["id"]),
+        )
+        conn.execute("COMMIT")
+        return row
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            with self._running_lock:
+                running = list(self._running)
+            if not running:
+                continue
+            try:
+                with closing(self._connect()) as conn:
+                    conn.execute(
+                        f"UPDATE jobs SET lease_until = ? WHERE status = ? AND id IN ({', '.join('?' * len(running))})",
+                        (time.time() + self.lease_seconds, RUNNING, *running),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not renew the leases of running jobs: {e}")
+
+    def _finish(self, job_id, status, result=None, error=None, attempts=5):
+        """Records the outcome of a job, retrying while the database is unavailable."""
+        for attempt in range(attempts):
+            try:
+                with closing(self._connect()) as conn:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                        (status, result, error, time.time(), job_id),
+                    )
+                return
+            except sqlite3.Error as e:
+                logger.warning(f"Could not record the outcome of job {job_id}: {e}")
+                time.sleep(min(30, 2 ** attempt))
+        logger.error(f"Gave up recording the outcome of job {job_id}; it runs again once its lease runs out")
+
+    def _worker_loop(self):
+        conn = self._connect()
+        while True:
+            try:
+                row = self._claim(conn)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not claim a job: {e}")
+                try:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    conn = self._connect()
+                row = None
+            if row is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            with self._running_lock:
+                self._running.add(row["id"])
+            try:
+                try:
+                    result = json.dumps(self._run_task(row["task"], json.loads(row["args"])))
+                    outcome = {"status": COMPLETED, "result": result}
+                except Exception as e:
+                    logger.error(f"Job {row['id']} ({row['task']}) failed: {e}\n{traceback.format_exc()}")
+                    outcome = {"status": FAILED, "error": str(e)}
+                self._finish(row["id"], **outcome)
+            finally:
+                with self._running_lock:
+                    self._running.discard(row["id"])
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job.pop("lease_until", None)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return _public(job)
+
+    def depth(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE status IN (?, ?) GROUP BY status", (QUEUED, RUNNING)
+            ).fetchall()
+        counts = {QUEUED: 0, RUNNING: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+BACKENDS = {
+    InProcessBackend.name: InProcessBackend,
+    SQLiteQueueBackend.name: SQLiteQueueBackend,
+}
+
+
+class JobQueue:
+    """
+    Runs named tasks in the background and tracks their status.
+    Tasks are registered by name so any backend can look them up in its workers.
+    """
+
+    def __init__(self, backend=JOB_BACKEND, **backend_options):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown job backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+        self._tasks = {}
+        self.backend = BACKENDS[backend](self._run_task, **backend_options)
+
+    def register(self, name, func):
+        """Registers func(**args) under name. The return value becomes the job result."""
+        self._tasks[name] = func
+
+    def task(self, name):
+        """Decorator form of register()."""
+        def decorator(func):
+            self.register(name, func)
+            return func
+        return decorator
+
+    def _run_task(self, name, args):
+        func = self._tasks.get(name)
+        if func is None:
+            raise ValueError(f"No task registered under '{name}'")
+        return func(**args)
+
+    def submit(self, name, **args):
+        """Queues a task and returns its job id. Raises QueueFull when the queue is at capacity."""
+        if name not in self._tasks:
+            raise ValueError(f"No task registered under '{name}'")
+        return self.backend.submit(name, args)[0]
+
+    def submit_once(self, name, key, **args):
+        """
+        Queues a task unless a queued or running job was submitted with the same key.
+        Returns (job id, args of that job, True if it was queued now).
+        Raises QueueFull when a new job is needed and the queue is at capacity.
+        """
+        if name not in self._tasks:
+            raise ValueError(f"No task registered under '{name}'")
+        return self.backend.submit(name, args, key)
+
+    def get(self, job_id):
+        """Returns the job status dict, or None if the id is unknown or expired."""
+        return self.backend.get(job_id)
+
+    def stats(self):
+        return {"backend": self.backend.name, **self.backend.depth()}
+
+
+# Shared queue for the whole process
+queue = JobQueue()
@@ -0,0 +1,525 @@
+# quickmeet-backend/live_transcription.py
+"""
+Live transcription of meetings in progress.
+
+The client streams audio chunks while the meeting runs; each chunk goes straight to a
+streaming transcription backend (Amazon Transcribe Streaming, or an offline stub), and
+final results are appended to the meeting's transcript as they arrive. Every
+WINDOW_SECONDS of audio, cut at the end of a sentence, the window is processed in the
+background: its text is appended to the saved transcript and its timing saved on its
+own, the window's sentences are added to the search index, the window is summarized and the meeting summary is rebuilt from
+the window summaries. Window summaries are condensed in groups of SUMMARY_GROUP_WINDOWS,
+and groups of groups in turn, so the input of the meeting summary stays short however
+long the meeting runs. When the meeting ends only the last window, the final summary pass and action item
+extraction remain, and the whole transcript and timing are written once.
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from action_items import format_action_items
+from meeting_store import store as meeting_store, TRANSCRIPT, SUMMARY
+from metrics import timed
+from nlp_processing import summarize_transcript, extract_action_item_records
+from semantic_search import index_transcript_window, index_meeting_text
+from transcriber import REGION, MAX_SPEAKERS
+from transcript_model import (TranscriptBuilder, save_for_meeting as save_transcript_timing,
+                              save_window_for_meeting as save_window_timing,
+                              remove_windows_for_meeting as remove_window_timing)
+
+logger = logging.getLogger(__name__)
+
+# "aws" for Amazon Transcribe Streaming (needs the amazon-transcribe package), "stub" to read chunks as text
+LIVE_BACKEND = os.getenv("QUICKMEET_LIVE_BACKEND", "aws")
+# Audio per incremental update of the transcript, search index and summary
+WINDOW_SECONDS = float(os.getenv("QUICKMEET_LIVE_WINDOW_SECONDS", "60"))
+# Window summaries (and then group summaries) condensed into one, so the meeting summary's input stays short
+SUMMARY_GROUP_WINDOWS = int(os.getenv("QUICKMEET_LIVE_SUMMARY_GROUP", "8"))
+# Sessions without a chunk for this many seconds are finished as if the client had ended them
+SESSION_TTL_SECONDS = int(os.getenv("QUICKMEET_LIVE_TTL", "600"))
+# Largest audio chunk accepted per request
+MAX_CHUNK_BYTES = int(os.getenv("QUICKMEET_LIVE_CHUNK_KB", "256")) * 1024
+
+MEDIA_ENCODINGS = ("pcm", "ogg-opus", "flac")
+SENTENCE_END = ".?!"
+READ_SIZE = 64 * 1024
+
+
+class LiveError(Exception):
+    """Raised for invalid live session requests (unknown meeting, wrong offset, already finished)."""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+# --- backends -------------------------------------------------------------
+
+class _StubStream:
+    def __init__(self, backend, on_items):
+        self.backend = backend
+        self.on_items = on_items
+        self._pending = b""
+        self._clock = 0.0
+        self._sentence = 0
+
+    def send(self, chunk):
+        data = self._pending + chunk
+        # The last word may continue in the next chunk; splitting at ASCII whitespace never splits a character
+        cut = max(data.rfind(space) for space in (b" ", b"\n", b"\t", b"\r")) + 1
+        self._pending = data[cut:]
+        self._emit(data[:cut])
+
+    def close(self):
+        self._emit(self._pending)
+        self._pending = b""
+
+    def _emit(self, data):
+        backend, items = self.backend, []
+        for token in data.decode("utf-8", "replace").split():
+            word = token.rstrip(",.?!")
+            speaker = f"spk_{self._sentence // backend.sentences_per_turn % backend.speakers}"
+            if word:
+                items.append({"type": "pronunciation", "start_time": self._clock,
+                              "end_time": self._clock + backend.seconds_per_word * 0.8, "speaker_label": speaker,
+                              "alternatives": [{"confidence": 0.98, "content": word}]})
+                self._clock += backend.seconds_per_word
+            for mark in token[len(word):]:
+                items.append({"type": "punctuation", "speaker_label": speaker,
+                              "alternatives": [{"confidence": 0.0, "content": mark}]})
+                self._sentence += mark in SENTENCE_END
+        if items:
+            self.on_items(items)
+
+
+class StubStreamingBackend:
+    """
+    Offline stand-in for Transcribe Streaming: audio chunks are read as UTF-8 text, and
+    every complete word comes back at once as a final result, timed at a steady speaking
+    rate with the speaker changing every few sentences.
+    """
+
+    def __init__(self, seconds_per_word=0.4, speakers=3, sentences_per_turn=3):
+        self.seconds_per_word = seconds_per_word
+        self.speakers = speakers
+        self.sentences_per_turn = sentences_per_turn
+
+    def prepare(self):
+        pass
+
+    def start(self, on_items, sample_rate, media_encoding):
+        return _StubStream(self, on_items)
+
+
+class _AWSStream:
+    def __init__(self, backend, on_items, sample_rate, media_encoding):
+        self.backend = backend
+        self.on_items = on_items
+        # Transcribe works best with audio events of 50-200 ms; 100 ms of 16-bit PCM per event
+        self.frame_bytes = sample_rate // 5 if media_encoding == "pcm" else READ_SIZE
+        self._stream = None
+        self._reader = None
+        self._call(self._start(sample_rate, media_encoding))
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.backend.loop).result()
+
+    async def _start(self, sample_rate, media_encoding):
+        self._stream = await self.backend.client.start_stream_transcription(
+            language_code="en-US",
+            media_sample_rate_hz=sample_rate,
+            media_encoding=media_encoding,
+            show_speaker_label=bool(MAX_SPEAKERS),
+        )
+        self._reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        async for event in self._stream.output_stream:
+            for result in event.transcript.results:
+                # Partial results are revised until final; only final ones are appended
+                if result.is_partial or not result.alternatives:
+                    continue
+                self.on_items([{
+                    "type": item.item_type,
+                    "start_time": item.start_time,
+                    "end_time": item.end_time,
+                    "speaker_label": f"spk_{item.speaker}" if item.speaker is not None else None,
+                    "alternatives": [{"confidence": getattr(item, "confidence", None), "content": item.content}],
+                } for item in result.alternatives[0].items])
+
+    async def _send(self, chunk):
+        for start in range(0, len(chunk), self.frame_bytes):
+            await self._stream.input_stream.send_audio_event(audio_chunk=chunk[start:start + self.frame_bytes])
+
+    async def _close(self):
+        await self._stream.input_stream.end_stream()
+        await self._reader
+
+    def send(self, chunk):
+        self._call(self._send(chunk))
+
+    def close(self):
+        """Ends the audio stream and returns once every final result has been delivered."""
+        self._call(self._close())
+
+
+class AWSStreamingBackend:
+    """
+    Amazon Transcribe Streaming through the amazon-transcribe SDK, an optional dependency
+    imported on first use. The SDK is asyncio-based; every stream of the process runs on
+    one event loop thread, and callers block only while their own audio is sent.
+    """
+
+    def __init__(self, region=REGION):
+        self.region = region
+        self.client = None
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def prepare(self):
+        """Imports the SDK and starts the event loop; raises LiveError when the SDK is not installed."""
+        # Started lazily so forked server workers each run their own loop
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            try:
+                from amazon_transcribe.client import TranscribeStreamingClient
+            except ImportError as e:
+                raise LiveError("Live transcription with Transcribe Streaming needs the amazon-transcribe package",
+                                status=501) from e
+            self.client = TranscribeStreamingClient(region=self.region)
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, name="live-transcribe", daemon=True)
+            self._thread.start()
+
+    def start(self, on_items, sample_rate, media_encoding):
+        self.prepare()
+        return _AWSStream(self, on_items, sample_rate, media_encoding)
+
+
+BACKENDS = {"aws": AWSStreamingBackend, "stub": StubStreamingBackend}
+
+
+# --- sessions -------------------------------------------------------------
+
+class LiveSession:
+    """
+    One meeting being transcribed live. Chunks must arrive in order, like the chunks of
+    a resumable upload. Final results are appended to a TranscriptBuilder; closed windows
+    are processed in order by the session's worker thread, so chunks are never held up
+    by the summarizer.
+    """
+
+    def __init__(self, meeting_id, backend, sample_rate=16000, media_encoding="pcm", window_seconds=WINDOW_SECONDS,
+                 date=None):
+        self.meeting_id = meeting_id
+        self.sample_rate = sample_rate
+        self.media_encoding = media_encoding
+        self.window_ms = window_seconds * 1000
+        self.date = date
+        self.received_bytes = 0
+        self.finished = False
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+        self.builder = TranscriptBuilder()
+        self.summary = None
+        # Level i holds summaries of SUMMARY_GROUP_WINDOWS**i windows each, oldest first
+        self._summary_levels = [[]]
+        self.windows_closed = 0
+        self.windows_processed = 0
+        self.errors = []
+        self._transcript_indexed = False
+        self._window_char_start = 0
+        self._window_first_word = 0
+        self._window_start_ms = 0
+        self._windows = queue.Queue()
+        # _send_lock orders chunks; _lock guards the transcript, which backends append to from their own threads
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.stream = backend.start(self._on_items, sample_rate, media_encoding)
+        self._worker = threading.Thread(target=self._process_windows, name=f"live-{meeting_id[:8]}", daemon=True)
+        self._worker.start()
+
+    def write_chunk(self, stream, offset):
+        """
+        Sends the audio read from stream (any object with .read(n)) at offset to the backend.
+        Returns the number of bytes accepted.
+        """
+        with self._send_lock:
+            if self.finished:
+                raise LiveError("Live session already finished", status=409)
+            if offset != self.received_bytes:
+                raise LiveError("Unexpected chunk offset", status=409, next_offset=self.received_bytes)
+            data = bytearray()
+            while True:
+                block = stream.read(READ_SIZE)
+                if not block:
+                    break
+                data += block
+                if len(data) > MAX_CHUNK_BYTES:
+                    raise LiveError(f"Chunks may not exceed {MAX_CHUNK_BYTES} bytes", status=413)
+            with timed("live_send"):
+                self.stream.send(bytes(data))
+            self.received_bytes += len(data)
+            self.last_activity = time.time()
+            return len(data)
+
+    def _on_items(self, items):
+        with self._lock:
+            # A window closes at the first sentence end once it holds window_ms of audio;
+            # one batch of results may close several
+            first, end_ms = 0, self.builder.end_ms
+            for i, item in enumerate(items):
+                if item.get("type") == "pronunciation":
+                    end_ms = round(float(item.get("end_time", 0)) * 1000)
+                elif item["alternatives"][0]["content"] in SENTENCE_END and \
+                        end_ms - self._window_start_ms >= self.window_ms:
+                    self.builder.add_items(items[first:i + 1])
+                    first = i + 1
+                    self._close_window()
+            self.builder.add_items(items[first:])
+
+    def _close_window(self):
+        # Called with _lock held
+        start, end = self._window_char_start, self.builder.length
+        if end <= start:
+            return
+        self._windows.put((self.builder.build(self._window_first_word, start), start, end))
+        self.windows_closed += 1
+        self._window_char_start = end
+        self._window_first_word = self.builder.words
+        self._window_start_ms = self.builder.end_ms
+
+    def _process_windows(self):
+        while True:
+            window = self._windows.get()
+            if window is None:
+                return
+            try:
+                with timed("live_window"):
+                    self._process_window(*window)
+            except Exception as e:
+                logger.warning(f"Live window of meeting {self.meeting_id} failed: {e}")
+                self.errors.append(str(e))
+            finally:
+                self.windows_processed += 1
+
+    def _process_window(self, window, start, end):
+        # window is a Transcript of text[start:end] only, so the work per window does not grow with the meeting
+        meeting_id = self.meeting_id
+        save_window_timing(meeting_id, window, start, self.windows_processed)
+        meeting_store.append(meeting_id, TRANSCRIPT, window.text)
+        # Only the window's own sentences are encoded; the first window replaces anything indexed before
+        try:
+            index_transcript_window(meeting_id, window, 0, end - start, date=self.date,
+                                    append=self._transcript_indexed)
+            self._transcript_indexed = True
+        except Exception as e:
+            logger.warning(f"Indexing live transcript of meeting {meeting_id} failed: {e}")
+
+        window_text = window.text.strip()
+        if window_text:
+            self._add_summary(summarize_transcript(window_text)[0])
+            # The meeting summary is reduced from the partial summaries, never from the whole transcript again
+            parts = [summary for level in reversed(self._summary_levels) for summary in level]
+            self.summary = parts[0] if len(parts) == 1 else summarize_transcript("\n".join(parts))[0]
+            meeting_store.write(meeting_id, SUMMARY, self.summary)
+            try:
+                index_meeting_text(meeting_id, "summary", self.summary, date=self.date)
+            except Exception as e:
+                logger.warning(f"Indexing live summary of meeting {meeting_id} failed: {e}")
+
+    def _add_summary(self, summary):
+        levels = self._summary_levels
+        levels[0].append(summary)
+        level = 0
+        while len(levels[level]) >= SUMMARY_GROUP_WINDOWS:
+            condensed = summarize_transcript("\n".join(levels[level]))[0]
+            levels[level] = []
+            if level + 1 == len(levels):
+                levels.append([])
+            levels[level + 1].append(condensed)
+            level += 1
+
+    def finish(self):
+        """
+        Ends the audio stream, processes the last window and extracts the action items.
+        Returns the recap: transcript, summary, action items and how long finishing took.
+        """
+        started = time.perf_counter()
+        with self._send_lock:
+            if self.finished:
+                raise LiveError("Live session already finished", status=409)
+            self.finished = True
+            # Returns after the backend has delivered its last final results
+            try:
+                self.stream.close()
+            except Exception as e:
+                # Keep what was transcribed; the recap covers the audio up to the failure
+                logger.warning(f"Closing the live stream of meeting {self.meeting_id} failed: {e}")
+                self.errors.append(str(e))
+        with self._lock:
+            self._close_window()
+            transcript = self.builder.build()
+        self._windows.put(None)
+        self._worker.join()
+        # The whole transcript and timing replace the windows once, also repairing a window that failed
+        if transcript.text:
+            meeting_store.write(self.meeting_id, TRANSCRIPT, transcript.text)
+            save_transcript_timing(self.meeting_id, transcript)
+        remove_window_timing(self.meeting_id)
+
+        records = None
+        if transcript.text:
+            records = extract_action_item_records(self.summary, transcript.text, self.meeting_id)
+            try:
+                index_meeting_text(self.meeting_id, "action_items", format_action_items(records), date=self.date)
+            except Exception as e:
+                logger.warning(f"Indexing live action items of meeting {self.meeting_id} failed: {e}")
+        recap = {
+            "meeting_id": self.meeting_id,
+            "transcript": transcript.text,
+            "speakers": transcript.speakers,
+            "summary": self.summary,
+            "action_items": format_action_items(records) if records is not None else None,
+            "records": records,
+            "finish_seconds": round(time.perf_counter() - started, 3),
+        }
+        # The summary is in summary.txt; the metadata keeps the counters
+        status = self.status()
+        del status["summary"]
+        meeting_store.update(self.meeting_id, live=status)
+        return recap
+
+    def status(self):
+        with self._lock:
+            words = self.builder.words
+            audio_seconds = self.builder.end_ms / 1000
+        return {
+            "meeting_id": self.meeting_id,
+            "status": "finished" if self.finished else "live",
+            "received_bytes": self.received_bytes,
+            "next_offset": self.received_bytes,
+            "words": words,
+            "audio_seconds": audio_seconds,
+            "windows_processed": self.windows_processed,
+            "windows_pending": self.windows_closed - self.windows_processed,
+            "summary": self.summary,
+            "errors": self.errors,
+            "elapsed_seconds": round(time.time() - self.created_at, 1),
+        }
+
+
+class LiveSessions:
+    """Tracks the live meetings of this process, one session per meeting."""
+
+    def __init__(self, backend=LIVE_BACKEND, ttl=SESSION_TTL_SECONDS, window_seconds=WINDOW_SECONDS):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown live transcription backend {backend!r}; expected one of {sorted(BACKENDS)}")
+        self.backend_name = backend
+        self.backend = BACKENDS[backend]()
+        self.ttl = ttl
+        self.window_seconds = window_seconds
+        # Idle sessions are looked for this often, by a thread each process starts
+        self.sweep_interval = max(1.0, min(60.0, ttl / 4))
+        self._sessions = {}
+        # meeting_id -> Future of the recap, while a session is being finished
+        self._finishing = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._start_lock = threading.Lock()
+        self.finished_sessions = 0
+
+    def start(self):
+        """Starts the thread that finishes idle sessions; safe to call more than once."""
+        with self._start_lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="quickmeet-live-sweep", daemon=True)
+                self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self._expire_idle()
+            except Exception as e:
+                logger.warning(f"Looking for idle live sessions failed: {e}")
+
+    def create(self, sample_rate=16000, media_encoding="pcm", **metadata):
+        """Creates a meeting workspace and starts transcribing its audio; returns the session."""
+        self.start()
+        if media_encoding not in MEDIA_ENCODINGS:
+            raise LiveError(f"'media_encoding' must be one of {', '.join(MEDIA_ENCODINGS)}")
+        self.backend.prepare()
+        meeting_id = meeting_store.create(live={"status": "live"}, **metadata)
+        session = LiveSession(meeting_id, self.backend, sample_rate=sample_rate, media_encoding=media_encoding,
+                              window_seconds=self.window_seconds, date=meeting_store.meta(meeting_id).get("date"))
+        with self._lock:
+            self._sessions[meeting_id] = session
+        return session
+
+    def get(self, meeting_id):
+        with self._lock:
+            session = self._sessions.get(meeting_id)
+        if session is None:
+            raise LiveError("No live session for this meeting", status=404)
+        return session
+
+    def finish(self, meeting_id):
+        """
+        Finishes a session and returns its recap. A caller arriving while the session is
+        being finished (the client, or the sweeper for an idle session) gets the same recap.
+        """
+        with self._lock:
+            finishing = self._finishing.get(meeting_id)
+            if finishing is None:
+                session = self._sessions.get(meeting_id)
+                if session is None:
+                    raise LiveError("No live session for this meeting", status=404)
+                future = self._finishing[meeting_id] = Future()
+        if finishing is not None:
+            return finishing.result()
+
+        try:
+            recap = session.finish()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(recap)
+            return recap
+        finally:
+            with self._lock:
+                del self._finishing[meeting_id]
+                if self._sessions.pop(meeting_id, None) is not None:
+                    self.finished_sessions += 1
+
+    def _expire_idle(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [s.meeting_id for s in self._sessions.values()
+                       if s.last_activity < cutoff and s.meeting_id not in self._finishing]
+        for meeting_id in expired:
+            logger.info(f"Finishing idle live session of meeting {meeting_id}")
+            threading.Thread(target=self._finish_quietly, args=(meeting_id,), daemon=True).start()
+
+    def _finish_quietly(self, meeting_id):
+        try:
+            self.finish(meeting_id)
+        except Exception as e:
+            logger.warning(f"Finishing live session of meeting {meeting_id} failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            live = len(self._sessions)
+        return {"backend": self.backend_name, "live": live, "finished": self.finished_sessions}
+
+
+# Shared sessions for the whole process
+sessions = LiveSessions()
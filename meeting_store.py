@@ -0,0 +1,215 @@
+# quickmeet-backend/meeting_store.py
+import datetime
+import fcntl
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+MEETINGS_DIR = os.getenv("QUICKMEET_MEETINGS_DIR", "meetings")
+
+# Meeting ids are generated here; anything else is rejected before it reaches the filesystem
+MEETING_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+TRANSCRIPT = "transcript.txt"
+TRANSCRIPT_TIMING = "transcript_timing.npz"
+# Timing of each window of a live meeting, kept until the meeting ends and TRANSCRIPT_TIMING is written
+TRANSCRIPT_TIMING_WINDOW = "transcript_timing.{:06d}.npz"
+TRANSCRIPT_TIMING_WINDOWS = "transcript_timing.*.npz"
+SUMMARY = "summary.txt"
+ACTION_ITEMS = "action_items.json"
+ACTION_ITEMS_TEXT = "action_items.txt"
+PPT = "summary_action_items.pptx"
+PDF = "meeting_summary.pdf"
+VIDEO = "meeting_summary.mp4"
+META = "meta.json"
+
+
+class MeetingNotFound(Exception):
+    """Raised for malformed or unknown meeting ids."""
+
+
+class MeetingStore:
+    """
+    Directory-per-meeting workspace for transcripts, summaries and generated artifacts.
+
+    Layout in root:
+      <meeting_id>/meta.json          - filename, audio hash, date and artifact timestamps
+      <meeting_id>/transcript.txt
+      <meeting_id>/transcript_timing.npz - word timings and speakers (transcript_model.Transcript)
+      <meeting_id>/transcript_timing.NNNNNN.npz - timing of each window while a live meeting runs
+      <meeting_id>/summary.txt
+      <meeting_id>/action_items.json  - structured records (action_items.txt holds the text form)
+      <meeting_id>/*.pptx, *.pdf, *.mp4 - generated documents and videos
+      by_content/<sha256>             - id of the meeting created for a transcript or summary
+                                        sent without a meeting id (see for_content)
+
+    Every file is written to a temporary file and renamed into place, so readers in other
+    worker processes never see a partial artifact; only the transcript of a live meeting
+    grows by appends until the meeting ends. Metadata updates are serialised with a
+    per-meeting file lock.
+    """
+
+    def __init__(self, root=MEETINGS_DIR):
+        self.root = root
+
+    def create(self, **metadata):
+        """Creates an empty workspace and returns its meeting id."""
+        meeting_id = uuid.uuid4().hex
+        os.makedirs(self._dir(meeting_id))
+        now = time.time()
+        meta = {
+            "meeting_id": meeting_id,
+            "created_at": now,
+            "date": datetime.date.fromtimestamp(now).isoformat(),
+            "artifacts": {},
+            **metadata,
+        }
+        self._write(meeting_id, META, json.dumps(meta))
+        return meeting_id
+
+    def for_content(self, name, text):
+        """
+        Returns the meeting whose artifact name holds exactly text, creating it (with the
+        artifact) the first time, so a client sending the same transcript again reuses
+        one workspace instead of leaving a new one behind on every request.
+        """
+        digest = hashlib.sha256(f"{name}\x00{text}".encode("utf-8")).hexdigest()
+        index_dir = os.path.join(self.root, "by_content")
+        os.makedirs(index_dir, exist_ok=True)
+        entry = os.path.join(index_dir, digest)
+        with open(os.path.join(index_dir, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(entry, "r", encoding="utf-8") as f:
+                        meeting_id = f.read().strip()
+                    # The meeting may have been deleted, or the artifact replaced since
+                    if self.read(meeting_id, name) == text:
+                        return meeting_id
+                except (FileNotFoundError, MeetingNotFound):
+                    pass
+                meeting_id = self.create()
+                self.write(meeting_id, name, text)
+                fd, tmp_path = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(meeting_id)
+                os.replace(tmp_path, entry)
+                return meeting_id
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _dir(self, meeting_id):
+        if not isinstance(meeting_id, str) or not MEETING_ID_PATTERN.match(meeting_id):
+            raise MeetingNotFound(f"Invalid meeting id: {meeting_id!r}")
+        return os.path.join(self.root, meeting_id)
+
+    def exists(self, meeting_id):
+        try:
+            return os.path.isfile(os.path.join(self._dir(meeting_id), META))
+        except MeetingNotFound:
+            return False
+
+    def path(self, meeting_id, name):
+        """Path of an artifact in an existing meeting's workspace."""
+        if not self.exists(meeting_id):
+            raise MeetingNotFound(f"Unknown meeting: {meeting_id}")
+        return os.path.join(self._dir(meeting_id), name)
+
+    def _write(self, meeting_id, name, data):
+        directory = self._dir(meeting_id)
+        mode = "wb" if isinstance(data, bytes) else "w"
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @contextmanager
+    def _meta_lock(self, meeting_id):
+        with open(os.path.join(self._dir(meeting_id), ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def write(self, meeting_id, name, data, record=True):
+        """
+        Atomically writes a text or bytes artifact and records when it was produced
+        (unless record is False, for working files that are not artifacts).
+        """
+        self.path(meeting_id, name)
+        self._write(meeting_id, name, data)
+        if record:
+            self.add_artifact(meeting_id, name)
+
+    def append(self, meeting_id, name, text):
+        """Appends text to an artifact, e.g. each window of a live transcript, in one write."""
+        with open(self.path(meeting_id, name), "a", encoding="utf-8") as f:
+            f.write(text)
+        self.add_artifact(meeting_id, name)
+
+    def names(self, meeting_id, pattern):
+        """Sorted names of the files in a meeting's workspace matching a glob pattern."""
+        return sorted(fnmatch.filter(os.listdir(os.path.dirname(self.path(meeting_id, META))), pattern))
+
+    def remove(self, meeting_id, name):
+        """Deletes a file from the workspace, if it is there."""
+        try:
+            os.unlink(self.path(meeting_id, name))
+        except FileNotFoundError:
+            pass
+
+    def delete(self, meeting_id):
+        """Deletes a workspace and everything in it."""
+        shutil.rmtree(self._dir(meeting_id), ignore_errors=True)
+
+    def add_artifact(self, meeting_id, name):
+        """Records an artifact that was written into the workspace directly (e.g. a download)."""
+        with self._meta_lock(meeting_id):
+            meta = self.meta(meeting_id)
+            meta["artifacts"][name] = time.time()
+            self._write(meeting_id, META, json.dumps(meta))
+
+    def write_json(self, meeting_id, name, value):
+        self.write(meeting_id, name, json.dumps(value))
+
+    def read(self, meeting_id, name, default=None):
+        """Returns a text artifact, or default when it has not been produced yet."""
+        try:
+            with open(self.path(meeting_id, name), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return default
+
+    def read_json(self, meeting_id, name, default=None):
+        text = self.read(meeting_id, name)
+        return default if text is None else json.loads(text)
+
+    def meta(self, meeting_id):
+        with open(self.path(meeting_id, META), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def update(self, meeting_id, **fields):
+        """Merges fields into the meeting's metadata."""
+        self.path(meeting_id, META)
+        with self._meta_lock(meeting_id):
+            meta = self.meta(meeting_id)
+            meta.update(fields)
+            self._write(meeting_id, META, json.dumps(meta))
+        return meta
+
+
+# Shared store for the whole process
+store = MeetingStore()
@@ -0,0 +1,239 @@
+# quickmeet-backend/model_registry.py
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import stage_seconds
+
+logger = logging.getLogger(__name__)
+
+# Keep at most this many models warm at once (0 disables the count limit)
+MAX_MODELS = int(os.getenv("QUICKMEET_MAX_MODELS", "3"))
+# Evict least recently used models once their combined size exceeds this budget (0 disables it)
+MEMORY_BUDGET_MB = int(os.getenv("QUICKMEET_MODEL_MEMORY_MB", "0"))
+# Comma separated "kind:model_name" pairs to load when the app starts
+PRELOAD_MODELS = os.getenv("QUICKMEET_PRELOAD_MODELS", "")
+
+
+def _load_summarization(model_name):
+    from transformers import pipeline
+    return pipeline("summarization", model=model_name, tokenizer=model_name)
+
+
+def _estimate_size_bytes(model):
+    """
+    Estimates the resident size of a loaded model from its parameters and buffers.
+    Works for transformers pipelines (via .model) and plain torch modules.
+    """
+    module = getattr(model, "model", model)
+    size = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(module, attr, None)
+        if tensors is None:
+            continue
+        try:
+            for tensor in tensors():
+                size += tensor.numel() * tensor.element_size()
+        except Exception:
+            # Not a torch module; size stays an estimate of zero.
+            pass
+    return size
+
+
+class _Entry:
+    __slots__ = ("model", "load_seconds", "size_bytes", "loaded_at", "last_used", "hits")
+
+    def __init__(self, model, load_seconds, size_bytes):
+        self.model = model
+        self.load_seconds = load_seconds
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.hits = 0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models keyed by (kind, model_name).
+    Models stay warm between requests and are evicted in LRU order once
+    the count limit or the memory budget is exceeded.
+    """
+
+    def __init__(self, max_models=MAX_MODELS, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.max_models = max_models
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self._loaders = {"summarization": _load_summarization}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.loads = 0
+        self.evictions = 0
+        self._ready = threading.Event()
+        self.preload_error = None
+
+    def register_loader(self, kind, loader):
+        """Registers a callable that loads a model of the given kind from its name."""
+        self._loaders[kind] = loader
+
+    def get(self, kind, model_name):
+        """
+        Returns a warm model, loading it on first use.
+        Concurrent callers asking for the same model wait for a single load.
+        """
+        key = (kind, model_name)
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry.model
+
+            loader = self._loaders.get(kind)
+            if loader is None:
+                raise ValueError(f"No loader registered for model kind '{kind}'")
+
+            logger.info(f"Loading {kind} model {model_name}...")
+            start = time.perf_counter()
+            try:
+                model = loader(model_name)
+            except Exception as e:
+                raise Exception(f"Model {model_name} loading failed: {e}")
+            load_seconds = time.perf_counter() - start
+            stage_seconds.observe(load_seconds, stage="model_load")
+            entry = _Entry(model, load_seconds, _estimate_size_bytes(model))
+            logger.info(f"Loaded {model_name} in {load_seconds:.2f}s ({entry.size_bytes / 1e6:.1f} MB)")
+
+            with self._lock:
+                self._entries[key] = entry
+                self.loads += 1
+                self._evict_over_budget(keep=key)
+            return model
+
+    def _touch(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.last_used = time.time()
+            entry.hits += 1
+        return entry
+
+    def _evict_over_budget(self, keep):
+        def over_budget():
+            if self.max_models and len(self._entries) > self.max_models:
+                return True
+            if self.memory_budget_bytes:
+                total = sum(e.size_bytes for e in self._entries.values())
+                return total > self.memory_budget_bytes
+            return False
+
+        evicted = False
+        while over_budget():
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            del self._entries[oldest]
+            self.evictions += 1
+            evicted = True
+            logger.info(f"Evicted {oldest[0]} model {oldest[1]} from the registry")
+        if evicted:
+            gc.collect()
+
+    def evict(self, kind, model_name):
+        """Drops a model from the registry. Returns True if it was loaded."""
+        with self._lock:
+            removed = self._entries.pop((kind, model_name), None) is not None
+            if removed:
+                self.evictions += 1
+        if removed:
+            gc.collect()
+        return removed
+
+    def preload(self, specs=None):
+        """
+        Loads models ahead of the first request and marks the registry ready.
+        specs is an iterable of (kind, model_name) pairs; defaults to QUICKMEET_PRELOAD_MODELS.
+        """
+        if specs is None:
+            specs = parse_preload_spec(PRELOAD_MODELS)
+        try:
+            for kind, model_name in specs:
+                self.get(kind, model_name)
+        except Exception as e:
+            self.preload_error = str(e)
+            raise
+        self.preload_error = None
+        self._ready.set()
+
+    def preload_async(self, specs=None):
+        """Runs preload() on a background thread, so the server can answer health checks meanwhile."""
+        def run():
+            try:
+                self.preload(specs)
+            except Exception as e:
+                logger.error(f"Preloading models failed: {e}")
+
+        thread = threading.Thread(target=run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self):
+        """True once preload() has loaded every requested model."""
+        return self._ready.is_set()
+
+    def stats(self):
+        """Returns load time, resident size and usage per model, plus registry totals."""
+        with self._lock:
+            models = [
+                {
+                    "kind": kind,
+                    "model": model_name,
+                    "load_seconds": round(entry.load_seconds, 3),
+                    "size_mb": round(entry.size_bytes / (1024 * 1024), 1),
+                    "hits": entry.hits,
+                    "loaded_at": entry.loaded_at,
+                    "last_used": entry.last_used,
+                }
+                for (kind, model_name), entry in self._entries.items()
+            ]
+            total_bytes = sum(e.size_bytes for e in self._entries.values())
+        return {
+            "models": models,
+            "total_size_mb": round(total_bytes / (1024 * 1024), 1),
+            "max_models": self.max_models,
+            "memory_budget_mb": self.memory_budget_bytes // (1024 * 1024),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "ready": self.ready(),
+            "preload_error": self.preload_error,
+        }
+
+
+def parse_preload_spec(spec):
+    """Parses "kind:model,kind:model" into (kind, model) pairs. A bare model name means summarization."""
+    pairs = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kind, sep, model_name = item.partition(":")
+        if not sep or "/" in kind:
+            kind, model_name = "summarization", item
+        pairs.append((kind, model_name))
+    return pairs
+
+
+# Shared registry for the whole process
+registry = ModelRegistry()
+
+
+def get_model(kind, model_name):
+    """Shortcut for registry.get()."""
+    return registry.get(kind, model_name)
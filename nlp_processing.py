@@ -1,74 +1,162 @@
 # quickmeet-backend/nlp_processing.py
-import json
-import re
-from transformers import pipeline
+import queue
+import threading
+import time
+from model_registry import get_model
+from summarization_engine import summarize, SUMMARY_MODEL
+from summary_cache import cache as summary_cache, summary_key
+from meeting_store import store as meeting_store, SUMMARY, ACTION_ITEMS, ACTION_ITEMS_TEXT
+from transcript_model import load_for_meeting as load_transcript
+import action_items
 
-def generate_summary(transcript_text):
-    """
-    Generate a summary from the provided transcript text.
-    Returns the summary string.
-    """
+def _summary_params(transcript_text):
+    """Returns the summary cache key and the (min_length, max_length) used for a transcript."""
     word_count = len(transcript_text.split())
-    # Use a longer-context model if transcript is longer than 500 words
     if word_count > 500:
-        model_name = "google/long-t5-tglobal-base"
-        min_length, max_length = max(100, word_count // 4), min(500, word_count // 2)
+        # Final lengths are derived from the reduced chunk summaries
+        min_length = max_length = None
     else:
-        model_name = "philschmid/bart-large-cnn-samsum"
         min_length, max_length = max(50, word_count // 3), min(300, int(word_count // 1.5))
-    
-    print(f"Using Model: {model_name} for summary generation.")
-    try:
-        summarizer = pipeline("summarization", model=model_name, tokenizer=model_name)
-    except Exception as e:
-        raise Exception(f"Model {model_name} loading failed: {e}")
-    
+    return summary_key(transcript_text, SUMMARY_MODEL, min_length, max_length), min_length, max_length
+
+def cached_summary(transcript_text):
+    """Returns (summary, timings) when the transcript's summary is cached, else None."""
+    cached = summary_cache.get(_summary_params(transcript_text)[0])
+    if cached:
+        summary, timings = cached
+        return summary, {**timings, "cached": True}
+    return None
+
+def summarize_transcript(transcript_text, on_chunk=None, streamer=None):
+    """
+    Summarize a transcript and report per-stage timings.
+    Short transcripts are summarized in a single pass; long ones go through the
+    chunked map-reduce engine, so nothing is silently truncated at the model's input limit.
+    Returns (summary, timings).
+    """
+    # Identical transcripts with the same parameters are answered from the cache
+    key, min_length, max_length = _summary_params(transcript_text)
+    cached = summary_cache.get(key)
+    if cached:
+        summary, timings = cached
+        return summary, {**timings, "cached": True}
+
+    print(f"Using Model: {SUMMARY_MODEL} for summary generation.")
     try:
-        summary = summarizer(
-            transcript_text,
-            min_length=min_length,
-            max_length=max_length,
-            do_sample=False
-        )[0]["summary_text"]
+        summary, timings = summarize(transcript_text, min_length=min_length, max_length=max_length,
+                                     on_chunk=on_chunk, streamer=streamer)
     except Exception as e:
+        if "loading failed" in str(e):
+            raise
         raise Exception(f"Summarization process failed: {e}")
-    
-    with open("summary.txt", "w", encoding="utf-8") as file:
-        file.write(summary)
-    
-    return summary
 
-def extract_action_items(summary_text):
+    summary_cache.put(key, summary, timings)
+    return summary, timings
+
+def generate_summary(transcript_text, meeting_id=None, return_timings=False):
+    """
+    Generate a summary from the provided transcript text.
+    The summary is saved to the meeting's workspace when a meeting id is given.
+    Returns the summary string, or (summary, timings) when return_timings is set.
+    """
+    summary, timings = summarize_transcript(transcript_text)
+
+    if meeting_id:
+        meeting_store.write(meeting_id, SUMMARY, summary)
+
+    return (summary, timings) if return_timings else summary
+
+def stream_summary(transcript_text, meeting_id=None):
+    """
+    Summarize a transcript while yielding progress as (event, data) pairs:
+    "partial" for each chunk summary of a long transcript, "token" for text of the
+    final pass as it is generated, then "summary" with the result and timings.
+    Time to first partial output is reported in the summary timings as ttfb_ms.
+    The summary is saved to the meeting's workspace when a meeting id is given.
+    A cached summary is yielded at once, without loading the model or its tokenizer.
+    """
+    start = time.perf_counter()
+    cached = cached_summary(transcript_text)
+    if cached:
+        summary, timings = cached
+        if meeting_id:
+            meeting_store.write(meeting_id, SUMMARY, summary)
+        ttfb_ms = round((time.perf_counter() - start) * 1000, 1)
+        yield "summary", {"summary": summary, "timings": {**timings, "ttfb_ms": ttfb_ms}}
+        return
+
+    from transformers import TextStreamer
+
+    events = queue.Queue()
+    done = object()
+
+    class QueueStreamer(TextStreamer):
+        def on_finalized_text(self, text, stream_end=False):
+            if text:
+                events.put(("token", {"text": text}))
+
+    def on_chunk(index, total, summary):
+        events.put(("partial", {"index": index, "total": total, "text": summary}))
+
+    def run():
+        try:
+            tokenizer = get_model("summarization", SUMMARY_MODEL).tokenizer
+            streamer = QueueStreamer(tokenizer, skip_special_tokens=True)
+            summary, timings = summarize_transcript(transcript_text, on_chunk=on_chunk, streamer=streamer)
+            if meeting_id:
+                meeting_store.write(meeting_id, SUMMARY, summary)
+            events.put(("summary", {"summary": summary, "timings": timings}))
+        except Exception as e:
+            events.put(("error", {"message": f"Summary generation failed: {e}"}))
+        finally:
+            events.put(done)
+
+    threading.Thread(target=run, name="summary-stream", daemon=True).start()
+
+    first_output_ms = None
+    while True:
+        item = events.get()
+        if item is done:
+            return
+        event, data = item
+        if first_output_ms is None and event in ("partial", "token", "summary"):
+            first_output_ms = round((time.perf_counter() - start) * 1000, 1)
+        if event == "summary":
+            data["timings"] = {**data["timings"], "ttfb_ms": first_output_ms}
+        yield event, data
+
+def extract_action_item_records(summary_text=None, transcript_text=None, meeting_id=None):
+    """
+    Extracts structured action items (owner, task, deadline, source span) from the
+    summary and/or the full transcript. Items from a timed transcript also get
+    audio_start, audio_end and speaker. When a meeting id is given they are saved to its
+    workspace as action_items.json and action_items.txt.
+    Returns the list of records.
+    """
+    record_lists = []
+    if summary_text:
+        record_lists.append(action_items.extract(summary_text, source="summary"))
+    if transcript_text:
+        transcript_records = action_items.extract(transcript_text, source="transcript")
+        if meeting_id:
+            # Link items found in the transcript to where they were said
+            transcript = load_transcript(meeting_id, transcript_text)
+            if transcript.timed:
+                for record in transcript_records:
+                    record.update(transcript.locate(record["start"], record["end"]) or {})
+        record_lists.append(transcript_records)
+    records = action_items.merge(*record_lists)
+
+    if meeting_id:
+        meeting_store.write_json(meeting_id, ACTION_ITEMS, records)
+        meeting_store.write(meeting_id, ACTION_ITEMS_TEXT, action_items.format_action_items(records))
+
+    return records
+
+def extract_action_items(summary_text, meeting_id=None):
     """
     Extracts action items from the summary text using regex.
     Returns a string containing the action items.
     """
-    action_items = []
-    task_patterns = [
-        r"(\b[A-Z][a-z]+)\s+will\s+(.*?)(?:\.\s|$)",
-        r"(\b[A-Z][a-z]+)\s+is\s+responsible\s+for\s+(.*?)(?:\.\s|$)",
-        r"Deadline:\s*(\w+\s+\d{1,2})"
-    ]
-    
-    names = set()
-    for pattern in task_patterns:
-        matches = re.findall(pattern, summary_text)
-        for match in matches:
-            if isinstance(match, tuple):
-                name, task = match
-                names.add(name)
-                action_items.append(f"- {name}: {task.strip()}")
-            else:
-                action_items.append(f"- {match.strip()}")
-    
-    name_list = list(names)
-    for i, item in enumerate(action_items):
-        if item.startswith("- He") or item.startswith("- She"):
-            previous_name = next((name for name in reversed(name_list) if name in action_items[i - 1]), "Unknown")
-            action_items[i] = item.replace("He: ", f"{previous_name}: ").replace("She: ", f"{previous_name}: ")
-    
-    result = "\n".join(action_items) if action_items else "No specific action items found."
-    with open("action_items.txt", "w", encoding="utf-8") as file:
-        file.write(result)
-    
-    return result
\ No newline at end of file
+    records = extract_action_item_records(summary_text, meeting_id=meeting_id)
+    return action_items.format_action_items(records)
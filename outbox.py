@@ -0,0 +1,258 @@
+# quickmeet-backend/outbox.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import closing
+
+from email_sender import send_bulk_email, SES_RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DB_PATH = os.getenv("QUICKMEET_OUTBOX_DB", "outbox.db")
+OUTBOX_WORKERS = int(os.getenv("QUICKMEET_OUTBOX_WORKERS", "1"))
+# Delivery attempts before a message is moved to the dead letter state
+MAX_ATTEMPTS = int(os.getenv("QUICKMEET_OUTBOX_MAX_ATTEMPTS", "5"))
+# Delay before the first retry; doubled after every failed attempt up to RETRY_MAX_SECONDS
+RETRY_BASE_SECONDS = float(os.getenv("QUICKMEET_OUTBOX_RETRY_SECONDS", "30"))
+RETRY_MAX_SECONDS = 3600
+# A message in "sending" whose worker reported no progress for this long, plus the time its
+# remaining recipients take at the SES send rate, is picked up again (its worker died)
+SENDING_TIMEOUT_SECONDS = 600
+
+QUEUED, SENDING, SENT, RETRYING, DEAD = "queued", "sending", "sent", "retrying", "dead"
+
+
+class Outbox:
+    """
+    Persistent email outbox: messages are stored in SQLite and delivered by background
+    worker threads in any process sharing the database file.
+    Recipients are removed from a message as each batch is delivered, so a retry, or a
+    worker picking up a message whose worker died, only sends to the rest. After max_attempts the message is dead-lettered and kept
+    for inspection until it is requeued.
+    """
+
+    def __init__(self, db_path=OUTBOX_DB_PATH, workers=OUTBOX_WORKERS, max_attempts=MAX_ATTEMPTS,
+                 retry_base_seconds=RETRY_BASE_SECONDS, poll_interval=1.0, send=send_bulk_email):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval = poll_interval
+        self._send = send
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._start_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS outbox (
+                    id TEXT PRIMARY KEY,
+                    to_addresses TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    summary TEXT,
+                    action_items TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    sent_count INTEGER NOT NULL DEFAULT 0,
+                    message_ids TEXT NOT NULL DEFAULT '[]',
+                    last_error TEXT,
+                    next_attempt_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    sent_at REAL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+            self._initialized = True
+        return conn
+
+    def start(self):
+        """Starts the delivery threads; safe to call more than once."""
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"quickmeet-outbox-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, to_addresses, subject, summary_text, action_items):
+        """Stores a message for delivery and returns its outbox id."""
+        self.start()
+        message_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """INSERT INTO outbox (id, to_addresses, subject, summary, action_items, status,
+                                       next_attempt_at, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (message_id, json.dumps(to_addresses), subject, summary_text, json.dumps(action_items),
+                 QUEUED, now, now, now),
+            )
+        self._wakeup.set()
+        return message_id
+
+    @staticmethod
+    def _lease_until(now, recipients):
+        # While a message is "sending", next_attempt_at is the time its worker is presumed dead
+        return now + SENDING_TIMEOUT_SECONDS + (len(recipients) / SES_RATE_LIMIT if SES_RATE_LIMIT else 0)
+
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            """SELECT * FROM outbox WHERE status IN (?, ?, ?) AND next_attempt_at <= ?
+               ORDER BY next_attempt_at LIMIT 1""",
+            (QUEUED, RETRYING, SENDING, now),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE outbox SET status = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+            (SENDING, self._lease_until(now, json.loads(row["to_addresses"])), now, row["id"]),
+        )
+        conn.execute("COMMIT")
+        return row
+
+    def _record_batch(self, conn, message_id, remaining, batch, ses_message_id):
+        """Removes a delivered batch from the message and extends the worker's lease."""
+        delivered = set(batch)
+        remaining[:] = [address for address in remaining if address not in delivered]
+        now = time.time()
+        try:
+            conn.execute(
+                """UPDATE outbox SET to_addresses = ?, sent_count = sent_count + ?,
+                                     message_ids = json_insert(message_ids, '$[#]', ?),
+                                     next_attempt_at = ?, updated_at = ?
+                   WHERE id = ? AND status = ?""",
+                (json.dumps(remaining), len(batch), ses_message_id, self._lease_until(now, remaining), now,
+                 message_id, SENDING),
+            )
+        except sqlite3.Error as e:
+            # Only costs a duplicate of this batch if the message is picked up again
+            logger.warning(f"Could not record a delivered batch of outbox message {message_id}: {e}")
+
+    def _deliver(self, conn, row):
+        recipients = json.loads(row["to_addresses"])
+        remaining = list(recipients)
+        attempts = row["attempts"] + 1
+        try:
+            result = self._send(
+                recipients, row["subject"], row["summary"], json.loads(row["action_items"]),
+                on_batch_sent=lambda batch, ses_message_id: self._record_batch(
+                    conn, row["id"], remaining, batch, ses_message_id),
+            )
+            failed = [address for batch in result["failed"] for address in batch["recipients"]]
+            error = result["failed"][0]["error"] if failed else None
+        except Exception as e:
+            logger.error(f"Outbox message {row['id']} failed: {e}\n{traceback.format_exc()}")
+            failed, error = remaining, str(e)
+
+        now = time.time()
+        if not failed:
+            status, next_attempt_at = SENT, now
+        elif attempts >= self.max_attempts:
+            status, next_attempt_at = DEAD, now
+            logger.error(f"Outbox message {row['id']} dead-lettered after {attempts} attempts: {error}")
+        else:
+            status = RETRYING
+            next_attempt_at = now + min(RETRY_MAX_SECONDS, self.retry_base_seconds * 2 ** (attempts - 1))
+        conn.execute(
+            """UPDATE outbox SET status = ?, attempts = ?, to_addresses = ?, last_error = ?, next_attempt_at = ?,
+                                 updated_at = ?, sent_at = CASE WHEN ? THEN ? ELSE sent_at END
+               WHERE id = ?""",
+            (status, attempts, json.dumps(failed or recipients), error, next_attempt_at, now, status == SENT, now,
+             row["id"]),
+        )
+
+    def _worker_loop(self):
+        # Every queued message waits on these threads, so no error may end one
+        conn = None
+        while True:
+            try:
+                if conn is None:
+                    conn = self._connect()
+                row = self._claim(conn)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not claim an outbox message: {e}")
+                conn = self._close(conn)
+                row = None
+            except Exception as e:
+                logger.error(f"Outbox worker failed to claim a message: {e}\n{traceback.format_exc()}")
+                conn = self._close(conn)
+                row = None
+            if row is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            try:
+                self._deliver(conn, row)
+            except Exception as e:
+                # The message stays in "sending" and is picked up again when its lease runs out
+                logger.error(f"Could not record delivery of outbox message {row['id']}: {e}")
+                conn = self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        # A broken connection is replaced on the next loop; closing also rolls back an open transaction
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        return None
+
+    def get(self, message_id):
+        """Returns the delivery state of a message, or None if the id is unknown."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM outbox WHERE id = ?", (message_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "sent_count": row["sent_count"],
+            # Recipients still to be delivered (all of them until the first attempt)
+            "pending_recipients": [] if row["status"] == SENT else json.loads(row["to_addresses"]),
+            "message_ids": json.loads(row["message_ids"]),
+            "last_error": row["last_error"],
+            "next_attempt_at": row["next_attempt_at"] if row["status"] in (QUEUED, RETRYING) else None,
+            "created_at": row["created_at"],
+            "sent_at": row["sent_at"],
+        }
+
+    def requeue(self, message_id):
+        """Moves a dead-lettered message back to the queue. Returns False if it is not dead."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, now, now, message_id, DEAD),
+            )
+        if cursor.rowcount:
+            self.start()
+            self._wakeup.set()
+        return bool(cursor.rowcount)
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, SENDING, RETRYING, SENT, DEAD)}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+# Shared outbox for the whole process
+outbox = Outbox()
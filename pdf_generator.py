@@ -1,32 +1,47 @@
-import pdfkit
-import platform
+# quickmeet-backend/pdf_generator.py
+import hashlib
+import json
 import os
+import platform
+import shutil
+from action_items import action_item_lines
+from meeting_store import store as meeting_store, SUMMARY, ACTION_ITEMS
+from artifact_cache import ArtifactCache
+from metrics import timed
 
-# === Detect platform and set wkhtmltopdf path manually if needed ===
+# "fpdf" renders in-process with fpdf2; "wkhtmltopdf" renders the HTML template through pdfkit
+PDF_ENGINE = os.getenv("QUICKMEET_PDF_ENGINE", "fpdf")
+# Optional TTF font for the fpdf engine; without one, text outside Latin-1 is replaced
+PDF_FONT = os.getenv("QUICKMEET_PDF_FONT")
+PDF_CACHE_DIR = os.getenv("QUICKMEET_PDF_CACHE_DIR", os.path.join("cache", "pdfs"))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("QUICKMEET_PDF_CACHE_MAX_ENTRIES", "1000"))
 
-# Example default paths for common platforms
-if platform.system() == "Windows":
-    # Make sure wkhtmltopdf is installed at this path or update accordingly
-    path_to_wkhtmltopdf = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
-elif platform.system() == "Darwin":  # macOS
-    path_to_wkhtmltopdf = "/usr/local/bin/wkhtmltopdf"
-else:  # Linux
-    path_to_wkhtmltopdf = "/usr/bin/wkhtmltopdf"
+# Default install locations, used when WKHTMLTOPDF_PATH is unset and the binary is not on PATH
+DEFAULT_WKHTMLTOPDF_PATHS = {
+    "Windows": r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe",
+    "Darwin": "/usr/local/bin/wkhtmltopdf",
+}
 
-# Create config object
-config = pdfkit.configuration(wkhtmltopdf=path_to_wkhtmltopdf)
+_pdfkit_config = None
 
-def generate_pdf_from_files(summary_path='summary.txt', action_items_path='action_items.txt'):
-    # Read from text files
-    with open(summary_path, 'r', encoding='utf-8') as f:
-        meeting_summary = f"<p>{f.read().replace('\n', '<br>')}</p>"
 
-    with open(action_items_path, 'r', encoding='utf-8') as f:
-        action_items = f.read().splitlines()
-        action_items_html = "<ul>" + ''.join(f"<li>{item}</li>" for item in action_items) + "</ul>"
+def _wkhtmltopdf_config():
+    """Builds the pdfkit configuration on first use instead of at import."""
+    global _pdfkit_config
+    if _pdfkit_config is None:
+        import pdfkit
+        path = (os.getenv("WKHTMLTOPDF_PATH") or shutil.which("wkhtmltopdf")
+                or DEFAULT_WKHTMLTOPDF_PATHS.get(platform.system(), "/usr/bin/wkhtmltopdf"))
+        _pdfkit_config = pdfkit.configuration(wkhtmltopdf=path)
+    return _pdfkit_config
+
+
+def _render_html(summary_text, action_items):
+    meeting_summary = f"<p>{summary_text.replace(chr(10), '<br>')}</p>"
+    action_items_html = "<ul>" + ''.join(f"<li>{item}</li>" for item in action_items) + "</ul>"
 
     # HTML template
-    html_content = f"""
+    return f"""
     <!DOCTYPE html>
     <html>
       <head>
@@ -61,6 +76,120 @@ def generate_pdf_from_files(summary_path='summary.txt', action_items_path='actio
     </html>
     """
 
-    # Generate PDF as bytes with configured path
-    pdf_data = pdfkit.from_string(html_content, False, configuration=config)
+
+def render_wkhtmltopdf(summary_text, action_items):
+    """Renders through the wkhtmltopdf binary (one process spawn per document)."""
+    import pdfkit
+    return pdfkit.from_string(_render_html(summary_text, action_items), False, configuration=_wkhtmltopdf_config())
+
+
+def render_fpdf(summary_text, action_items):
+    """Renders in-process with fpdf2, mirroring the layout of the HTML template."""
+    from fpdf import FPDF
+
+    pdf = FPDF(format="A4")
+    pdf.set_margins(20, 20, 20)
+    pdf.set_auto_page_break(True, margin=20)
+    pdf.add_page()
+    if PDF_FONT:
+        pdf.add_font("Body", "", PDF_FONT)
+        pdf.add_font("Body", "B", PDF_FONT)
+        family = "Body"
+
+        def clean(text):
+            return text
+    else:
+        family = "Helvetica"
+
+        def clean(text):
+            # The core fonts only cover Latin-1
+            return text.encode("latin-1", "replace").decode("latin-1")
+
+    pdf.set_text_color(51, 51, 51)
+    pdf.set_font(family, "B", 22)
+    pdf.cell(0, 12, "Meeting Summary", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font(family, "", 11)
+    pdf.multi_cell(0, 6, clean(summary_text), new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(10)
+
+    pdf.set_text_color(51, 51, 51)
+    pdf.set_font(family, "B", 17)
+    pdf.cell(0, 10, "Action Items", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font(family, "", 11)
+    text_width = pdf.epw - 10
+    for item in action_items:
+        text = clean(item[2:] if item.startswith("- ") else item)
+        pdf.set_x(pdf.l_margin + 5)
+        pdf.cell(5, 6, "-")
+        # multi_cell's line breaking is the slow part; most items fit on one line
+        if pdf.get_string_width(text) <= text_width - 2 * pdf.c_margin:
+            pdf.cell(0, 6, text, new_x="LMARGIN", new_y="NEXT")
+        else:
+            pdf.multi_cell(0, 6, text, new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+    return bytes(pdf.output())
+
+
+ENGINES = {
+    "fpdf": render_fpdf,
+    "wkhtmltopdf": render_wkhtmltopdf,
+}
+
+
+# Shared cache for the whole process
+cache = ArtifactCache(PDF_CACHE_DIR, ".pdf", max_entries=PDF_CACHE_MAX_ENTRIES)
+
+
+def pdf_key(summary_text, action_items, engine):
+    """Content hash of a rendered document: engine, font, summary and action item lines."""
+    payload = json.dumps([engine, PDF_FONT if engine == "fpdf" else None, summary_text, action_items])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_pdf(summary_text, action_items, engine=None, use_cache=True):
+    """
+    Renders the summary and action items (records or text) to PDF bytes with the
+    given engine (QUICKMEET_PDF_ENGINE by default), reusing a cached rendering of
+    identical content.
+    """
+    engine = engine or PDF_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+    lines = action_item_lines(action_items)
+    key = pdf_key(summary_text, lines, engine)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    with timed("pdf_render"):
+        pdf_data = ENGINES[engine](summary_text, lines)
+    if use_cache:
+        cache.put(key, pdf_data)
     return pdf_data
+
+
+def _read_action_items(action_items_path):
+    """Reads structured action items from JSON, falling back to the legacy text file."""
+    if action_items_path.endswith('.json') and not os.path.exists(action_items_path):
+        action_items_path = os.path.splitext(action_items_path)[0] + '.txt'
+    with open(action_items_path, 'r', encoding='utf-8') as f:
+        if action_items_path.endswith('.json'):
+            return json.load(f)
+        return f.read()
+
+
+def generate_meeting_pdf(meeting_id, engine=None):
+    """Renders the PDF for a meeting from the summary and action items in its workspace."""
+    return generate_pdf_from_files(
+        meeting_store.path(meeting_id, SUMMARY),
+        meeting_store.path(meeting_id, ACTION_ITEMS),
+        engine=engine,
+    )
+
+
+def generate_pdf_from_files(summary_path, action_items_path, engine=None):
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        summary_text = f.read()
+    return render_pdf(summary_text, _read_action_items(action_items_path), engine=engine)
@@ -0,0 +1,202 @@
+# quickmeet-backend/pipeline.py
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from nlp_processing import generate_summary, extract_action_item_records
+from action_items import format_action_items
+from ppt_generator import create_ppt
+from pdf_generator import generate_meeting_pdf
+from semantic_search import index_meeting_text
+from outbox import outbox
+from meeting_store import store as meeting_store, TRANSCRIPT, PPT, PDF
+
+logger = logging.getLogger(__name__)
+
+# Threads running pipeline stages, shared by every pipeline in the process
+PIPELINE_WORKERS = int(os.getenv("QUICKMEET_PIPELINE_WORKERS", "4"))
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+    return _executor
+
+
+class Stage:
+    """One pipeline step: func(results) receives the results of earlier stages by name."""
+
+    def __init__(self, name, func, requires=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+
+class Pipeline:
+    """
+    Runs stages as a DAG: every stage starts as soon as the stages it requires have
+    finished, so independent stages run concurrently on a thread pool. A failed stage
+    skips the stages that depend on it; the others still run.
+    """
+
+    def __init__(self, stages, executor=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.executor = executor
+        for stage in stages:
+            for name in stage.requires:
+                if name not in self.stages:
+                    raise ValueError(f"Stage {stage.name} requires unknown stage {name}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        done, visiting = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through stage {name}")
+            visiting.add(name)
+            for required in self.stages[name].requires:
+                visit(required)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def run(self, inputs=None):
+        """
+        Runs every stage and returns (results, report). report maps each stage to
+        {"status": "completed" | "failed" | "skipped", "seconds", "started_at", "error"},
+        where started_at is the offset from the start of the run.
+        """
+        executor = self.executor or _get_executor()
+        results = dict(inputs or {})
+        report = {}
+        pending = dict(self.stages)
+        running = {}
+        start = time.perf_counter()
+
+        def execute(stage):
+            stage_start = time.perf_counter()
+            try:
+                return stage.func(results), stage_start, time.perf_counter()
+            except Exception as e:
+                e.stage_timing = (stage_start, time.perf_counter())
+                raise
+
+        while pending or running:
+            for name, stage in list(pending.items()):
+                statuses = [report.get(required, {}).get("status") for required in stage.requires]
+                if any(status in ("failed", "skipped") for status in statuses):
+                    report[name] = {"status": "skipped", "seconds": 0.0, "started_at": None,
+                                    "error": "A required stage did not complete"}
+                    del pending[name]
+                elif all(status == "completed" for status in statuses):
+                    running[executor.submit(execute, stage)] = name
+                    del pending[name]
+
+            if not running:
+                # Everything left was just skipped
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    value, stage_start, stage_end = future.result()
+                    results[name] = value
+                    report[name] = {"status": "completed", "error": None}
+                except Exception as e:
+                    stage_start, stage_end = getattr(e, "stage_timing", (start, time.perf_counter()))
+                    logger.warning(f"Pipeline stage {name} failed: {e}")
+                    report[name] = {"status": "failed", "error": str(e)}
+                report[name].update(
+                    seconds=round(stage_end - stage_start, 3),
+                    started_at=round(stage_start - start, 3),
+                )
+
+        report = {name: report[name] for name in self.stages}
+        return results, report
+
+
+def meeting_pipeline(meeting_id, to_addresses=None, subject="Meeting Summary & Action Items"):
+    """
+    Stages that turn a meeting's transcript into every artifact:
+    summary -> action items -> PPT and PDF, with search indexing alongside, plus an
+    email queued in the outbox when recipients are given.
+    """
+    transcript = meeting_store.read(meeting_id, TRANSCRIPT)
+    if not transcript:
+        raise FileNotFoundError(f"No transcript for meeting {meeting_id}")
+    date = meeting_store.meta(meeting_id).get("date")
+
+    def summary(results):
+        text, timings = generate_summary(transcript, meeting_id, return_timings=True)
+        return {"summary": text, "timings": timings}
+
+    def action_items(results):
+        return extract_action_item_records(results["summary"]["summary"], transcript, meeting_id)
+
+    def ppt(results):
+        ppt_io = create_ppt(results["summary"]["summary"], results["action_items"])
+        meeting_store.write(meeting_id, PPT, ppt_io.getvalue())
+        return PPT
+
+    def pdf(results):
+        meeting_store.write(meeting_id, PDF, generate_meeting_pdf(meeting_id))
+        return PDF
+
+    def index_transcript(results):
+        return index_meeting_text(meeting_id, "transcript", transcript, date=date)
+
+    def index_summary(results):
+        return index_meeting_text(meeting_id, "summary", results["summary"]["summary"], date=date)
+
+    def index_action_items(results):
+        return index_meeting_text(meeting_id, "action_items", format_action_items(results["action_items"]), date=date)
+
+    stages = [
+        Stage("summary", summary),
+        Stage("action_items", action_items, requires=["summary"]),
+        Stage("ppt", ppt, requires=["summary", "action_items"]),
+        Stage("pdf", pdf, requires=["summary", "action_items"]),
+        Stage("index_transcript", index_transcript),
+        Stage("index_summary", index_summary, requires=["summary"]),
+        Stage("index_action_items", index_action_items, requires=["action_items"]),
+    ]
+    if to_addresses:
+        def email(results):
+            # Queued for the outbox worker, so SES latency does not hold up the pipeline
+            return outbox.enqueue(to_addresses, subject, results["summary"]["summary"], results["action_items"])
+        stages.append(Stage("email", email, requires=["summary", "action_items"]))
+    return Pipeline(stages)
+
+
+def process_meeting(meeting_id, to_addresses=None, subject="Meeting Summary & Action Items"):
+    """
+    Produces every artifact of a meeting in one run.
+    Returns {"meeting_id", "summary", "action_items", "records", "artifacts", "outbox_id", "stages",
+    "total_seconds"}.
+    """
+    start = time.perf_counter()
+    results, report = meeting_pipeline(meeting_id, to_addresses, subject).run()
+    summary = results.get("summary") or {}
+    records = results.get("action_items")
+    if "summary" in report and summary:
+        report["summary"]["timings"] = summary["timings"]
+    return {
+        "meeting_id": meeting_id,
+        "summary": summary.get("summary"),
+        "action_items": format_action_items(records) if records is not None else None,
+        "records": records,
+        "artifacts": [results[name] for name in ("ppt", "pdf") if name in results],
+        "outbox_id": results.get("email"),
+        "stages": report,
+        "total_seconds": round(time.perf_counter() - start, 3),
+    }
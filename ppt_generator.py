@@ -1,55 +1,204 @@
 # quickmeet-backend/ppt_generator.py
 
+import hashlib
 import io
-from pptx import Presentation
-from pptx.util import Pt
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from action_items import action_item_lines
+from artifact_cache import ArtifactCache
+from metrics import stage_seconds
 
-def create_ppt(summary_text, action_items_text):
+# Optional .pptx whose first two layouts are "Title Slide" and "Title and Content"
+PPT_TEMPLATE = os.getenv("QUICKMEET_PPT_TEMPLATE")
+# Processes rendering decks in batch mode
+PPT_WORKERS = int(os.getenv("QUICKMEET_PPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PPT_CACHE_DIR = os.getenv("QUICKMEET_PPT_CACHE_DIR", os.path.join("cache", "ppts"))
+PPT_CACHE_MAX_ENTRIES = int(os.getenv("QUICKMEET_PPT_CACHE_MAX_ENTRIES", "1000"))
+
+# How much text fits on one 14pt content slide
+SUMMARY_CHARS_PER_SLIDE = 900
+ACTION_ITEMS_PER_SLIDE = 10
+ACTION_CHARS_PER_SLIDE = 900
+FONT_SIZE_PT = 14
+
+_template = None
+_template_hash = None
+_template_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+# Shared cache for the whole process
+cache = ArtifactCache(PPT_CACHE_DIR, ".pptx", max_entries=PPT_CACHE_MAX_ENTRIES)
+
+
+def _template_bytes():
+    """Reads the base template once per process; every deck is opened from these bytes."""
+    global _template, _template_hash
+    with _template_lock:
+        if _template is None:
+            if PPT_TEMPLATE:
+                with open(PPT_TEMPLATE, "rb") as f:
+                    _template = f.read()
+            else:
+                from pptx import Presentation
+                buffer = io.BytesIO()
+                Presentation().save(buffer)
+                _template = buffer.getvalue()
+            _template_hash = hashlib.sha256(_template).hexdigest()
+        return _template
+
+
+def paginate(lines, max_chars, max_lines=None):
+    """Groups lines into pages of at most max_chars characters (and max_lines lines)."""
+    pages, current, size = [], [], 0
+    for line in lines:
+        if current and (size + len(line) > max_chars or (max_lines and len(current) >= max_lines)):
+            pages.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line)
+    if current:
+        pages.append(current)
+    return pages
+
+
+def _summary_pages(summary_text):
+    # Break between sentences so no sentence is split across slides
+    sentences = [s.strip() for s in re.split(r"(?<=[.?!])\s+", summary_text) if s.strip()]
+    return [" ".join(page) for page in paginate(sentences, SUMMARY_CHARS_PER_SLIDE)]
+
+
+def _add_content_slide(prs, title, paragraphs):
+    from pptx.util import Pt
+    slide = prs.slides.add_slide(prs.slide_layouts[1])  # Title and Content layout
+    slide.shapes.title.text = title
+    text_frame = slide.shapes.placeholders[1].text_frame
+    for i, text in enumerate(paragraphs):
+        paragraph = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        paragraph.text = text
+        paragraph.font.size = Pt(FONT_SIZE_PT)
+    return slide
+
+
+def _titled(title, index, total):
+    return title if total == 1 else f"{title} ({index} of {total})"
+
+
+def render_ppt_bytes(summary_text, action_lines):
+    """Builds a deck from the cached template and returns the .pptx bytes."""
+    # python-pptx is imported on the first render rather than with the app
+    from pptx import Presentation
+    prs = Presentation(io.BytesIO(_template_bytes()))
+
+    # 1) Title Slide
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Meeting Summary & Action Items"
+    title_slide.placeholders[1].text = "Generated by QuickMeet"
+
+    # 2) Summary slides, paginated on sentence boundaries
+    summary_pages = _summary_pages(summary_text) or ["No summary available."]
+    for i, page in enumerate(summary_pages, 1):
+        _add_content_slide(prs, _titled("Summary", i, len(summary_pages)), [page])
+
+    # 3) Action item slides, one bullet per item
+    action_pages = paginate(action_lines, ACTION_CHARS_PER_SLIDE, ACTION_ITEMS_PER_SLIDE) or [["No action items found."]]
+    for i, page in enumerate(action_pages, 1):
+        _add_content_slide(prs, _titled("Action Items", i, len(action_pages)), page)
+
+    ppt_io = io.BytesIO()
+    prs.save(ppt_io)
+    return ppt_io.getvalue()
+
+
+def _render_timed(summary_text, action_lines):
+    # Timed in the worker and recorded by the caller, since pool processes have their own metrics
+    start = time.perf_counter()
+    data = render_ppt_bytes(summary_text, action_lines)
+    return data, time.perf_counter() - start
+
+
+def _record_render(data, seconds):
+    stage_seconds.observe(seconds, stage="ppt_render")
+    return data
+
+
+def ppt_key(summary_text, action_lines):
+    """Content hash of a deck: template, summary and action item lines."""
+    _template_bytes()
+    payload = json.dumps([_template_hash, summary_text, action_lines])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_ppt(summary_text, action_items, use_cache=True):
+    """Returns the .pptx bytes for a summary and action items (records or text), cached by content."""
+    summary_text = summary_text or ""
+    action_lines = action_item_lines(action_items)
+    key = ppt_key(summary_text, action_lines)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    data = _record_render(*_render_timed(summary_text, action_lines))
+    if use_cache:
+        cache.put(key, data)
+    return data
+
+
+def create_ppt(summary_text, action_items):
     """
     Generate a PowerPoint presentation containing the summary and action items.
+    action_items may be structured records or the newline-separated text.
     Returns a BytesIO object with the PPT file.
     """
-    # Create a new PowerPoint presentation
-    prs = Presentation()
+    return io.BytesIO(render_ppt(summary_text, action_items))
 
-    # 1) Title Slide (optional)
-    title_layout = prs.slide_layouts[0]  # Title Slide layout
-    title_slide = prs.slides.add_slide(title_layout)
-    title_slide.shapes.title.text = "Meeting Summary & Action Items"
-    subtitle_placeholder = title_slide.placeholders[1]
-    subtitle_placeholder.text = "Generated by QuickMeet"
-
-    # 2) Summary Slide
-    summary_layout = prs.slide_layouts[1]  # Title and Content layout
-    summary_slide = prs.slides.add_slide(summary_layout)
-    summary_slide.shapes.title.text = "Summary"
-
-    summary_placeholder = summary_slide.shapes.placeholders[1]
-    summary_placeholder.text = summary_text if summary_text else "No summary available."
-
-    # Increase font size for summary
-    for shape in summary_slide.shapes:
-        if hasattr(shape, "text_frame") and shape.text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                paragraph.font.size = Pt(14)
-
-    # 3) Action Items Slide
-    action_layout = prs.slide_layouts[1]
-    action_slide = prs.slides.add_slide(action_layout)
-    action_slide.shapes.title.text = "Action Items"
-
-    action_placeholder = action_slide.shapes.placeholders[1]
-    action_placeholder.text = action_items_text if action_items_text else "No action items found."
-
-    # Increase font size for action items
-    for shape in action_slide.shapes:
-        if hasattr(shape, "text_frame") and shape.text_frame:
-            for paragraph in shape.text_frame.paragraphs:
-                paragraph.font.size = Pt(14)
-
-    # Save the presentation to an in-memory BytesIO object
-    ppt_io = io.BytesIO()
-    prs.save(ppt_io)
-    ppt_io.seek(0)
-    
-    return ppt_io
+
+def _get_pool():
+    """
+    The render pool of this process, created on first use. Its processes are spawned
+    rather than forked, so they do not inherit the server's threads, locks or model
+    weights, and a pool made before gunicorn forks is never shared with a worker.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=PPT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def create_ppts(decks):
+    """
+    Batch mode: renders many decks at once. decks is a list of (summary_text, action_items)
+    pairs; returns the .pptx bytes for each, in order. Cached decks are returned directly and
+    the rest are rendered in parallel on a process pool (python-pptx holds the GIL).
+    """
+    results = [None] * len(decks)
+    missing = []
+    for i, (summary_text, action_items) in enumerate(decks):
+        summary_text = summary_text or ""
+        action_lines = action_item_lines(action_items)
+        key = ppt_key(summary_text, action_lines)
+        results[i] = cache.get(key)
+        if results[i] is None:
+            missing.append((i, key, summary_text, action_lines))
+
+    if len(missing) > 1 and PPT_WORKERS > 1:
+        pool = _get_pool()
+        futures = [(i, key, pool.submit(_render_timed, summary_text, action_lines))
+                   for i, key, summary_text, action_lines in missing]
+        rendered = [(i, key, _record_render(*future.result())) for i, key, future in futures]
+    else:
+        rendered = [(i, key, _record_render(*_render_timed(summary_text, action_lines)))
+                    for i, key, summary_text, action_lines in missing]
+
+    for i, key, data in rendered:
+        cache.put(key, data)
+        results[i] = data
+    return results
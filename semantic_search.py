@@ -1,65 +1,92 @@
-from sentence_transformers import SentenceTransformer, util
 import re
-import os
+from vector_index import index
+from meeting_store import store as meeting_store, SUMMARY, ACTION_ITEMS_TEXT
+from transcript_model import load_for_meeting as load_transcript
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.?!])\s+(?=[A-Z])')
 
 def split_into_sentences(text):
     # Split text on a period, exclamation, or question mark followed by whitespace and a capital letter.
-    return [s.strip() for s in re.split(r'(?<=[.?!])\s+(?=[A-Z])', text) if s.strip()]
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+def sentence_spans(text):
+    """Like split_into_sentences(), as (sentence, start, end) with the character span in text."""
+    spans, start = [], 0
+    for boundary in [*SENTENCE_BOUNDARY.finditer(text), None]:
+        end = boundary.start() if boundary else len(text)
+        sentence = text[start:end].strip()
+        if sentence:
+            offset = text.index(sentence, start)
+            spans.append((sentence, offset, offset + len(sentence)))
+        start = boundary.end() if boundary else end
+    return spans
 
-def load_sentences():
+def load_sentences(meeting_id):
+    """Reads the sentences of a meeting's summary and action items."""
     combined_text = ""
-    for filename in ['summary.txt', 'action_items.txt']:
-        try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                combined_text += file.read() + "\n"
-        except FileNotFoundError:
-            print(f"⚠️ {filename} not found. Skipping.")
+    for name in [SUMMARY, ACTION_ITEMS_TEXT]:
+        text = meeting_store.read(meeting_id, name)
+        if text is None:
+            print(f"⚠️ {name} not found for meeting {meeting_id}. Skipping.")
+            continue
+        combined_text += text + "\n"
     return split_into_sentences(combined_text)
 
-def perform_semantic_search(query):
+def index_meeting_text(meeting_id, source, text, date=None):
     """
-    Perform a semantic search on the content of summary.txt and action_items.txt.
-    Writes the best matching sentence to static/search_results.txt and returns it.
+    Adds a meeting's transcript, summary or action items to the persistent vector index.
+    Re-indexing the same source for a meeting replaces its earlier content.
+    Transcript sentences of meetings with word timings carry their audio position and
+    speaker, which search results return.
+    Returns the number of sentences indexed.
     """
-    sentences = load_sentences()
-
-    if not sentences:
-        result = "No content to search."
-        _write_result_to_file(result)
-        return result
+    positions = None
+    if source == "action_items":
+        sentences = [line.strip() for line in text.splitlines() if line.strip()]
+    elif source == "transcript":
+        spans = sentence_spans(text)
+        sentences = [sentence for sentence, _, _ in spans]
+        transcript = load_transcript(meeting_id, text)
+        if transcript.timed:
+            positions = [transcript.locate(start, end) for _, start, end in spans]
+    else:
+        sentences = split_into_sentences(text)
+    return index.add_texts(meeting_id, source, sentences, date=date, extras=positions)
 
-    # Initialize SentenceTransformer and encode all sentences as well as the query.
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    sentence_embeddings = model.encode(sentences, convert_to_tensor=True)
-    query_embedding = model.encode(query, convert_to_tensor=True)
-    
-    # Compute cosine similarities between the query and each sentence.
-    similarities = util.cos_sim(query_embedding, sentence_embeddings)[0]
-    best_idx = int(similarities.argmax())
-    result = sentences[best_idx]
-
-    # Write the search result to the file in the static folder.
-    _write_result_to_file(result)
-    
-    return result
+def index_transcript_window(meeting_id, transcript, char_start, char_end, date=None, append=True):
+    """
+    Indexes the sentences of transcript.text[char_start:char_end] (a Transcript), e.g. one
+    window of a live meeting, adding them to the sentences indexed before unless append
+    is False. Returns the number of sentences indexed.
+    """
+    spans = sentence_spans(transcript.text[char_start:char_end])
+    sentences = [sentence for sentence, _, _ in spans]
+    positions = None
+    if transcript.timed:
+        positions = [transcript.locate(char_start + start, char_start + end) for _, start, end in spans]
+    return index.add_texts(meeting_id, "transcript", sentences, date=date, extras=positions, append=append)
 
-def _write_result_to_file(result_text):
+def perform_semantic_search(query, top_k=5, meeting_ids=None, date_from=None, date_to=None, sources=None):
     """
-    Writes the result text to static/search_results.txt.
+    Perform a top-k semantic search over every indexed meeting.
+    Returns a list of {text, score, meeting_id, date, source} dicts, best match first.
+    Transcript matches from timed transcripts also have audio_start, audio_end and speaker.
     """
-    # Determine the static folder path relative to this file.
-    static_folder = os.path.join(os.path.dirname(__file__), "static")
-    os.makedirs(static_folder, exist_ok=True)
-    file_path = os.path.join(static_folder, "search_results.txt")
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(result_text)
+    return index.search(
+        query,
+        top_k=top_k,
+        meeting_ids=meeting_ids,
+        date_from=date_from,
+        date_to=date_to,
+        sources=sources,
+    )
 
 def main():
     query = input("Enter your query for similarity search: ")
-    result = perform_semantic_search(query)
-    print("\nMost relevant result:")
-    print(result)
-    print(f"\nResult has been saved to 'static/search_results.txt'.")
+    results = perform_semantic_search(query)
+    print("\nMost relevant results:")
+    for result in results:
+        print(f"[{result['score']:.3f}] {result['meeting_id']} ({result['date']}, {result['source']}): {result['text']}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,340 @@
+# quickmeet-backend/streaming_upload.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# S3 requires every part except the last to be at least 5 MiB
+PART_SIZE = int(os.getenv("QUICKMEET_UPLOAD_PART_MB", "8")) * 1024 * 1024
+# Size of the chunks the browser sends; a multiple of PART_SIZE keeps parts aligned to chunks
+CHUNK_SIZE = int(os.getenv("QUICKMEET_UPLOAD_CHUNK_MB", "8")) * 1024 * 1024
+# Idle uploads are aborted (and their S3 parts discarded) after this many seconds
+SESSION_TTL_SECONDS = int(os.getenv("QUICKMEET_UPLOAD_TTL", "3600"))
+# Upload sessions are kept here so any worker process can take the next chunk
+UPLOAD_DB_PATH = os.getenv("QUICKMEET_UPLOAD_DB", "uploads.db")
+# A chunk whose worker died is given up after this many seconds, so the client can resend it
+CHUNK_LEASE_SECONDS = 600
+READ_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised for invalid upload requests (unknown id, wrong offset, already completed)."""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+class StreamingUpload:
+    """
+    One resumable upload piped into an S3 multipart upload, as stored by UploadManager.
+    Chunks must arrive in order. The S3 upload id, parts, offset and the bytes of the
+    part not yet flushed live in the shared database, so consecutive chunks may reach
+    different processes; memory is bounded by one part plus one chunk. A chunk that
+    fails midway is not recorded, so the client can resend it from the same offset.
+    """
+
+    def __init__(self, manager, row):
+        self.manager = manager
+        self.id = row["id"]
+        self.key = row["key"]
+        self.filename = row["filename"]
+        self.expected_size = row["expected_size"]
+        self.s3_upload_id = row["s3_upload_id"]
+        self.received_bytes = row["received_bytes"]
+        self.parts = json.loads(row["parts"])
+        self.buffered_bytes = len(row["buffer"])
+        self.completed = bool(row["completed"])
+        self.sha256 = row["sha256"]
+        self.created_at = row["created_at"]
+        self.active_seconds = row["active_seconds"]
+
+    def write_chunk(self, stream, offset):
+        """
+        Appends a chunk read from stream (any object with .read(n)) at offset.
+        Returns the number of bytes accepted.
+        """
+        row = self.manager._lease(self.id, offset)
+        try:
+            started = time.perf_counter()
+            buffer = bytearray(row["buffer"])
+            data = bytearray()
+            while True:
+                block = stream.read(READ_SIZE)
+                if not block:
+                    break
+                data += block
+                if len(data) > CHUNK_SIZE:
+                    raise UploadError(f"Chunks may not exceed {CHUNK_SIZE} bytes", status=413)
+            buffer += data
+
+            # Parts are flushed only at chunk boundaries, so a failed chunk never reaches S3
+            parts = json.loads(row["parts"])
+            while len(buffer) >= self.manager.part_size:
+                parts.append(self.manager._upload_part(row, len(parts) + 1, bytes(buffer[:self.manager.part_size])))
+                del buffer[:self.manager.part_size]
+            active_seconds = row["active_seconds"] + time.perf_counter() - started
+            self.manager._record_chunk(self.id, offset, data, bytes(buffer), parts, active_seconds)
+        except BaseException:
+            self.manager._release(self.id)
+            raise
+
+        self.received_bytes = offset + len(data)
+        self.parts = parts
+        self.buffered_bytes = len(buffer)
+        self.active_seconds = active_seconds
+        return len(data)
+
+    @property
+    def s3_uri(self):
+        return f"s3://{self.manager.bucket}/{self.key}"
+
+    def status(self):
+        return {
+            "upload_id": self.id,
+            "filename": self.filename,
+            "received_bytes": self.received_bytes,
+            "next_offset": self.received_bytes,
+            "expected_size": self.expected_size,
+            "parts_uploaded": len(self.parts),
+            "buffered_bytes": self.buffered_bytes,
+            "completed": self.completed,
+            "sha256": self.sha256,
+            "throughput_mb_s": round(self.received_bytes / self.active_seconds / 1e6, 2) if self.active_seconds else None,
+            "elapsed_seconds": round(time.time() - self.created_at, 1),
+        }
+
+
+class UploadManager:
+    """
+    Tracks streaming uploads in a SQLite database shared by every worker process,
+    plus aggregate throughput of the uploads completed within the TTL.
+
+    The SHA-256 is computed as chunks stream through a process. When a chunk of the
+    upload went to another process, the digest cannot follow it, and the object is
+    hashed again from S3 when the upload completes.
+    """
+
+    def __init__(self, s3_client, bucket, prefix="incoming/", ttl=SESSION_TTL_SECONDS, db_path=UPLOAD_DB_PATH,
+                 part_size=PART_SIZE):
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.ttl = ttl
+        self.db_path = db_path
+        self.part_size = part_size
+        # upload id -> (bytes hashed, running digest) for uploads this process has seen every chunk of
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS uploads (
+                    id TEXT PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    filename TEXT,
+                    expected_size INTEGER,
+                    s3_upload_id TEXT NOT NULL,
+                    received_bytes INTEGER NOT NULL DEFAULT 0,
+                    parts TEXT NOT NULL DEFAULT '[]',
+                    buffer BLOB NOT NULL DEFAULT x'',
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    sha256 TEXT,
+                    active_seconds REAL NOT NULL DEFAULT 0,
+                    leased_until REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_activity REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS uploads_activity ON uploads (completed, last_activity)")
+            self._initialized = True
+        return conn
+
+    def _row(self, conn, upload_id):
+        row = conn.execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        if row is None:
+            raise UploadError("Unknown or expired upload", status=404)
+        return row
+
+    def create(self, filename=None, expected_size=None):
+        self._expire_idle()
+        extension = os.path.splitext(filename or "")[1].lower()
+        key = f"{self.prefix}{uuid.uuid4().hex}{extension}"
+        response = self.s3.create_multipart_upload(Bucket=self.bucket, Key=key)
+        upload_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """INSERT INTO uploads (id, key, filename, expected_size, s3_upload_id, created_at, last_activity)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (upload_id, key, filename, expected_size, response["UploadId"], now, now),
+            )
+            row = self._row(conn, upload_id)
+        with self._lock:
+            self._digests[upload_id] = (0, hashlib.sha256())
+        return StreamingUpload(self, row)
+
+    def get(self, upload_id):
+        with closing(self._connect()) as conn:
+            return StreamingUpload(self, self._row(conn, upload_id))
+
+    def _lease(self, upload_id, offset):
+        """Checks the offset and reserves the upload for one chunk; returns its row."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._row(conn, upload_id)
+                if row["completed"]:
+                    raise UploadError("Upload already completed", status=409)
+                if row["leased_until"] > now:
+                    raise UploadError("Another chunk of this upload is in progress", status=409,
+                                      next_offset=row["received_bytes"])
+                if offset != row["received_bytes"]:
+                    raise UploadError("Unexpected chunk offset", status=409, next_offset=row["received_bytes"])
+                conn.execute("UPDATE uploads SET leased_until = ? WHERE id = ?", (now + CHUNK_LEASE_SECONDS, upload_id))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _release(self, upload_id):
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("UPDATE uploads SET leased_until = 0 WHERE id = ?", (upload_id,))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not release upload {upload_id}; it is free again after the lease expires: {e}")
+
+    def _record_chunk(self, upload_id, offset, data, buffer, parts, active_seconds):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """UPDATE uploads SET received_bytes = ?, buffer = ?, parts = ?, active_seconds = ?,
+                                      leased_until = 0, last_activity = ?
+                   WHERE id = ?""",
+                (offset + len(data), buffer, json.dumps(parts), active_seconds, time.time(), upload_id),
+            )
+        with self._lock:
+            hashed, digest = self._digests.pop(upload_id, (None, None))
+            if hashed == offset:
+                digest.update(data)
+                self._digests[upload_id] = (offset + len(data), digest)
+            elif offset == 0:
+                self._digests[upload_id] = (len(data), hashlib.sha256(data))
+
+    def _upload_part(self, row, part_number, data):
+        with timed("s3_upload_part"):
+            response = self.s3.upload_part(
+                Bucket=self.bucket, Key=row["key"], UploadId=row["s3_upload_id"], PartNumber=part_number, Body=data,
+            )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _rehash(self, key):
+        digest = hashlib.sha256()
+        with timed("s3_rehash_upload"):
+            body = self.s3.get_object(Bucket=self.bucket, Key=key)["Body"]
+            for block in iter(lambda: body.read(READ_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def complete(self, upload_id):
+        """Uploads the final part, completes the multipart upload and returns the upload with its SHA-256."""
+        upload = self.get(upload_id)
+        if upload.completed:
+            return upload
+        if upload.expected_size is not None and upload.received_bytes != upload.expected_size:
+            raise UploadError("Upload is incomplete", status=409, next_offset=upload.received_bytes)
+        row = self._lease(upload_id, upload.received_bytes)
+        try:
+            started = time.perf_counter()
+            parts = json.loads(row["parts"])
+            if row["buffer"] or not parts:
+                parts.append(self._upload_part(row, len(parts) + 1, bytes(row["buffer"])))
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket, Key=row["key"], UploadId=row["s3_upload_id"], MultipartUpload={"Parts": parts},
+            )
+            with self._lock:
+                hashed, digest = self._digests.pop(upload_id, (None, None))
+            if hashed == row["received_bytes"]:
+                sha256 = digest.hexdigest()
+            else:
+                logger.info(f"Upload {upload_id} was received by several processes; hashing it again from S3")
+                sha256 = self._rehash(row["key"])
+            active_seconds = row["active_seconds"] + time.perf_counter() - started
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    """UPDATE uploads SET completed = 1, sha256 = ?, parts = ?, buffer = x'', active_seconds = ?,
+                                          leased_until = 0, last_activity = ?
+                       WHERE id = ?""",
+                    (sha256, json.dumps(parts), active_seconds, time.time(), upload_id),
+                )
+                return StreamingUpload(self, self._row(conn, upload_id))
+        except BaseException:
+            self._release(upload_id)
+            raise
+
+    def _abort(self, row):
+        try:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=row["key"], UploadId=row["s3_upload_id"])
+        except Exception as e:
+            logger.warning(f"Could not abort multipart upload {row['s3_upload_id']}: {e}")
+
+    def discard(self, upload_id):
+        """Aborts an in-progress upload and discards its S3 parts."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM uploads WHERE id = ? AND completed = 0", (upload_id,)).fetchone()
+            if row is None:
+                return
+            conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+        with self._lock:
+            self._digests.pop(upload_id, None)
+        self._abort(row)
+
+    def _expire_idle(self):
+        # Completed uploads are kept as long as idle ones, for the throughput stats
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            expired = conn.execute(
+                "SELECT * FROM uploads WHERE last_activity < ? AND leased_until < ?", (now - self.ttl, now),
+            ).fetchall()
+            conn.execute("DELETE FROM uploads WHERE last_activity < ? AND leased_until < ?", (now - self.ttl, now))
+            conn.execute("COMMIT")
+        for row in expired:
+            with self._lock:
+                self._digests.pop(row["id"], None)
+            if not row["completed"]:
+                logger.info(f"Aborting idle upload {row['id']}")
+                self._abort(row)
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                """SELECT SUM(completed = 0) AS in_progress, SUM(completed) AS completed,
+                          SUM(CASE WHEN completed THEN received_bytes ELSE 0 END) AS completed_bytes,
+                          SUM(CASE WHEN completed THEN active_seconds ELSE 0 END) AS completed_seconds
+                   FROM uploads"""
+            ).fetchone()
+        completed_bytes = row["completed_bytes"] or 0
+        return {
+            "in_progress": row["in_progress"] or 0,
+            "completed": row["completed"] or 0,
+            "completed_mb": round(completed_bytes / 1e6, 1),
+            "throughput_mb_s": round(completed_bytes / row["completed_seconds"] / 1e6, 2)
+            if row["completed_seconds"] else None,
+        }
@@ -0,0 +1,167 @@
+# quickmeet-backend/summarization_engine.py
+import logging
+import os
+import re
+import time
+
+from model_registry import get_model
+from metrics import stage_seconds
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODEL = os.getenv("QUICKMEET_SUMMARY_MODEL", "philschmid/bart-large-cnn-samsum")
+# Chunk summaries generated per forward pass
+BATCH_SIZE = int(os.getenv("QUICKMEET_SUMMARY_BATCH_SIZE", "4"))
+# Torch intra-op threads for CPU inference (0 keeps the torch default)
+NUM_THREADS = int(os.getenv("QUICKMEET_TORCH_THREADS", "0"))
+# Upper bound on tokens per chunk; the model's own input limit applies when it is smaller
+MAX_CHUNK_TOKENS = int(os.getenv("QUICKMEET_SUMMARY_CHUNK_TOKENS", "1000"))
+# Length (in tokens) of each chunk summary produced by the map pass
+CHUNK_SUMMARY_MIN, CHUNK_SUMMARY_MAX = 30, 150
+# Reduce passes allowed before the joined chunk summaries are truncated into the final call
+MAX_REDUCE_LEVELS = 3
+
+_threads_configured = False
+
+
+def configure_threads(num_threads=NUM_THREADS):
+    """Sets torch's CPU thread count once per process."""
+    global _threads_configured
+    if _threads_configured or not num_threads:
+        return
+    import torch
+    torch.set_num_threads(num_threads)
+    _threads_configured = True
+
+
+def split_sentences(text):
+    """Splits text on sentence-ending punctuation followed by whitespace."""
+    return [s.strip() for s in re.split(r"(?<=[.?!])\s+", text) if s.strip()]
+
+
+def chunk_by_tokens(sentences, tokenizer, max_tokens):
+    """
+    Packs consecutive sentences into chunks of at most max_tokens tokens.
+    A single sentence longer than max_tokens is split on token boundaries.
+    """
+    if not sentences:
+        return []
+    token_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+    chunks, current, current_tokens = [], [], 0
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) > max_tokens:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            for start in range(0, len(ids), max_tokens):
+                chunks.append(tokenizer.decode(ids[start:start + max_tokens], skip_special_tokens=True))
+            continue
+        if current_tokens + len(ids) > max_tokens and current:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += len(ids)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _chunk_limit(tokenizer, max_chunk_tokens):
+    model_limit = getattr(tokenizer, "model_max_length", None) or max_chunk_tokens
+    # Some tokenizers report a huge sentinel when the model has no fixed limit
+    if model_limit > 100000:
+        model_limit = max_chunk_tokens
+    # Leave room for the special tokens the pipeline adds
+    return max(32, min(max_chunk_tokens, model_limit - 8))
+
+
+def _summarize_batches(summarizer, texts, batch_size, min_length, max_length, on_batch=None, **generate_kwargs):
+    """Summarizes texts batch_size at a time, calling on_batch(start_index, summaries) after each batch."""
+    summaries = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        outputs = summarizer(
+            batch,
+            batch_size=len(batch),
+            min_length=min_length,
+            max_length=max_length,
+            truncation=True,
+            do_sample=False,
+            **generate_kwargs,
+        )
+        batch_summaries = [output["summary_text"] for output in outputs]
+        summaries.extend(batch_summaries)
+        if on_batch:
+            on_batch(start, batch_summaries)
+    return summaries
+
+
+def summarize(text, model_name=SUMMARY_MODEL, min_length=None, max_length=None, batch_size=BATCH_SIZE,
+              num_threads=NUM_THREADS, max_chunk_tokens=MAX_CHUNK_TOKENS, on_chunk=None, streamer=None):
+    """
+    Hierarchical map-reduce summarization.
+    Text that fits the model's input is summarized in one call. Longer text is split into
+    token-bounded chunks on sentence boundaries, the chunks are summarized in batches (map),
+    and the joined chunk summaries are summarized again (reduce) until they fit.
+
+    on_chunk(index, total, summary) is called as each chunk summary of the first map pass is produced.
+    streamer (a transformers streamer) receives the tokens of the final pass as they are generated.
+    Returns (summary, timings) where timings holds seconds per stage and chunk counts.
+    """
+    timings = {}
+    total_start = time.perf_counter()
+    configure_threads(num_threads)
+
+    stage_start = time.perf_counter()
+    summarizer = get_model("summarization", model_name)
+    timings["load_seconds"] = time.perf_counter() - stage_start
+
+    tokenizer = summarizer.tokenizer
+    limit = _chunk_limit(tokenizer, max_chunk_tokens)
+
+    stage_start = time.perf_counter()
+    chunks = chunk_by_tokens(split_sentences(text), tokenizer, limit)
+    timings["split_seconds"] = time.perf_counter() - stage_start
+    timings["chunks"] = len(chunks)
+
+    map_seconds = []
+    level = 0
+    while len(chunks) > 1 and level < MAX_REDUCE_LEVELS:
+        stage_start = time.perf_counter()
+        callback = None
+        if level == 0 and on_chunk:
+            total = len(chunks)
+            def callback(start, summaries):
+                for offset, summary in enumerate(summaries):
+                    on_chunk(start + offset, total, summary)
+        summaries = _summarize_batches(
+            summarizer, chunks, batch_size, CHUNK_SUMMARY_MIN, CHUNK_SUMMARY_MAX, on_batch=callback,
+        )
+        map_seconds.append(time.perf_counter() - stage_start)
+        logger.info(f"Map level {level}: {len(chunks)} chunks summarized in {map_seconds[-1]:.2f}s")
+        # Regroup the chunk summaries; when they fit in one chunk the loop ends with the reduce input
+        chunks = chunk_by_tokens(summaries, tokenizer, limit)
+        level += 1
+    timings["map_seconds"] = [round(s, 3) for s in map_seconds]
+    timings["map_levels"] = level
+
+    # Final (reduce) pass; anything still beyond the input limit is truncated by the tokenizer
+    reduce_input = " ".join(chunks)
+    word_count = len(reduce_input.split())
+    if min_length is None or max_length is None:
+        min_length = max(30, word_count // 4) if min_length is None else min_length
+        max_length = min(300, max(min_length + 20, int(word_count // 1.5))) if max_length is None else max_length
+
+    stage_start = time.perf_counter()
+    generate_kwargs = {"streamer": streamer} if streamer is not None else {}
+    summary = (_summarize_batches(summarizer, [reduce_input], 1, min_length, max_length, **generate_kwargs)[0]
+               if reduce_input else "")
+    timings["reduce_seconds"] = time.perf_counter() - stage_start
+    timings["total_seconds"] = time.perf_counter() - total_start
+    stage_seconds.observe(timings["total_seconds"] - timings["load_seconds"], stage="summarize")
+
+    for key, value in timings.items():
+        if isinstance(value, float):
+            timings[key] = round(value, 3)
+    timings.update(model=model_name, batch_size=batch_size, num_threads=num_threads or None)
+    return summary, timings
@@ -0,0 +1,136 @@
+# quickmeet-backend/summary_cache.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_DB = os.getenv("QUICKMEET_SUMMARY_CACHE_DB", os.path.join("cache", "summaries.db"))
+# Entries kept in the in-memory LRU in front of SQLite
+MEMORY_ENTRIES = int(os.getenv("QUICKMEET_SUMMARY_CACHE_MEMORY", "256"))
+# Rows kept on disk; least recently used rows beyond this are pruned (0 disables the limit)
+DISK_ENTRIES = int(os.getenv("QUICKMEET_SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+
+
+def summary_key(transcript_text, model_name, min_length, max_length):
+    """Cache key for a summary: transcript content hash plus the generation parameters."""
+    transcript_hash = hashlib.sha256(transcript_text.encode("utf-8")).hexdigest()
+    lengths = f"{'auto' if min_length is None else min_length}-{'auto' if max_length is None else max_length}"
+    return f"{transcript_hash}:{model_name}:{lengths}"
+
+
+class SummaryCache:
+    """
+    Two-level summary cache: an in-memory LRU in front of a SQLite table.
+    The SQLite file can be shared by several worker processes.
+    """
+
+    def __init__(self, db_path=SUMMARY_CACHE_DB, memory_entries=MEMORY_ENTRIES, disk_entries=DISK_ENTRIES):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    timings TEXT,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)")
+            self._initialized = True
+        return conn
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Returns (summary, timings) or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT summary, timings FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache lookup failed: {e}")
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        value = (row[0], json.loads(row[1]) if row[1] else {})
+        self._remember(key, value)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def put(self, key, summary, timings=None):
+        value = (summary, timings or {})
+        self._remember(key, value)
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary, timings, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, summary, json.dumps(timings or {}), now, now),
+                )
+                if self.disk_entries:
+                    conn.execute(
+                        "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.disk_entries,),
+                    )
+        except sqlite3.Error as e:
+            # The in-memory entry still serves this process
+            logger.warning(f"Summary cache write failed: {e}")
+
+    def stats(self):
+        try:
+            with closing(self._connect()) as conn:
+                disk_entries = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        except sqlite3.Error:
+            disk_entries = None
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": disk_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Shared cache for the whole process
+cache = SummaryCache()
@@ -0,0 +1,12 @@
+# quickmeet-backend/tests/conftest.py
+import os
+import sys
+
+# The modules live at the repository root and read their settings on import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.update({
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "SOURCE_EMAIL": "quickmeet@example.com",
+})
@@ -0,0 +1,65 @@
+# quickmeet-backend/tests/test_action_items.py
+import pytest
+
+from action_items import extract, format_action_items, merge
+
+
+def _items(text):
+    return [(record["owner"], record["task"], record["deadline"]) for record in extract(text)]
+
+
+@pytest.mark.parametrize("text, task", [
+    ("Mary will call Dr. Smith tomorrow.", "call Dr. Smith tomorrow"),
+    ("Mary will email Mr. Jones and Ms. Lee by noon.", "email Mr. Jones and Ms. Lee by noon"),
+    ("Mary will list the risks, e.g. churn, i.e. lost users.", "list the risks, e.g. churn, i.e. lost users"),
+    ("Mary will order pens, paper, etc. for the team.", "order pens, paper, etc. for the team"),
+])
+def test_abbreviations_do_not_end_the_task(text, task):
+    assert _items(text) == [("Mary", task, None)]
+
+
+def test_decimals_and_versions_stay_in_the_task():
+    assert _items("Bob will ship v1.2 with a 2.5% discount.") == [("Bob", "ship v1.2 with a 2.5% discount", None)]
+
+
+def test_each_sentence_of_a_line_is_an_item():
+    text = "Bob will draft the plan. Alice is responsible for the budget. The rest is done."
+
+    assert _items(text) == [("Bob", "draft the plan", None), ("Alice", "the budget", None)]
+
+
+def test_lowercase_after_a_period_continues_the_task():
+    assert _items("Bob will fix it. then deploy") == [("Bob", "fix it. then deploy", None)]
+
+
+def test_pronoun_owners_resolve_to_the_last_named_owner():
+    text = "She will start. Alice will draft it. She will send it.\nThey will review it."
+
+    assert _items(text) == [("Unknown", "start", None), ("Alice", "draft it", None), ("Alice", "send it", None),
+                            ("Alice", "review it", None)]
+
+
+def test_deadline_attaches_to_the_previous_task():
+    text = "Carol will book the venue.\nDeadline: March 5\nDeadline: April 1"
+
+    assert _items(text) == [("Carol", "book the venue", "March 5"), (None, None, "April 1")]
+    assert format_action_items(extract(text)).splitlines() == [
+        "- Carol: book the venue (Deadline: March 5)", "- Deadline: April 1"]
+
+
+def test_spans_point_at_the_match():
+    text = "Intro. Dan will call Dr. Who."
+    record = extract(text, source="transcript")[0]
+
+    assert text[record["start"]:record["end"]] == "Dan will call Dr. Who."
+    assert record["source"] == "transcript"
+
+
+def test_merge_drops_duplicates_and_keeps_their_fields():
+    summary = extract("Dan will call Dr. Who.", source="summary")
+    transcript = [dict(record, audio_start=4.0) for record in extract("Dan will call Dr. Who.", source="transcript")]
+
+    merged = merge(summary, transcript)
+
+    assert len(merged) == 1
+    assert (merged[0]["source"], merged[0]["audio_start"]) == ("summary", 4.0)
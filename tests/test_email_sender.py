@@ -0,0 +1,73 @@
+# quickmeet-backend/tests/test_email_sender.py
+import boto3
+import pytest
+from moto import mock_aws
+from moto.core import DEFAULT_ACCOUNT_ID
+from moto.ses.models import ses_backends
+
+from email_sender import RateLimiter, SOURCE_EMAIL, send_bulk_email
+
+RECIPIENTS = [f"member{i}@example.com" for i in range(120)]
+
+
+@pytest.fixture
+def ses():
+    with mock_aws():
+        client = boto3.client("ses", region_name="us-east-1")
+        client.verify_email_identity(EmailAddress=SOURCE_EMAIL)
+        yield client
+
+
+def _sent_messages():
+    return ses_backends[DEFAULT_ACCOUNT_ID]["us-east-1"].sent_messages
+
+
+def _send(client, recipients=RECIPIENTS, **kwargs):
+    return send_bulk_email(recipients, "Weekly sync", "We shipped.", [], client=client, limiter=RateLimiter(0),
+                           **kwargs)
+
+
+def test_recipients_are_sent_in_bcc_batches(ses):
+    delivered = []
+    result = _send(ses, on_batch_sent=lambda batch, message_id: delivered.append((batch, message_id)))
+
+    assert result["sent"] == len(RECIPIENTS)
+    assert result["failed"] == []
+    assert result["batches"] == 3
+    assert [len(r["recipients"]) for r in result["results"]] == [50, 50, 20]
+    assert all(r["message_id"] and r["error"] is None for r in result["results"])
+    assert sorted(address for batch, _ in delivered for address in batch) == sorted(RECIPIENTS)
+
+    messages = _sent_messages()
+    assert len(messages) == 3
+    for message in messages:
+        assert not message.destinations.get("ToAddresses")
+        assert len(message.destinations["BccAddresses"]) <= 50
+    assert ses.get_send_quota()["SentLast24Hours"] == len(RECIPIENTS)
+
+
+def test_failed_batch_does_not_stop_the_others(ses):
+    class FlakyClient:
+        def send_email(self, **kwargs):
+            if "member60@example.com" in kwargs["Destination"]["BccAddresses"]:
+                raise ValueError("connection reset")
+            return ses.send_email(**kwargs)
+
+    result = _send(FlakyClient())
+
+    assert result["sent"] == 70
+    assert [batch["recipients"] for batch in result["failed"]] == [RECIPIENTS[50:100]]
+    assert result["failed"][0]["error"] == "connection reset"
+    assert [r["error"] for r in result["results"]] == [None, "connection reset", None]
+    assert len(_sent_messages()) == 2
+
+
+def test_rejected_sender_fails_every_batch_without_retrying(ses):
+    ses.delete_identity(Identity=SOURCE_EMAIL)
+
+    result = _send(ses, recipients=RECIPIENTS[:60], max_retries=3)
+
+    assert result["sent"] == 0
+    assert len(result["failed"]) == 2
+    assert all("not verified" in batch["error"] for batch in result["failed"])
+    assert _sent_messages() == []
@@ -0,0 +1,70 @@
+# quickmeet-backend/tests/test_embedding_store.py
+import os
+import time
+
+import numpy as np
+import pytest
+
+import embedding_store
+from embedding_store import EmbeddingStore, corpus_hash
+
+
+@pytest.fixture
+def encoded(monkeypatch):
+    calls = []
+
+    def encode(sentences, model_name=None):
+        calls.append(list(sentences))
+        return np.ones((len(sentences), 4), dtype=np.float32) * len(calls)
+
+    monkeypatch.setattr(embedding_store, "encode", encode)
+    return calls
+
+
+def _corpus(i):
+    return [f"Sentence {i}.", f"Another sentence {i}."]
+
+
+def _age(store, sentences, seconds_ago):
+    path = store._path(corpus_hash(sentences))
+    then = time.time() - seconds_ago
+    os.utime(path, (then, then))
+
+
+def test_unchanged_corpus_is_encoded_once(tmp_path, encoded):
+    store = EmbeddingStore(str(tmp_path), memory_cache_size=0)
+
+    first = store.get_embeddings(_corpus(0))
+    again = store.get_embeddings(_corpus(0))
+
+    assert np.array_equal(first, again)
+    assert len(encoded) == 1
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_least_recently_used_files_are_evicted_beyond_max_entries(tmp_path, encoded):
+    store = EmbeddingStore(str(tmp_path), memory_cache_size=0, max_entries=2, max_bytes=0)
+    store.get_embeddings(_corpus(0))
+    _age(store, _corpus(0), 30)
+    store.get_embeddings(_corpus(1))
+    _age(store, _corpus(1), 20)
+    # Reading corpus 0 from disk marks it as recently used
+    store.get_embeddings(_corpus(0))
+
+    store.get_embeddings(_corpus(2))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f"{corpus_hash(_corpus(i))}.npy" for i in (0, 2))
+    store.get_embeddings(_corpus(1))
+    assert len(encoded) == 4
+
+
+def test_files_are_evicted_beyond_max_bytes(tmp_path, encoded):
+    store = EmbeddingStore(str(tmp_path), memory_cache_size=0, max_entries=0, max_bytes=1)
+    store.get_embeddings(_corpus(0))
+    store.get_embeddings(_corpus(1))
+
+    # Over the size limit, even the file just written is deleted; it is encoded again when needed
+    assert os.listdir(tmp_path) == []
+    store.get_embeddings(_corpus(1))
+    assert len(encoded) == 3
@@ -0,0 +1,147 @@
+# quickmeet-backend/tests/test_jobs.py
+import threading
+import time
+from contextlib import closing
+
+import pytest
+
+from jobs import COMPLETED, FAILED, JOB_MAX_ATTEMPTS, RUNNING, JobQueue, QueueFull
+
+
+def _wait(queue, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish: {queue.get(job_id)}")
+
+
+@pytest.fixture(params=["inprocess", "sqlite"])
+def queue(request, tmp_path):
+    options = {"db_path": str(tmp_path / "jobs.db"), "poll_interval": 0.01} if request.param == "sqlite" else {}
+    return JobQueue(request.param, workers=2, queue_size=4, **options)
+
+
+def test_submit_once_returns_the_job_in_flight(queue):
+    release = threading.Event()
+    runs = []
+
+    @queue.task("transcribe")
+    def transcribe(meeting_id, audio_hash):
+        runs.append(meeting_id)
+        release.wait(10)
+        return {"meeting_id": meeting_id}
+
+    job_id, args, queued = queue.submit_once("transcribe", "abc", meeting_id="m1", audio_hash="abc")
+    again_id, again_args, again_queued = queue.submit_once("transcribe", "abc", meeting_id="m2", audio_hash="abc")
+    other_id, _, other_queued = queue.submit_once("transcribe", "def", meeting_id="m3", audio_hash="def")
+
+    assert (queued, again_queued, other_queued) == (True, False, True)
+    assert again_id == job_id and again_args["meeting_id"] == "m1"
+    assert other_id != job_id
+    assert "key" not in queue.get(job_id)
+
+    release.set()
+    assert _wait(queue, job_id)["result"] == {"meeting_id": "m1"}
+    _wait(queue, other_id)
+    assert sorted(runs) == ["m1", "m3"]
+
+    # Once the first job finished, the same key runs again
+    new_id, _, new_queued = queue.submit_once("transcribe", "abc", meeting_id="m4", audio_hash="abc")
+    assert new_queued and new_id != job_id
+    assert _wait(queue, new_id)["status"] == COMPLETED
+
+
+def test_finished_jobs_report_their_result_or_error(queue):
+    queue.register("add", lambda a, b: {"sum": a + b})
+    queue.register("fail", lambda: 1 / 0)
+
+    done = _wait(queue, queue.submit("add", a=2, b=3))
+    failed = _wait(queue, queue.submit("fail"))
+
+    assert (done["status"], done["result"], done["error"]) == (COMPLETED, {"sum": 5}, None)
+    assert done["started_at"] <= done["finished_at"]
+    assert (failed["status"], failed["result"]) == (FAILED, None)
+    assert "division by zero" in failed["error"]
+    assert queue.get("unknown") is None
+
+
+def test_queue_limit_rejects_new_work(queue):
+    release = threading.Event()
+    queue.register("wait", lambda: release.wait(10))
+    try:
+        # Two workers take a job each; four more wait
+        job_ids = [queue.submit("wait") for _ in range(2)]
+        deadline = time.monotonic() + 10
+        while queue.stats()["running"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        job_ids += [queue.submit("wait") for _ in range(4)]
+        with pytest.raises(QueueFull):
+            queue.submit("wait")
+    finally:
+        release.set()
+    for job_id in job_ids:
+        assert _wait(queue, job_id)["status"] == COMPLETED
+    queue.submit("wait")
+
+
+def _sqlite_queue(tmp_path, **options):
+    return JobQueue("sqlite", db_path=str(tmp_path / "jobs.db"), poll_interval=0.01, **options)
+
+
+def _insert_running(queue, job_id, task, lease_until, attempts):
+    with closing(queue.backend._connect()) as conn:
+        conn.execute(
+            """INSERT INTO jobs (id, task, args, status, created_at, started_at, lease_until, attempts)
+               VALUES (?, ?, '{}', ?, ?, ?, ?, ?)""",
+            (job_id, task, RUNNING, time.time(), time.time(), lease_until, attempts),
+        )
+
+
+def test_job_whose_lease_ran_out_is_claimed_again(tmp_path):
+    queue = _sqlite_queue(tmp_path, workers=1)
+    queue.register("report", lambda: "done")
+    # Left by workers that died: one may run again, the other has used up its attempts
+    _insert_running(queue, "orphan", "report", time.time() - 1, 1)
+    _insert_running(queue, "hopeless", "report", time.time() - 1, JOB_MAX_ATTEMPTS)
+    _insert_running(queue, "leased", "report", time.time() + 600, 1)
+
+    queue.submit("report")
+    orphan = _wait(queue, "orphan")
+
+    assert (orphan["status"], orphan["result"], orphan["attempts"]) == (COMPLETED, "done", 2)
+    hopeless = queue.get("hopeless")
+    assert hopeless["status"] == FAILED and "stopped 3 times" in hopeless["error"]
+    assert queue.get("leased")["status"] == RUNNING
+
+
+def test_expired_lease_counts_toward_the_queue_limit(tmp_path):
+    queue = _sqlite_queue(tmp_path, workers=0, queue_size=2)
+    queue.register("report", lambda: "done")
+    _insert_running(queue, "orphan", "report", time.time() - 1, 1)
+    _insert_running(queue, "leased", "report", time.time() + 600, 1)
+
+    queue.submit("report")
+    with pytest.raises(QueueFull):
+        queue.submit("report")
+
+
+def test_heartbeat_keeps_a_long_job_leased(tmp_path):
+    runs = []
+
+    def slow():
+        runs.append(threading.current_thread().name)
+        time.sleep(1.0)
+
+    # Two "processes" share the database; the lease is much shorter than the job
+    first = _sqlite_queue(tmp_path, workers=1, lease_seconds=0.3)
+    second = _sqlite_queue(tmp_path, workers=1, lease_seconds=0.3)
+    for queue in (first, second):
+        queue.register("slow", slow)
+    jobs = [_wait(first, job_id) for job_id in (first.submit("slow"), second.submit("slow"))]
+
+    # Each job ran once, although both outlived their first lease several times
+    assert [(job["status"], job["attempts"]) for job in jobs] == [(COMPLETED, 1), (COMPLETED, 1)]
+    assert len(runs) == 2
@@ -0,0 +1,169 @@
+# quickmeet-backend/tests/test_live_transcription.py
+import io
+import threading
+import time
+
+import pytest
+
+import live_transcription
+from live_transcription import LiveError, LiveSessions
+from meeting_store import store as meeting_store, SUMMARY, TRANSCRIPT
+from transcript_model import TRANSCRIPT_TIMING, TRANSCRIPT_TIMING_WINDOWS, load_for_meeting
+
+# With the stub backend's 0.4 s per word and 1 s windows, every sentence closes a window
+SENTENCES = [
+    "Alpha opened the meeting.",
+    "Bravo covered the budget.",
+    "Charlie raised the hiring plan.",
+    "Delta reviewed the roadmap.",
+    "Echo closed the meeting.",
+]
+
+
+def _summarize(text, **kwargs):
+    # A window summarizes to its first word; several summaries condense to "(a+b)"
+    lines = text.splitlines()
+    summary = "(" + "+".join(lines) + ")" if len(lines) > 1 else text.split()[0]
+    return summary, {}
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(live_transcription, "SUMMARY_GROUP_WINDOWS", 2)
+    monkeypatch.setattr(live_transcription, "summarize_transcript", _summarize)
+    indexed = []
+    monkeypatch.setattr(live_transcription, "index_transcript_window",
+                        lambda meeting_id, window, start, end, **kwargs: indexed.append(window.text[start:end]))
+    monkeypatch.setattr(live_transcription, "index_meeting_text",
+                        lambda meeting_id, kind, text, **kwargs: indexed.append((kind, text)))
+    sessions = LiveSessions(backend="stub", window_seconds=1)
+    sessions.indexed = indexed
+    return sessions
+
+
+def _send(session, text, chunk_bytes=7):
+    audio, start = text.encode("utf-8"), session.received_bytes
+    for offset in range(0, len(audio), chunk_bytes):
+        session.write_chunk(io.BytesIO(audio[offset:offset + chunk_bytes]), start + offset)
+
+
+def _wait_for_windows(session):
+    deadline = time.monotonic() + 10
+    while session.status()["windows_pending"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert session.status()["windows_pending"] == 0
+
+
+def test_windows_close_at_sentence_ends(sessions):
+    session = sessions.create()
+    text = " ".join(SENTENCES[:3]) + " Delta is still"
+    _send(session, text)
+    _wait_for_windows(session)
+
+    status = session.status()
+    assert status["windows_processed"] == 3
+    assert status["errors"] == []
+    saved = meeting_store.read(session.meeting_id, TRANSCRIPT)
+    assert saved == session.builder.text[:len(saved)]
+    assert saved.split() == " ".join(SENTENCES[:3]).split()
+    assert [text.strip() for text in sessions.indexed if isinstance(text, str)] == SENTENCES[:3]
+
+    # While the meeting runs, its timing is combined from the saved windows
+    transcript = load_for_meeting(session.meeting_id, saved)
+    assert transcript.timed
+    assert len(meeting_store.names(session.meeting_id, TRANSCRIPT_TIMING_WINDOWS)) == 3
+    assert transcript.segment_at(2.0).text == SENTENCES[1]
+
+
+def test_meeting_summary_is_built_from_grouped_window_summaries(sessions):
+    session = sessions.create()
+    summaries = []
+    for sentence in SENTENCES:
+        _send(session, sentence + " ")
+        _wait_for_windows(session)
+        summaries.append(session.summary)
+
+    assert summaries == ["Alpha", "(Alpha+Bravo)", "((Alpha+Bravo)+Charlie)", "((Alpha+Bravo)+(Charlie+Delta))",
+                         "(((Alpha+Bravo)+(Charlie+Delta))+Echo)"]
+    assert meeting_store.read(session.meeting_id, SUMMARY) == summaries[-1]
+
+
+def test_finish_processes_the_last_window_and_writes_the_recap(sessions):
+    session = sessions.create()
+    text = " ".join(SENTENCES[:2]) + " Foxtrot will send the report by Friday"
+    _send(session, text)
+
+    recap = sessions.finish(session.meeting_id)
+
+    assert recap["transcript"].split() == text.split()
+    assert recap["summary"] == "((Alpha+Bravo)+Foxtrot)"
+    assert recap["speakers"]
+    assert isinstance(recap["records"], list)
+    meeting_id = session.meeting_id
+    assert meeting_store.read(meeting_id, TRANSCRIPT) == recap["transcript"]
+    assert meeting_store.names(meeting_id, TRANSCRIPT_TIMING_WINDOWS) == []
+    assert meeting_store.names(meeting_id, TRANSCRIPT_TIMING) == [TRANSCRIPT_TIMING]
+    assert load_for_meeting(meeting_id, recap["transcript"]).segment_at(3.5).text.startswith("Foxtrot")
+    assert meeting_store.meta(meeting_id)["live"]["status"] == "finished"
+    assert sessions.stats()["finished"] == 1
+
+    with pytest.raises(LiveError) as error:
+        sessions.get(meeting_id)
+    assert error.value.status == 404
+    with pytest.raises(LiveError) as error:
+        session.finish()
+    assert error.value.status == 409
+
+
+def test_chunks_must_arrive_in_order(sessions):
+    session = sessions.create()
+    session.write_chunk(io.BytesIO(b"Alpha "), 0)
+
+    with pytest.raises(LiveError) as error:
+        session.write_chunk(io.BytesIO(b"opened "), 0)
+    assert (error.value.status, error.value.details) == (409, {"next_offset": 6})
+
+
+def test_idle_sessions_are_finished(sessions):
+    session = sessions.create()
+    _send(session, SENTENCES[0])
+    session.last_activity -= sessions.ttl + 1
+
+    sessions._expire_idle()
+    deadline = time.monotonic() + 10
+    while sessions.stats()["live"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert sessions.stats() == {"backend": "stub", "live": 0, "finished": 1}
+    assert meeting_store.read(session.meeting_id, TRANSCRIPT) == SENTENCES[0]
+
+
+def test_finishing_while_the_sweeper_finishes_returns_the_same_recap(sessions, monkeypatch):
+    release = threading.Event()
+    extract = live_transcription.extract_action_item_records
+
+    def slow_extract(*args):
+        release.wait(10)
+        return extract(*args)
+
+    monkeypatch.setattr(live_transcription, "extract_action_item_records", slow_extract)
+    session = sessions.create()
+    _send(session, SENTENCES[0])
+    session.last_activity -= sessions.ttl + 1
+
+    # The sweeper starts finishing the idle session just as the client ends the meeting
+    sessions._expire_idle()
+    deadline = time.monotonic() + 10
+    while not session.finished and time.monotonic() < deadline:
+        time.sleep(0.005)
+    recaps = []
+    client = threading.Thread(target=lambda: recaps.append(sessions.finish(session.meeting_id)))
+    client.start()
+    time.sleep(0.05)
+    sessions._expire_idle()
+    release.set()
+    client.join(10)
+
+    assert recaps and recaps[0]["transcript"] == SENTENCES[0]
+    assert sessions.stats() == {"backend": "stub", "live": 0, "finished": 1}
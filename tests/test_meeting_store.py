@@ -0,0 +1,45 @@
+# quickmeet-backend/tests/test_meeting_store.py
+import threading
+
+import pytest
+
+from meeting_store import MeetingStore, SUMMARY, TRANSCRIPT
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MeetingStore(str(tmp_path / "meetings"))
+
+
+def test_same_transcript_reuses_its_workspace(store):
+    meeting_id = store.for_content(TRANSCRIPT, "We shipped the release.")
+
+    assert store.for_content(TRANSCRIPT, "We shipped the release.") == meeting_id
+    assert store.read(meeting_id, TRANSCRIPT) == "We shipped the release."
+    assert store.for_content(TRANSCRIPT, "Budget review moved.") != meeting_id
+    # The same text sent as a summary belongs to another meeting
+    assert store.for_content(SUMMARY, "We shipped the release.") != meeting_id
+
+
+def test_workspace_is_created_again_once_deleted_or_changed(store):
+    meeting_id = store.for_content(TRANSCRIPT, "We shipped the release.")
+    store.write(meeting_id, TRANSCRIPT, "We shipped the release. Then we celebrated.")
+
+    changed = store.for_content(TRANSCRIPT, "We shipped the release.")
+    store.delete(changed)
+    recreated = store.for_content(TRANSCRIPT, "We shipped the release.")
+
+    assert len({meeting_id, changed, recreated}) == 3
+    assert store.read(recreated, TRANSCRIPT) == "We shipped the release."
+
+
+def test_concurrent_requests_share_one_workspace(store):
+    meeting_ids = []
+    threads = [threading.Thread(target=lambda: meeting_ids.append(store.for_content(TRANSCRIPT, "Hello.")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(meeting_ids) == 8 and len(set(meeting_ids)) == 1
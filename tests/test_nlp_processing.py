@@ -0,0 +1,44 @@
+# quickmeet-backend/tests/test_nlp_processing.py
+import pytest
+
+import nlp_processing
+from meeting_store import store as meeting_store, SUMMARY
+from summary_cache import SummaryCache
+
+TRANSCRIPT = "Alice opened the meeting. Bob will send the report by Friday."
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = SummaryCache(db_path=str(tmp_path / "summaries.db"))
+    monkeypatch.setattr(nlp_processing, "summary_cache", cache)
+
+    def no_model(*args, **kwargs):
+        raise AssertionError("the summarization model was loaded")
+
+    monkeypatch.setattr(nlp_processing, "get_model", no_model)
+    monkeypatch.setattr(nlp_processing, "summarize", no_model)
+    return cache
+
+
+def test_cached_summary_streams_without_loading_the_model(cache):
+    key = nlp_processing._summary_params(TRANSCRIPT)[0]
+    cache.put(key, "Bob sends the report.", {"total_ms": 900.0})
+    meeting_id = meeting_store.create()
+
+    events = list(nlp_processing.stream_summary(TRANSCRIPT, meeting_id))
+
+    assert [event for event, _ in events] == ["summary"]
+    data = events[0][1]
+    assert data["summary"] == "Bob sends the report."
+    assert data["timings"]["cached"] is True
+    assert data["timings"]["ttfb_ms"] >= 0
+    assert meeting_store.read(meeting_id, SUMMARY) == "Bob sends the report."
+
+
+def test_summarize_transcript_answers_from_the_cache(cache):
+    assert nlp_processing.cached_summary(TRANSCRIPT) is None
+    cache.put(nlp_processing._summary_params(TRANSCRIPT)[0], "Bob sends the report.", {})
+
+    assert nlp_processing.summarize_transcript(TRANSCRIPT) == ("Bob sends the report.", {"cached": True})
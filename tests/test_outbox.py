@@ -0,0 +1,140 @@
+# quickmeet-backend/tests/test_outbox.py
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pytest
+
+from outbox import DEAD, QUEUED, RETRYING, SENDING, SENT, Outbox
+
+RECIPIENTS = [f"member{i}@example.com" for i in range(5)]
+
+
+class FakeSES:
+    """Sends in batches of two; addresses in `failing` fail with their batch."""
+
+    def __init__(self):
+        self.failing = set()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, recipients, subject, summary, action_items, on_batch_sent=None):
+        with self.lock:
+            self.calls.append(list(recipients))
+        failed = []
+        for start in range(0, len(recipients), 2):
+            batch = recipients[start:start + 2]
+            if self.failing & set(batch):
+                failed.append({"recipients": batch, "error": "throttled"})
+            elif on_batch_sent:
+                on_batch_sent(batch, f"ses-{len(self.calls)}-{start}")
+        return {"sent": len(recipients) - sum(len(b["recipients"]) for b in failed), "failed": failed}
+
+
+@pytest.fixture
+def ses():
+    return FakeSES()
+
+
+@pytest.fixture
+def outbox(tmp_path, ses):
+    return Outbox(db_path=str(tmp_path / "outbox.db"), max_attempts=3, retry_base_seconds=0.05,
+                  poll_interval=0.01, send=ses)
+
+
+def _wait_for(outbox, message_id, *statuses, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        message = outbox.get(message_id)
+        if message["status"] in statuses:
+            return message
+        time.sleep(0.01)
+    raise AssertionError(f"message {message_id} stayed {outbox.get(message_id)['status']}")
+
+
+def test_message_is_delivered(outbox, ses):
+    message_id = outbox.enqueue(RECIPIENTS, "Weekly sync", "We shipped.", [])
+
+    message = _wait_for(outbox, message_id, SENT)
+
+    assert message["sent_count"] == 5
+    assert message["pending_recipients"] == []
+    assert len(message["message_ids"]) == 3
+    assert message["attempts"] == 1
+    assert ses.calls == [RECIPIENTS]
+
+
+def test_failed_batch_is_retried_for_its_recipients_only(outbox, ses):
+    ses.failing = {"member2@example.com"}
+    message_id = outbox.enqueue(RECIPIENTS, "Weekly sync", "We shipped.", [])
+
+    message = _wait_for(outbox, message_id, RETRYING)
+    assert message["pending_recipients"] == ["member2@example.com", "member3@example.com"]
+    assert message["sent_count"] == 3
+    assert message["last_error"] == "throttled"
+    assert message["next_attempt_at"] > time.time()
+
+    ses.failing = set()
+    message = _wait_for(outbox, message_id, SENT)
+    assert ses.calls[-1] == ["member2@example.com", "member3@example.com"]
+    assert (message["sent_count"], message["attempts"]) == (5, 2)
+
+
+def test_retries_back_off_and_dead_letter(outbox, ses):
+    ses.failing = set(RECIPIENTS)
+    message_id = outbox.enqueue(RECIPIENTS, "Weekly sync", "We shipped.", [])
+
+    message = _wait_for(outbox, message_id, DEAD)
+    assert message["attempts"] == 3
+    assert message["pending_recipients"] == RECIPIENTS
+    with closing(sqlite3.connect(outbox.db_path)) as conn:
+        created_at, updated_at = conn.execute("SELECT created_at, updated_at FROM outbox").fetchone()
+    # Waits of 0.05 s and 0.1 s between the three attempts
+    assert updated_at - created_at >= 0.15
+
+    ses.failing = set()
+    assert outbox.requeue(message_id)
+    assert not outbox.requeue(message_id)
+    assert _wait_for(outbox, message_id, SENT)["attempts"] == 1
+
+
+def test_sending_message_is_claimed_again_once_its_lease_runs_out(outbox):
+    now = time.time()
+    with closing(outbox._connect()) as conn:
+        for message_id, lease in (("expired", now - 1), ("leased", now + 600)):
+            conn.execute(
+                """INSERT INTO outbox (id, to_addresses, subject, status, next_attempt_at, created_at, updated_at)
+                   VALUES (?, '["a@example.com"]', 'Weekly sync', ?, ?, ?, ?)""",
+                (message_id, SENDING, lease, now, now),
+            )
+        row = outbox._claim(conn)
+        assert row["id"] == "expired"
+        assert outbox._claim(conn) is None
+        assert conn.execute("SELECT next_attempt_at FROM outbox WHERE id = 'expired'").fetchone()[0] > now + 60
+
+
+def test_worker_survives_database_and_unexpected_errors(outbox, monkeypatch):
+    claim = outbox._claim
+    errors = [sqlite3.DatabaseError("database disk image is malformed"), RuntimeError("boom")]
+
+    def flaky_claim(conn):
+        if errors:
+            raise errors.pop(0)
+        return claim(conn)
+
+    monkeypatch.setattr(outbox, "_claim", flaky_claim)
+    message_id = outbox.enqueue(RECIPIENTS, "Weekly sync", "We shipped.", [])
+
+    assert _wait_for(outbox, message_id, SENT)["sent_count"] == 5
+    assert errors == []
+    assert all(thread.is_alive() for thread in outbox._threads)
+
+
+def test_stats_count_messages_by_status(outbox, ses):
+    ses.failing = set(RECIPIENTS)
+    outbox.max_attempts = 1
+    message_id = outbox.enqueue(RECIPIENTS, "Weekly sync", "We shipped.", [])
+    _wait_for(outbox, message_id, DEAD)
+
+    assert outbox.stats() == {QUEUED: 0, SENDING: 0, RETRYING: 0, SENT: 0, DEAD: 1}
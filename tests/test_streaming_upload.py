@@ -0,0 +1,104 @@
+# quickmeet-backend/tests/test_streaming_upload.py
+import hashlib
+import io
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from streaming_upload import UploadError, UploadManager
+
+BUCKET = "quickmeet-uploads"
+# The smallest part S3 accepts; the chunks below are smaller, so parts span chunks
+PART_SIZE = 5 * 1024 * 1024
+CHUNK = 2 * 1024 * 1024
+DATA = os.urandom(3 * CHUNK + 12345)
+
+
+class BrokenStream:
+    """A request body whose connection drops after some bytes."""
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def read(self, n):
+        block = self.data.read(n)
+        if not block:
+            raise ConnectionResetError("client went away")
+        return block
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def _manager(s3, tmp_path):
+    # Each manager stands for one worker process sharing the database
+    return UploadManager(s3, BUCKET, db_path=str(tmp_path / "uploads.db"), part_size=PART_SIZE)
+
+
+def _send(manager, upload_id, offset):
+    return manager.get(upload_id).write_chunk(io.BytesIO(DATA[offset:offset + CHUNK]), offset)
+
+
+def test_upload_resumes_at_the_next_offset_in_another_process(s3, tmp_path):
+    first = _manager(s3, tmp_path)
+    upload = first.create("standup.mp3", expected_size=len(DATA))
+    _send(first, upload.id, 0)
+    _send(first, upload.id, CHUNK)
+    # The client's connection drops midway through the third chunk
+    with pytest.raises(ConnectionResetError):
+        first.get(upload.id).write_chunk(BrokenStream(DATA[2 * CHUNK:2 * CHUNK + 1000]), 2 * CHUNK)
+
+    # It asks another worker where to resume and sends the rest from there
+    second = _manager(s3, tmp_path)
+    status = second.get(upload.id).status()
+    assert (status["next_offset"], status["parts_uploaded"]) == (2 * CHUNK, 0)
+    _send(second, upload.id, 2 * CHUNK)
+    _send(second, upload.id, 3 * CHUNK)
+    done = second.complete(upload.id)
+
+    body = s3.get_object(Bucket=BUCKET, Key=done.key)["Body"].read()
+    assert body == DATA
+    assert done.sha256 == hashlib.sha256(DATA).hexdigest()
+    assert done.status()["parts_uploaded"] == 2
+
+
+def test_chunks_out_of_order_are_rejected(s3, tmp_path):
+    manager = _manager(s3, tmp_path)
+    upload = manager.create("standup.mp3", expected_size=len(DATA))
+
+    with pytest.raises(UploadError) as skipped:
+        _send(manager, upload.id, CHUNK)
+    _send(manager, upload.id, 0)
+    with pytest.raises(UploadError) as repeated:
+        _send(manager, upload.id, 0)
+    with pytest.raises(UploadError) as early:
+        manager.complete(upload.id)
+
+    assert (skipped.value.status, skipped.value.details) == (409, {"next_offset": 0})
+    assert (repeated.value.status, repeated.value.details) == (409, {"next_offset": CHUNK})
+    assert (early.value.status, early.value.details) == (409, {"next_offset": CHUNK})
+    # Rejected chunks leave the upload where it was
+    assert manager.get(upload.id).received_bytes == CHUNK
+
+
+def test_single_process_upload_keeps_its_running_digest(s3, tmp_path, monkeypatch):
+    manager = _manager(s3, tmp_path)
+    monkeypatch.setattr(manager, "_rehash", lambda key: pytest.fail("the object was hashed again"))
+    upload = manager.create("standup.mp3")
+    for offset in range(0, len(DATA), CHUNK):
+        _send(manager, upload.id, offset)
+
+    done = manager.complete(upload.id)
+
+    assert done.sha256 == hashlib.sha256(DATA).hexdigest()
+    assert manager.complete(upload.id).sha256 == done.sha256
+    with pytest.raises(UploadError) as excinfo:
+        _send(manager, upload.id, len(DATA))
+    assert excinfo.value.status == 409
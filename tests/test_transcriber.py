@@ -0,0 +1,139 @@
+# quickmeet-backend/tests/test_transcriber.py
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+import transcriber
+import transcription_watcher
+from transcript_cache import TranscriptCache
+from transcription_watcher import TranscriptionWatcher
+
+TEXT = "We shipped the release. Dana will check the numbers."
+
+
+def _items(text):
+    # Transcribe output items: one per word and punctuation mark, two speakers
+    items, clock, sentence = [], 0.0, 0
+    for token in text.split():
+        word = token.rstrip(".")
+        speaker = f"spk_{sentence % 2}"
+        items.append({"type": "pronunciation", "start_time": f"{clock:.2f}", "end_time": f"{clock + 0.3:.2f}",
+                      "speaker_label": speaker, "alternatives": [{"confidence": "0.99", "content": word}]})
+        clock += 0.4
+        if token.endswith("."):
+            items.append({"type": "punctuation", "speaker_label": speaker,
+                          "alternatives": [{"confidence": "0.0", "content": "."}]})
+            sentence += 1
+    return items
+
+
+class TranscribeWithOutput:
+    """moto completes Transcribe jobs but writes no output; this writes it to S3 as Transcribe would."""
+
+    def __init__(self, client, s3, text):
+        self.client = client
+        self.s3 = s3
+        self.text = text
+        self.started = []
+
+    def start_transcription_job(self, **kwargs):
+        self.started.append(kwargs)
+        results = {"transcripts": [{"transcript": self.text}], "items": _items(self.text)}
+        self.s3.put_object(Bucket=kwargs["OutputBucketName"], Key=f"{kwargs['TranscriptionJobName']}.json",
+                           Body=json.dumps({"results": results}).encode("utf-8"))
+        return self.client.start_transcription_job(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+@pytest.fixture
+def aws(monkeypatch, tmp_path):
+    # Checks every few milliseconds instead of after a second or more
+    monkeypatch.setattr(transcription_watcher, "MIN_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(transcription_watcher, "MAX_POLL_INTERVAL", 0.05)
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=transcriber.BUCKET_NAME)
+        transcribe = TranscribeWithOutput(boto3.client("transcribe", region_name="us-east-1"), s3, TEXT)
+        monkeypatch.setattr(transcriber, "s3", s3)
+        monkeypatch.setattr(transcriber, "transcribe", transcribe)
+        monkeypatch.setattr(transcriber, "watcher", TranscriptionWatcher(transcribe))
+        monkeypatch.setattr(transcriber, "transcript_cache", TranscriptCache(str(tmp_path / "transcripts")))
+        yield s3, transcribe
+
+
+def test_poll_schedule_scales_with_audio_duration():
+    short, long = transcription_watcher.PollSchedule(10), transcription_watcher.PollSchedule(3600)
+
+    assert short.first_delay < long.first_delay
+    assert short.max_wait < long.max_wait
+    intervals = [long.next_interval() for _ in range(10)]
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == long.max_interval
+
+
+def test_audio_is_uploaded_transcribed_and_cached(aws, tmp_path):
+    s3, transcribe = aws
+    audio = tmp_path / "meeting.mp3"
+    audio.write_bytes(b"not really audio" * 100)
+
+    transcript = transcriber.transcribe_audio(str(audio), original_filename="meeting.mp3")
+
+    assert transcript.text == TEXT
+    assert transcript.timed
+    assert transcript.speakers == ["spk_0", "spk_1"]
+    assert [segment.text for segment in transcript.segments] == [
+        "We shipped the release.", "Dana will check the numbers."]
+    assert len(transcribe.started) == 1
+    assert transcribe.started[0]["Settings"]["ShowSpeakerLabels"]
+    media_key = transcribe.started[0]["Media"]["MediaFileUri"].split("/", 3)[3]
+    assert s3.get_object(Bucket=transcriber.BUCKET_NAME, Key=media_key)["Body"].read() == audio.read_bytes()
+
+    # The same recording under another name is answered from the cache
+    again = tmp_path / "copy.mp3"
+    again.write_bytes(audio.read_bytes())
+    assert transcriber.transcribe_audio(str(again)).text == TEXT
+    assert len(transcribe.started) == 1
+
+
+def test_watcher_shares_one_future_per_job(aws):
+    s3, transcribe = aws
+    s3.put_object(Bucket=transcriber.BUCKET_NAME, Key="a.mp3", Body=b"audio")
+    transcriber.start_transcription_job("job-a", f"s3://{transcriber.BUCKET_NAME}/a.mp3")
+
+    first = transcriber.watcher.watch("job-a", audio_duration=1)
+    assert transcriber.watcher.watch("job-a") is first
+    job = first.result(timeout=10)
+
+    assert job["TranscriptionJobStatus"] == "COMPLETED"
+    assert transcriber.watcher.in_flight() == 0
+    assert transcriber.download_transcript(job["Transcript"]["TranscriptFileUri"]).text == TEXT
+
+
+def test_failed_job_is_reported(monkeypatch):
+    monkeypatch.setattr(transcription_watcher, "MIN_POLL_INTERVAL", 0.01)
+
+    class FailingTranscribe:
+        def get_transcription_job(self, TranscriptionJobName):
+            return {"TranscriptionJob": {"TranscriptionJobStatus": "FAILED", "FailureReason": "unsupported media"}}
+
+    future = TranscriptionWatcher(FailingTranscribe()).watch("job-b", audio_duration=0.1)
+
+    with pytest.raises(Exception, match="unsupported media"):
+        future.result(timeout=10)
+
+
+def test_job_past_its_deadline_times_out(monkeypatch):
+    monkeypatch.setattr(transcription_watcher, "MIN_POLL_INTERVAL", 0.01)
+
+    class SlowTranscribe:
+        def get_transcription_job(self, TranscriptionJobName):
+            return {"TranscriptionJob": {"TranscriptionJobStatus": "IN_PROGRESS"}}
+
+    future = TranscriptionWatcher(SlowTranscribe()).watch("job-c", audio_duration=0.1, max_wait=0.05)
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=10)
@@ -0,0 +1,99 @@
+# quickmeet-backend/tests/test_vector_index.py
+import hashlib
+import json
+import os
+
+import numpy as np
+import pytest
+
+import vector_index
+from vector_index import VectorIndex
+
+DIM = 16
+
+
+def _vector(text):
+    # A stable unit vector per text, so scores are the same in every process
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeStore:
+    def get_embeddings(self, sentences):
+        return np.stack([_vector(s) for s in sentences])
+
+
+@pytest.fixture(autouse=True)
+def embeddings(monkeypatch):
+    monkeypatch.setattr(vector_index, "store", FakeStore())
+    monkeypatch.setattr(vector_index, "encode_query", _vector)
+
+
+SENTENCES = {
+    "m1": ["We shipped the release.", "Dana will check the numbers.", "The demo is on Friday."],
+    "m2": ["Budget review moved to March.", "Sam owns the hiring plan."],
+}
+
+
+def _build(index_dir):
+    index = VectorIndex(str(index_dir))
+    for meeting_id, sentences in SENTENCES.items():
+        index.add_texts(meeting_id, "transcript", sentences, date="2026-01-05")
+    return index
+
+
+def _texts(results):
+    return [(r["text"], r["meeting_id"], r["score"]) for r in results]
+
+
+def test_appended_rows_are_found_after_reopening(tmp_path):
+    index = _build(tmp_path)
+    index.add_texts("m1", "transcript", ["Alex joins next sprint."], append=True)
+    before = {query: _texts(index.search(query, top_k=3))
+              for query in ("Alex joins next sprint.", "Sam owns the hiring plan.")}
+
+    reopened = VectorIndex(str(tmp_path))
+
+    assert {query: _texts(reopened.search(query, top_k=3)) for query in before} == before
+    assert before["Alex joins next sprint."][0][:2] == ("Alex joins next sprint.", "m1")
+    # Appending joins the current batch, so the earlier sentences stay searchable
+    assert reopened.stats()["live_rows"] == 6
+    assert len(reopened.search("The demo is on Friday.", meeting_ids=["m1"], top_k=10)) == 4
+
+
+def test_reindexing_a_meeting_replaces_its_rows(tmp_path):
+    index = _build(tmp_path)
+    assert index.add_texts("m1", "transcript", SENTENCES["m1"]) == 0
+    index.add_texts("m1", "transcript", ["Only this sentence remains."])
+
+    results = VectorIndex(str(tmp_path)).search("We shipped the release.", meeting_ids=["m1"], top_k=10)
+
+    assert [r["text"] for r in results] == ["Only this sentence remains."]
+
+
+def test_rows_a_dead_writer_left_uncommitted_are_ignored_and_overwritten(tmp_path):
+    _build(tmp_path)
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    # A writer died after writing vectors and part of its metadata, before the manifest
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(np.stack([_vector("Lost sentence."), _vector("Also lost.")]).astype(np.float16).tobytes())
+    with open(tmp_path / "meta.jsonl", "ab") as f:
+        f.write(b'{"meeting_id": "m3", "date": "2026-01-06", "source": "transcript", "text": "Lost sen')
+
+    index = VectorIndex(str(tmp_path))
+    assert index.stats()["rows"] == manifest["count"]
+    assert all(r["meeting_id"] != "m3" for r in index.search("Lost sentence.", top_k=10))
+
+    index.add_texts("m3", "transcript", ["Kept sentence."], date="2026-01-06")
+
+    reopened = VectorIndex(str(tmp_path))
+    assert _texts(reopened.search("Kept sentence.", top_k=1))[0][:2] == ("Kept sentence.", "m3")
+    # The uncommitted tail was truncated before the new rows were written
+    item_size = np.dtype(vector_index.INDEX_DTYPE).itemsize
+    assert os.path.getsize(tmp_path / "vectors.bin") == (manifest["count"] + 1) * DIM * item_size
+    with open(tmp_path / "meta.jsonl", "rb") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == manifest["count"] + 1
+    assert json.loads(lines[-1])["text"] == "Kept sentence."
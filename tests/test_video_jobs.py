@@ -0,0 +1,165 @@
+# quickmeet-backend/tests/test_video_jobs.py
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+
+import pytest
+
+import video_jobs
+from artifact_cache import ArtifactCache
+from heygen_client import HeyGenClient, HeyGenError, VideoPoller
+from heygen_mock import start_mock_server
+from video_jobs import COMPLETED, FAILED, VideoJobs, split_narration
+
+VIDEO_BYTES = 64 * 1024
+SUMMARY = "The team shipped the release. Dana will check the numbers by Friday."
+
+
+@pytest.fixture
+def heygen():
+    server = start_mock_server(render_seconds=0.05, video_bytes=VIDEO_BYTES)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def poller(heygen):
+    return VideoPoller(HeyGenClient(api_key="test", base_url=heygen.base_url), initial_interval=0.01)
+
+
+@pytest.fixture
+def jobs(poller, tmp_path, monkeypatch):
+    monkeypatch.setattr(video_jobs, "segment_cache", ArtifactCache(str(tmp_path / "segments"), ".mp4"))
+    return VideoJobs(poller.client, poller, db_path=str(tmp_path / "videos.db"), output_dir=str(tmp_path / "videos"),
+                     deadline_seconds=30)
+
+
+def _generated(server):
+    return [text for kind, text in server.requests if kind == "generate"]
+
+
+def test_split_narration_keeps_segments_short_and_whole():
+    text = " ".join(f"Point {i} was discussed at length by the team." for i in range(200))
+
+    segments = split_narration(text, max_chars=300)
+
+    assert all(len(segment) <= 300 for segment in segments)
+    assert " ".join(segments) == text
+
+
+def test_split_narration_edit_only_changes_its_segment():
+    sentences = [f"Point {i} was discussed at length by the team." for i in range(200)]
+    before = split_narration(" ".join(sentences), max_chars=300)
+    sentences[100] = "Point 100 was moved to next week."
+    after = split_narration(" ".join(sentences), max_chars=300)
+
+    assert len(set(before) - set(after)) == 1
+    assert len(set(after) - set(before)) == 1
+
+
+def test_split_narration_breaks_at_paragraphs_and_long_sentences():
+    assert split_narration("Summary.\n\nAction items:\n- Ship it") == ["Summary.", "Action items: - Ship it"]
+    assert all(len(segment) <= 20 for segment in split_narration("word " * 50, max_chars=20))
+
+
+def test_split_narration_breaks_a_long_word_without_losing_characters():
+    url = "https://example.com/" + "a" * 45
+    segments = split_narration(f"See {url} for details.", max_chars=20)
+
+    assert all(len(segment) <= 20 for segment in segments)
+    assert "".join(segments).replace(" ", "") == f"See{url}fordetails."
+
+
+def test_poller_downloads_a_completed_video(poller, heygen, tmp_path):
+    statuses = []
+    video_id = poller.client.submit(SUMMARY)
+
+    path = poller.track(video_id, deadline_seconds=10, download_to=str(tmp_path / "video.mp4"),
+                        on_update=statuses.append).result(timeout=10)
+
+    assert os.path.getsize(path) == VIDEO_BYTES
+    assert statuses[0] == "processing"
+    assert statuses[-2:] == ["completed", "downloading"]
+    assert poller.stats()["in_flight"] == 0
+
+
+def test_poller_reports_failed_and_overdue_videos(poller, heygen):
+    failed = poller.track(poller.client.submit("Please FAIL this one."), deadline_seconds=10)
+    with pytest.raises(HeyGenError, match="mock render failure"):
+        failed.result(timeout=10)
+
+    heygen.render_seconds = 60
+    overdue = poller.track(poller.client.submit(SUMMARY), deadline_seconds=0.1)
+    with pytest.raises(HeyGenError, match="deadline"):
+        overdue.result(timeout=10)
+
+
+def test_video_job_completes_and_reuses_cached_segments(jobs, heygen, tmp_path):
+    completed = []
+    output = str(tmp_path / "meeting" / "meeting_summary.mp4")
+
+    job_id = jobs.submit(SUMMARY, output_path=output, meeting_id="m1", on_complete=completed.append)
+    job = jobs.wait(job_id, timeout=10, poll_interval=0.01)
+
+    assert job["status"] == COMPLETED
+    assert (job["segments"], job["cached_segments"]) == (1, 0)
+    assert job["meeting_id"] == "m1"
+    assert completed == [output]
+    assert os.path.getsize(output) == VIDEO_BYTES
+
+    again = jobs.wait(jobs.submit(SUMMARY), timeout=10, poll_interval=0.01)
+    assert (again["status"], again["cached_segments"]) == (COMPLETED, 1)
+    assert len(_generated(heygen)) == 1
+    assert os.path.getsize(again["path"]) == VIDEO_BYTES
+
+
+def test_failed_render_fails_the_job(jobs):
+    job = jobs.wait(jobs.submit("Please FAIL this one."), timeout=10, poll_interval=0.01)
+
+    assert job["status"] == FAILED
+    assert "mock render failure" in job["error"]
+
+
+def test_submit_rejects_text_with_nothing_to_narrate(jobs):
+    with pytest.raises(ValueError):
+        jobs.submit("  \n\n ")
+
+
+@pytest.mark.skipif(not (video_jobs.FFMPEG_PATH or shutil.which("ffmpeg")), reason="ffmpeg is not installed")
+def test_long_narration_renders_segments_concurrently(jobs, heygen):
+    text = " ".join(f"Point {i} was discussed at length by the team." for i in range(100))
+
+    job = jobs.wait(jobs.submit(text), timeout=30, poll_interval=0.01)
+
+    assert job["status"] == COMPLETED, job["error"]
+    assert job["segments"] == len(split_narration(text)) > 1
+    assert len(_generated(heygen)) == job["segments"]
+
+
+def test_recover_fails_jobs_of_stopped_processes(jobs):
+    host = video_jobs.socket.gethostname()
+    now = time.time()
+    rows = [
+        ("gone", f"{host}:999999999", now),
+        ("running", video_jobs._owner(), now),
+        ("stale", "other-host:1", now - jobs.deadline_seconds - 120),
+    ]
+    with closing(jobs._connect()) as conn:
+        for job_id, owner, created_at in rows:
+            conn.execute("INSERT INTO videos (id, status, owner, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                         (job_id, "processing", owner, created_at, created_at))
+
+    assert jobs.recover() == 2
+    assert [jobs.get(job_id)["status"] for job_id, _, _ in rows] == [FAILED, "processing", FAILED]
+
+
+def test_recover_ignores_an_unreadable_database(tmp_path, poller):
+    (tmp_path / "videos.db").write_bytes(b"not a database" * 100)
+    jobs = VideoJobs(poller.client, poller, db_path=str(tmp_path / "videos.db"))
+
+    assert jobs.recover() == 0
+    with pytest.raises(sqlite3.DatabaseError):
+        jobs.get("anything")
@@ -1,10 +1,15 @@
 # quickmeet-backend/transcriber.py
-import boto3
+import json
 import time
 import os
-import requests
+import uuid
 from urllib.parse import urlparse
 from dotenv import load_dotenv
+from transcription_watcher import TranscriptionWatcher, estimate_audio_duration
+from transcript_cache import cache as transcript_cache, hash_file
+from metrics import timed
+from transcript_model import Transcript
+import aws_clients
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -12,17 +17,23 @@ load_dotenv()
 # AWS Configuration
 REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
 BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "quickmeet-files")
+# Speakers Transcribe tells apart (2-30); 0 turns speaker labelling off
+MAX_SPEAKERS = int(os.getenv("QUICKMEET_TRANSCRIBE_MAX_SPEAKERS", "10"))
 
-# AWS Clients
-transcribe = boto3.client("transcribe", region_name=REGION)
-s3 = boto3.client("s3")
+# AWS Clients, created on first use
+transcribe = aws_clients.client("transcribe", region_name=REGION)
+s3 = aws_clients.client("s3")
+
+# One poller shared by every in-flight transcription job in this process
+watcher = TranscriptionWatcher(transcribe)
 
 def upload_to_s3(local_file_path, s3_key):
     """Uploads the given file to S3 and returns the S3 URI."""
     try:
         print(f"Uploading file: {local_file_path}")
         print(f"Bucket: {BUCKET_NAME}, S3 Key: {s3_key}")
-        s3.upload_file(local_file_path, BUCKET_NAME, s3_key)
+        with timed("s3_upload"):
+            s3.upload_file(local_file_path, BUCKET_NAME, s3_key)
         print("Upload successful!")
         return f"s3://{BUCKET_NAME}/{s3_key}"
     except Exception as e:
@@ -30,111 +41,121 @@ def upload_to_s3(local_file_path, s3_key):
         raise e
 
 def start_transcription_job(job_name, media_file_uri):
-    """Starts an AWS Transcribe job."""
+    """Starts an AWS Transcribe job, with speaker labels unless MAX_SPEAKERS is 0."""
+    settings = {"ShowSpeakerLabels": True, "MaxSpeakerLabels": MAX_SPEAKERS} if MAX_SPEAKERS else {}
     response = transcribe.start_transcription_job(
         TranscriptionJobName=job_name,
         Media={"MediaFileUri": media_file_uri},
         MediaFormat="mp3",
         LanguageCode="en-US",
-        OutputBucketName=BUCKET_NAME
+        OutputBucketName=BUCKET_NAME,
+        **({"Settings": settings} if settings else {}),
     )
     return response
 
-def wait_for_transcription(job_name, initial_wait=15, max_wait=300):
-    """Polls until the transcription job is completed or fails, with an initial delay and maximum wait time."""
-    print(f"Waiting {initial_wait} seconds before checking transcription job status...")
-    time.sleep(initial_wait)
-    
-    total_wait = initial_wait
-    while total_wait < max_wait:
-        result = transcribe.get_transcription_job(TranscriptionJobName=job_name)
-        status = result["TranscriptionJob"]["TranscriptionJobStatus"]
-        if status in ["COMPLETED", "FAILED"]:
-            break
-        print("🕒 Transcription in progress... Waiting 5 seconds...")
-        time.sleep(5)
-        total_wait += 5
-
-    if status == "COMPLETED":
-        transcript_url = result["TranscriptionJob"]["Transcript"]["TranscriptFileUri"]
-        print("✅ Transcription completed!")
-        print("Transcript URL from Transcribe:", transcript_url)
-        return transcript_url
-    else:
-        print("❌ Transcription job failed or timed out after waiting", total_wait, "seconds.")
+def wait_for_transcription(job_name, audio_duration=None, max_wait=None):
+    """
+    Waits until the transcription job is completed or fails and returns the transcript URL.
+    Polling is shared with every other in-flight job and backs off on a schedule tuned
+    from the audio duration, so short clips are picked up within seconds.
+    """
+    try:
+        with timed("transcribe_wait"):
+            job = watcher.watch(job_name, audio_duration=audio_duration, max_wait=max_wait).result()
+    except Exception as e:
+        print(f"❌ {e}")
         return None
 
+    transcript_url = job["Transcript"]["TranscriptFileUri"]
+    print("✅ Transcription completed!")
+    print("Transcript URL from Transcribe:", transcript_url)
+    return transcript_url
+
+def transcript_object_key(transcript_url):
+    """Extracts the S3 object key from a Transcribe output URL."""
+    split_marker = f"{BUCKET_NAME}/"
+    if split_marker in transcript_url:
+        return transcript_url.split(split_marker)[-1]
+    return urlparse(transcript_url).path.lstrip('/')
+
 def download_transcript(transcript_url):
-    """Downloads the transcript using a pre-signed URL and extracts the transcript text without printing the full text."""
+    """
+    Reads the Transcribe output JSON straight from S3 and returns it as a Transcript:
+    the text plus per-word timings, confidences and speaker labels.
+    """
     try:
-        print("Attempting to download transcript from URL:", transcript_url)
-        # Extract object key robustly
-        split_marker = f"{BUCKET_NAME}/"
-        if split_marker in transcript_url:
-            object_key = transcript_url.split(split_marker)[-1]
-        else:
-            parsed_url = urlparse(transcript_url)
-            object_key = parsed_url.path.lstrip('/')
-        print("Extracted object key:", object_key)
-        
-        # Wait a bit to ensure the file is available in S3
-        print("Waiting 10 seconds before generating pre-signed URL...")
-        time.sleep(10)
-
-        presigned_url = s3.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': BUCKET_NAME, 'Key': object_key},
-            ExpiresIn=3600  # URL valid for 1 hour
-        )
-        print("Generated presigned URL:", presigned_url)
-        
-        response = requests.get(presigned_url)
-        print("GET response status code:", response.status_code)
-        if response.status_code == 200:
-            transcript_data = response.json()
-            transcript_text = transcript_data["results"]["transcripts"][0]["transcript"]
-            print("Downloaded transcript successfully. Transcript length:", len(transcript_text))
-            return transcript_text
-        else:
-            print(f"❌ Failed to download transcript. HTTP {response.status_code}")
-            return None
+        object_key = transcript_object_key(transcript_url)
+        print("Reading transcript object:", object_key)
+
+        # S3 is read-after-write consistent, so the output is readable as soon as the job is COMPLETED
+        with timed("transcript_download"):
+            response = s3.get_object(Bucket=BUCKET_NAME, Key=object_key)
+            transcript_data = json.loads(response["Body"].read())
+        transcript = Transcript.from_transcribe(transcript_data)
+        print("Downloaded transcript successfully. Transcript length:", len(transcript.text))
+        return transcript
     except Exception as e:
         print(f"❌ Error fetching transcript: {e}")
         return None
 
-def transcribe_audio(local_audio_path):
+def transcribe_audio(local_audio_path, audio_hash=None, original_filename=None):
     """
-    Handles the full transcription process.
-    If a transcript already exists for this file, load and return it.
-    Otherwise, call AWS Transcribe, then save the transcript to a file.
+    Handles the full transcription process and returns a Transcript.
+    Transcripts are cached by the SHA-256 of the audio content, so the same recording
+    uploaded again (under any name) is answered from the cache without touching S3.
+    Otherwise, upload the file and transcribe it with transcribe_s3_audio().
     """
-    transcript_file = os.path.splitext(local_audio_path)[0] + ".txt"
-    if os.path.exists(transcript_file):
-        print("Transcript file already exists. Using saved transcript.")
-        with open(transcript_file, "r", encoding="utf-8") as f:
-            return f.read()
-
-    file_name = os.path.basename(local_audio_path)
-    s3_uri = upload_to_s3(local_audio_path, file_name)
+    # Callers that pass audio_hash have already looked it up in the cache
+    if not audio_hash:
+        audio_hash = hash_file(local_audio_path)
+        cached = transcript_cache.get(audio_hash)
+        if cached:
+            print("Transcript already cached for this audio. Using saved transcript.")
+            return Transcript.from_cache_entry(cached)
+
+    # Key the S3 object by content so different files with the same name never collide
+    s3_key = audio_hash + os.path.splitext(local_audio_path)[1]
+    s3_uri = upload_to_s3(local_audio_path, s3_key)
     if not s3_uri:
         print("❌ Upload to S3 failed.")
         return None
 
-    job_name = f"QuickMeetTranscription_{int(time.time())}"
+    return transcribe_s3_audio(
+        s3_uri,
+        audio_hash,
+        audio_duration=estimate_audio_duration(local_audio_path),
+        filename=original_filename or os.path.basename(local_audio_path),
+        size_bytes=os.path.getsize(local_audio_path),
+    )
+
+def transcribe_s3_audio(s3_uri, audio_hash, audio_duration=None, **metadata):
+    """
+    Transcribes audio that is already in S3 (e.g. from a streaming upload)
+    and stores the transcript in the cache under audio_hash. Returns a Transcript.
+    """
+    # Job names must be unique; the same audio may be transcribed twice in one second
+    job_name = f"QuickMeetTranscription_{audio_hash[:16]}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
     print(f"🚀 Starting transcription job: {job_name}")
     start_transcription_job(job_name, s3_uri)
 
     print("⏳ Waiting for transcription to complete...")
-    transcript_url = wait_for_transcription(job_name)
+    transcript_url = wait_for_transcription(job_name, audio_duration=audio_duration)
     if transcript_url:
-        transcript_text = download_transcript(transcript_url)
-        if transcript_text:
-            with open(transcript_file, "w", encoding="utf-8") as f:
-                f.write(transcript_text)
-            return transcript_text
+        transcript = download_transcript(transcript_url)
+        if transcript and transcript.text:
+            transcript_cache.put(
+                audio_hash,
+                transcript.text,
+                audio_duration=audio_duration,
+                job_name=job_name,
+                s3_uri=s3_uri,
+                **transcript.cache_fields(),
+                **metadata,
+            )
+            return transcript
         else:
             print("❌ Error fetching transcript.")
             return None
     else:
         print("❌ Error processing transcription.")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,168 @@
+# quickmeet-backend/transcript_cache.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_CACHE_DIR = os.getenv("QUICKMEET_TRANSCRIPT_CACHE_DIR", os.path.join("cache", "transcripts"))
+# Eviction policy: entries beyond any of these limits are dropped, least recently used first (0 disables a limit)
+MAX_ENTRIES = int(os.getenv("QUICKMEET_TRANSCRIPT_CACHE_MAX_ENTRIES", "5000"))
+MAX_BYTES = int(os.getenv("QUICKMEET_TRANSCRIPT_CACHE_MAX_MB", "512")) * 1024 * 1024
+MAX_AGE_SECONDS = int(os.getenv("QUICKMEET_TRANSCRIPT_CACHE_MAX_AGE_DAYS", "90")) * 24 * 3600
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def save_and_hash(stream, directory, suffix="", chunk_size=CHUNK_SIZE):
+    """
+    Copies a binary stream into directory in chunks while computing its SHA-256.
+    The file is stored content-addressed as <sha256><suffix> once complete.
+    Returns (hex digest, bytes written, path).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        path = os.path.join(directory, digest.hexdigest() + suffix)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return digest.hexdigest(), size, path
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """Streams a file through SHA-256 and returns the hex digest."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Content-addressed transcript cache: one JSON file per audio SHA-256 holding the
+    transcript and its metadata. File mtimes track last use for LRU eviction.
+    """
+
+    def __init__(self, cache_dir=TRANSCRIPT_CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES,
+                 max_age_seconds=MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, audio_hash):
+        return os.path.join(self.cache_dir, f"{audio_hash}.json")
+
+    def get(self, audio_hash):
+        """Returns the cached entry ({"transcript", "sha256", ...}) or None."""
+        path = self._path(audio_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self.max_age_seconds and time.time() - entry.get("created_at", 0) > self.max_age_seconds:
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        os.utime(path)  # mark as recently used
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, audio_hash, transcript, **metadata):
+        """Stores a transcript under the audio hash, then applies the eviction policy."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {"sha256": audio_hash, "transcript": transcript, "created_at": time.time(), **metadata}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(audio_hash))
+        self.evict()
+        return entry
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            with self._lock:
+                self.evictions += 1
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Drops expired entries, then least recently used ones until under the count and size limits."""
+        entries = sorted(self._entries())
+        now = time.time()
+        if self.max_age_seconds:
+            # mtime is bumped on every hit, so this drops entries unused for max_age_seconds;
+            # get() separately enforces the age of the transcript itself
+            expired = [e for e in entries if now - e[0] > self.max_age_seconds]
+            for _, _, path in expired:
+                self._remove(path)
+            entries = entries[len(expired):]
+        total = sum(size for _, size, _ in entries)
+        while entries and ((self.max_entries and len(entries) > self.max_entries)
+                           or (self.max_bytes and total > self.max_bytes)):
+            _, size, path = entries.pop(0)
+            total -= size
+            self._remove(path)
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(entries),
+            "size_mb": round(sum(size for _, size, _ in entries) / (1024 * 1024), 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+# Shared cache for the whole process
+cache = TranscriptCache()
@@ -0,0 +1,422 @@
+# quickmeet-backend/transcript_model.py
+"""
+Timestamped, speaker-labelled transcripts.
+
+Transcribe returns one item per word (and per punctuation mark) with its time, confidence
+and speaker. Transcript keeps the flat text every other stage works on, plus one NumPy
+column per word attribute:
+
+  word_start, word_end - character span of the word in text (int32)
+  start_ms, end_ms     - position in the audio in milliseconds (int32)
+  speaker              - index into speakers, -1 when unlabelled (int16)
+  confidence           - recognition confidence (float16)
+
+Consecutive words of one speaker are grouped into segments, split at sentence ends;
+segment_words holds the first word of each. Segment objects are built on first use,
+and lookups by audio time or text offset are binary searches over the columns.
+
+TranscriptBuilder assembles a transcript from items that arrive in order, as they do
+from Transcribe Streaming during a live meeting. The timing of each window of a live
+meeting is stored on its own, and the windows are combined when the meeting is read.
+"""
+import base64
+import hashlib
+import io
+import logging
+import math
+
+import numpy as np
+
+from meeting_store import store as meeting_store, TRANSCRIPT_TIMING, TRANSCRIPT_TIMING_WINDOW, TRANSCRIPT_TIMING_WINDOWS
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END = frozenset(".?!")
+
+
+class Segment:
+    """A run of words by one speaker, up to the end of a sentence."""
+
+    __slots__ = ("index", "speaker", "start", "end", "char_start", "char_end", "text")
+
+    def __init__(self, index, speaker, start, end, char_start, char_end, text):
+        self.index = index
+        self.speaker = speaker
+        self.start = start
+        self.end = end
+        self.char_start = char_start
+        self.char_end = char_end
+        self.text = text
+
+    def to_dict(self):
+        return {"index": self.index, "speaker": self.speaker, "start": self.start, "end": self.end, "text": self.text}
+
+    def __repr__(self):
+        return f"<Segment {self.index} {self.speaker} {self.start:.2f}-{self.end:.2f}s {self.text[:40]!r}>"
+
+
+def _text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _align(text, contents):
+    """Character offsets of each word in text, searched in order; None if a word is missing."""
+    starts = np.empty(len(contents), dtype=np.int32)
+    cursor = 0
+    for i, content in enumerate(contents):
+        position = text.find(content, cursor)
+        if position < 0:
+            return None
+        starts[i] = position
+        cursor = position + len(content)
+    return starts
+
+
+def _rebuild_text(items):
+    """Joins Transcribe items the way it builds the transcript: words spaced, punctuation attached."""
+    parts, starts = [], []
+    length = 0
+    for item in items:
+        content = item["alternatives"][0]["content"]
+        if item.get("type") == "pronunciation":
+            if parts:
+                parts.append(" ")
+                length += 1
+            starts.append(length)
+        parts.append(content)
+        length += len(content)
+    return "".join(parts), np.array(starts, dtype=np.int32)
+
+
+class Transcript:
+    """Transcript text with per-word timing, speaker and confidence columns."""
+
+    __slots__ = ("text", "speakers", "word_start", "word_end", "start_ms", "end_ms", "speaker", "confidence",
+                 "segment_words", "_segment_start_ms", "_segment_char_start", "_segments")
+
+    def __init__(self, text, speakers=(), word_start=(), word_end=(), start_ms=(), end_ms=(), speaker=(),
+                 confidence=(), segment_words=None):
+        self.text = text
+        self.speakers = list(speakers)
+        self.word_start = np.asarray(word_start, dtype=np.int32)
+        self.word_end = np.asarray(word_end, dtype=np.int32)
+        self.start_ms = np.asarray(start_ms, dtype=np.int32)
+        self.end_ms = np.asarray(end_ms, dtype=np.int32)
+        self.speaker = np.asarray(speaker, dtype=np.int16)
+        self.confidence = np.asarray(confidence, dtype=np.float16)
+        self.segment_words = (self._segment_boundaries() if segment_words is None
+                              else np.asarray(segment_words, dtype=np.int32))
+        # Sorted keys for the binary searches in segment_at() and segment_for_offset(). Searches
+        # pass np.int32 keys: a Python int would make NumPy convert the whole array on every call
+        self._segment_start_ms = self.start_ms[self.segment_words]
+        self._segment_char_start = self.word_start[self.segment_words]
+        self._segments = None
+
+    # --- construction ---------------------------------------------------
+
+    @classmethod
+    def from_text(cls, text):
+        """A transcript without timing, e.g. one pasted by a client."""
+        return cls(text)
+
+    @classmethod
+    def from_transcribe(cls, data):
+        """Builds a transcript from Amazon Transcribe's output JSON."""
+        results = data["results"]
+        text = results["transcripts"][0]["transcript"]
+        items = results.get("items") or []
+        words = [item for item in items if item.get("type") == "pronunciation"]
+        if not words:
+            return cls(text)
+
+        # Recent outputs label every item; older ones only list them under speaker_labels
+        labels_by_start = {
+            item["start_time"]: item["speaker_label"]
+            for segment in (results.get("speaker_labels") or {}).get("segments", [])
+            for item in segment.get("items", [])
+        }
+        speakers, speaker_index = [], {}
+        speaker_column = np.full(len(words), -1, dtype=np.int16)
+        for i, item in enumerate(words):
+            label = item.get("speaker_label") or labels_by_start.get(item.get("start_time"))
+            if label is not None:
+                if label not in speaker_index:
+                    speaker_index[label] = len(speakers)
+                    speakers.append(label)
+                speaker_column[i] = speaker_index[label]
+
+        contents = [item["alternatives"][0]["content"] for item in words]
+        word_start = _align(text, contents)
+        if word_start is None:
+            # The words do not match the transcript string (e.g. it was redacted); use the items' own text
+            logger.warning("Transcript items do not match the transcript text; rebuilding it from the items")
+            text, word_start = _rebuild_text(items)
+        word_end = word_start + np.fromiter(map(len, contents), dtype=np.int32, count=len(contents))
+
+        return cls(
+            text,
+            speakers,
+            word_start,
+            word_end,
+            start_ms=[round(float(item.get("start_time", 0)) * 1000) for item in words],
+            end_ms=[round(float(item.get("end_time", 0)) * 1000) for item in words],
+            speaker=speaker_column,
+            confidence=[float(item["alternatives"][0].get("confidence") or 0) for item in words],
+        )
+
+    def _segment_boundaries(self):
+        count = len(self.word_start)
+        if not count:
+            return np.empty(0, dtype=np.int32)
+        text = self.text
+        ends_sentence = np.fromiter((text[end:end + 1] in SENTENCE_END for end in self.word_end[:-1]),
+                                    dtype=bool, count=count - 1)
+        changes = (self.speaker[1:] != self.speaker[:-1]) | ends_sentence
+        return np.flatnonzero(np.concatenate([[True], changes])).astype(np.int32)
+
+    # --- access ---------------------------------------------------------
+
+    @property
+    def timed(self):
+        """True when word timings are available."""
+        return len(self.word_start) > 0
+
+    def _speaker_label(self, word):
+        index = int(self.speaker[word])
+        return self.speakers[index] if index >= 0 else None
+
+    def _segment(self, i):
+        first = int(self.segment_words[i])
+        last = int(self.segment_words[i + 1]) if i + 1 < len(self.segment_words) else len(self.word_start)
+        char_start = int(self.word_start[first])
+        # Up to the next segment's first word, so trailing punctuation is kept
+        limit = int(self.word_start[last]) if last < len(self.word_start) else len(self.text)
+        text = self.text[char_start:limit].rstrip()
+        return Segment(i, self._speaker_label(first), int(self.start_ms[first]) / 1000,
+                       int(self.end_ms[last - 1]) / 1000, char_start, char_start + len(text), text)
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            self._segments = [self._segment(i) for i in range(len(self.segment_words))]
+        return self._segments
+
+    def segment(self, i):
+        """Segment i, without building the others."""
+        return self._segments[i] if self._segments is not None else self._segment(i)
+
+    def segment_at(self, seconds):
+        """The segment being spoken at seconds (the previous one during a pause), or None before the first."""
+        if not self.timed:
+            return None
+        i = int(np.searchsorted(self._segment_start_ms, np.int32(math.floor(seconds * 1000)), side="right")) - 1
+        return self.segment(i) if i >= 0 else None
+
+    def segment_for_offset(self, offset):
+        """The segment holding the character at offset in text, or None before the first word."""
+        if not self.timed:
+            return None
+        i = int(np.searchsorted(self._segment_char_start, np.int32(offset), side="right")) - 1
+        return self.segment(i) if i >= 0 else None
+
+    def locate(self, char_start, char_end):
+        """
+        Audio position of the words overlapping text[char_start:char_end], as
+        {"audio_start", "audio_end", "speaker"} (seconds; speaker of the first word),
+        or None when the span covers no timed word.
+        """
+        if not self.timed:
+            return None
+        first = int(np.searchsorted(self.word_end, np.int32(char_start), side="right"))
+        last = int(np.searchsorted(self.word_start, np.int32(char_end), side="left"))
+        if first >= last:
+            return None
+        return {
+            "audio_start": int(self.start_ms[first]) / 1000,
+            "audio_end": int(self.end_ms[last - 1]) / 1000,
+            "speaker": self._speaker_label(first),
+        }
+
+    def to_dict(self):
+        return {"speakers": self.speakers, "segments": [segment.to_dict() for segment in self.segments]}
+
+    # --- persistence ----------------------------------------------------
+
+    def to_bytes(self):
+        """The timing columns as a compressed .npz; the text itself is stored separately."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            text_sha256=np.array(_text_hash(self.text)),
+            speakers=np.array(self.speakers, dtype=str),
+            word_start=self.word_start,
+            word_end=self.word_end,
+            start_ms=self.start_ms,
+            end_ms=self.end_ms,
+            speaker=self.speaker,
+            confidence=self.confidence,
+            segment_words=self.segment_words,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data, text):
+        """Reverses to_bytes(); returns an untimed transcript when the columns belong to other text."""
+        with np.load(io.BytesIO(data)) as columns:
+            if str(columns["text_sha256"]) != _text_hash(text):
+                return cls(text)
+            return cls(
+                text,
+                [str(label) for label in columns["speakers"]],
+                columns["word_start"],
+                columns["word_end"],
+                columns["start_ms"],
+                columns["end_ms"],
+                columns["speaker"],
+                columns["confidence"],
+                segment_words=columns["segment_words"],
+            )
+
+    def cache_fields(self):
+        """Extra fields for the transcript cache entry, so cache hits keep the timing."""
+        return {"timing": base64.b64encode(self.to_bytes()).decode("ascii")} if self.timed else {}
+
+    @classmethod
+    def from_cache_entry(cls, entry):
+        timing = entry.get("timing")
+        if not timing:
+            return cls(entry["transcript"])
+        return cls.from_bytes(base64.b64decode(timing), entry["transcript"])
+
+
+class TranscriptBuilder:
+    """
+    Appends Transcribe items (in the output JSON's item format) to a growing transcript.
+    Words are spaced and punctuation attached, as in Transcribe's own transcript string;
+    build() returns a Transcript of everything added so far.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self.length = 0
+        self.speakers = []
+        self._speaker_index = {}
+        self._columns = {name: [] for name in ("word_start", "word_end", "start_ms", "end_ms", "speaker",
+                                               "confidence")}
+
+    def add_items(self, items):
+        columns = self._columns
+        for item in items:
+            content = item["alternatives"][0]["content"]
+            if item.get("type") == "pronunciation":
+                if self.length:
+                    self._parts.append(" ")
+                    self.length += 1
+                label = item.get("speaker_label")
+                if label is not None and label not in self._speaker_index:
+                    self._speaker_index[label] = len(self.speakers)
+                    self.speakers.append(label)
+                columns["word_start"].append(self.length)
+                columns["word_end"].append(self.length + len(content))
+                columns["start_ms"].append(round(float(item.get("start_time", 0)) * 1000))
+                columns["end_ms"].append(round(float(item.get("end_time", 0)) * 1000))
+                columns["speaker"].append(self._speaker_index[label] if label is not None else -1)
+                columns["confidence"].append(float(item["alternatives"][0].get("confidence") or 0))
+            self._parts.append(content)
+            self.length += len(content)
+
+    @property
+    def text(self):
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    @property
+    def words(self):
+        return len(self._columns["word_start"])
+
+    @property
+    def end_ms(self):
+        """Audio position of the end of the last word, in milliseconds."""
+        return self._columns["end_ms"][-1] if self._columns["end_ms"] else 0
+
+    def build(self, first_word=0, char_start=0):
+        """
+        A Transcript of everything added so far, or only of the words from first_word on
+        and the text from char_start on (a window; its offsets count from char_start).
+        """
+        columns = {name: column[first_word:] if first_word else column for name, column in self._columns.items()}
+        word_start = np.asarray(columns["word_start"], dtype=np.int32) - char_start
+        word_end = np.asarray(columns["word_end"], dtype=np.int32) - char_start
+        return Transcript(self.text[char_start:] if char_start else self.text, self.speakers, word_start, word_end,
+                          columns["start_ms"], columns["end_ms"], columns["speaker"], columns["confidence"])
+
+
+def save_for_meeting(meeting_id, transcript):
+    """Stores the timing columns next to the meeting's transcript text (when there are any)."""
+    if transcript.timed:
+        meeting_store.write(meeting_id, TRANSCRIPT_TIMING, transcript.to_bytes())
+
+
+def save_window_for_meeting(meeting_id, window, char_start, number):
+    """
+    Stores the timing of window number of a live meeting, where window is a Transcript of
+    the text added from char_start on (see TranscriptBuilder.build), without rewriting
+    the earlier windows.
+    """
+    if not window.timed:
+        return
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        char_start=np.int64(char_start),
+        text_sha256=np.array(_text_hash(window.text)),
+        text_length=np.int64(len(window.text)),
+        speakers=np.array(window.speakers, dtype=str),
+        word_start=window.word_start + char_start,
+        word_end=window.word_end + char_start,
+        start_ms=window.start_ms,
+        end_ms=window.end_ms,
+        speaker=window.speaker,
+        confidence=window.confidence,
+    )
+    meeting_store.write(meeting_id, TRANSCRIPT_TIMING_WINDOW.format(number), buffer.getvalue(), record=False)
+
+
+def remove_windows_for_meeting(meeting_id):
+    """Deletes the per-window timing once the whole transcript's timing is stored."""
+    for name in meeting_store.names(meeting_id, TRANSCRIPT_TIMING_WINDOWS):
+        meeting_store.remove(meeting_id, name)
+
+
+def _load_windows(meeting_id, text):
+    names = ("word_start", "word_end", "start_ms", "end_ms", "speaker", "confidence")
+    columns, speakers = {name: [] for name in names}, []
+    for name in meeting_store.names(meeting_id, TRANSCRIPT_TIMING_WINDOWS):
+        try:
+            with open(meeting_store.path(meeting_id, name), "rb") as f, np.load(f) as window:
+                start = int(window["char_start"])
+                if str(window["text_sha256"]) != _text_hash(text[start:start + int(window["text_length"])]):
+                    return Transcript(text)
+                speakers = [str(label) for label in window["speakers"]]
+                for column in names:
+                    columns[column].append(window[column])
+        except FileNotFoundError:
+            # The meeting ended meanwhile and the windows were replaced by the whole timing
+            return load_for_meeting(meeting_id, text)
+    if not columns["word_start"]:
+        return Transcript(text)
+    return Transcript(text, speakers, *(np.concatenate(columns[name]) for name in names))
+
+
+def load_for_meeting(meeting_id, text):
+    """
+    Returns the meeting's transcript with timing when it was stored for this text, else
+    untimed. While a live meeting runs, the timing is combined from its windows.
+    """
+    try:
+        with open(meeting_store.path(meeting_id, TRANSCRIPT_TIMING), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return _load_windows(meeting_id, text)
+    return Transcript.from_bytes(data, text)
@@ -0,0 +1,155 @@
+# quickmeet-backend/transcription_watcher.py
+import heapq
+import logging
+import os
+import threading
+import time
+import wave
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Assumed bitrate when the duration of a compressed file cannot be read directly
+DEFAULT_BITRATE_KBPS = int(os.getenv("QUICKMEET_DEFAULT_BITRATE_KBPS", "128"))
+# Roughly how long Transcribe takes per second of audio; sets the first check and the deadline
+EXPECTED_REALTIME_RATIO = float(os.getenv("QUICKMEET_TRANSCRIBE_REALTIME_RATIO", "0.5"))
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 15.0
+BACKOFF_FACTOR = 1.5
+
+
+def estimate_audio_duration(path):
+    """
+    Returns the duration of an audio file in seconds.
+    WAV headers are read exactly; other formats are estimated from size and DEFAULT_BITRATE_KBPS.
+    """
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError, OSError):
+        pass
+    try:
+        return estimate_duration_from_size(os.path.getsize(path))
+    except OSError:
+        return None
+
+
+def estimate_duration_from_size(size_bytes, bitrate_kbps=DEFAULT_BITRATE_KBPS):
+    """Estimates the duration of compressed audio from its size."""
+    return size_bytes * 8 / (bitrate_kbps * 1000)
+
+
+class PollSchedule:
+    """
+    Backoff tuned from the audio duration: the first check lands shortly before the job is
+    expected to finish, later checks back off geometrically, and the deadline scales with length.
+    """
+
+    def __init__(self, audio_duration=None, max_wait=None):
+        expected = (audio_duration or 60) * EXPECTED_REALTIME_RATIO
+        self.first_delay = min(max(MIN_POLL_INTERVAL, expected * 0.5), 30.0)
+        self.interval = min(max(MIN_POLL_INTERVAL, expected * 0.05), MAX_POLL_INTERVAL)
+        self.max_interval = min(max(2.0, expected * 0.2), MAX_POLL_INTERVAL)
+        self.max_wait = max_wait or max(300.0, expected * 4 + 60)
+
+    def next_interval(self):
+        interval = self.interval
+        self.interval = min(self.interval * BACKOFF_FACTOR, self.max_interval)
+        return interval
+
+
+class _WatchedJob:
+    __slots__ = ("job_name", "future", "schedule", "deadline", "checks")
+
+    def __init__(self, job_name, schedule):
+        self.job_name = job_name
+        self.future = Future()
+        self.schedule = schedule
+        self.deadline = time.monotonic() + schedule.max_wait
+        self.checks = 0
+
+
+class TranscriptionWatcher:
+    """
+    One background thread polls every in-flight Transcribe job on its own schedule.
+    watch() returns a Future resolved with the job description once it is COMPLETED.
+    """
+
+    def __init__(self, transcribe_client, clock=time.monotonic):
+        self.transcribe = transcribe_client
+        self._clock = clock
+        self._heap = []
+        self._jobs = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def watch(self, job_name, audio_duration=None, max_wait=None):
+        """Starts tracking a job. Watching the same job twice returns the same future."""
+        with self._cond:
+            job = self._jobs.get(job_name)
+            if job is not None:
+                return job.future
+            job = _WatchedJob(job_name, PollSchedule(audio_duration, max_wait))
+            self._jobs[job_name] = job
+            heapq.heappush(self._heap, (self._clock() + job.schedule.first_delay, job_name))
+            self._ensure_thread()
+            self._cond.notify()
+        logger.info(f"Watching {job_name}: first check in {job.schedule.first_delay:.1f}s, "
+                    f"deadline {job.schedule.max_wait:.0f}s")
+        return job.future
+
+    def in_flight(self):
+        with self._cond:
+            return len(self._jobs)
+
+    def _ensure_thread(self):
+        # Started lazily so forked server workers each run their own poller
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="transcription-watcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                due_at, job_name = self._heap[0]
+                delay = due_at - self._clock()
+                if delay > 0:
+                    # Wakes early if a job with an earlier check is added
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                job = self._jobs.get(job_name)
+            if job is not None:
+                self._check(job)
+
+    def _check(self, job):
+        job.checks += 1
+        try:
+            result = self.transcribe.get_transcription_job(TranscriptionJobName=job.job_name)
+            status = result["TranscriptionJob"]["TranscriptionJobStatus"]
+        except Exception as e:
+            logger.warning(f"Status check for {job.job_name} failed: {e}")
+            result, status = None, None
+
+        if status == "COMPLETED":
+            self._finish(job, result=result["TranscriptionJob"])
+        elif status == "FAILED":
+            reason = result["TranscriptionJob"].get("FailureReason", "unknown reason")
+            self._finish(job, error=Exception(f"Transcription job {job.job_name} failed: {reason}"))
+        elif self._clock() >= job.deadline:
+            self._finish(job, error=TimeoutError(
+                f"Transcription job {job.job_name} did not finish within {job.schedule.max_wait:.0f} seconds"))
+        else:
+            with self._cond:
+                heapq.heappush(self._heap, (self._clock() + job.schedule.next_interval(), job.job_name))
+
+    def _finish(self, job, result=None, error=None):
+        with self._cond:
+            self._jobs.pop(job.job_name, None)
+        logger.info(f"{job.job_name} finished after {job.checks} status checks")
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
@@ -0,0 +1,365 @@
+# quickmeet-backend/vector_index.py
+import datetime
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from embedding_store import store, encode_query
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.getenv("QUICKMEET_INDEX_DIR", "index")
+# float16 halves the on-disk size; scores are accumulated in float32 either way
+INDEX_DTYPE = os.getenv("QUICKMEET_INDEX_DTYPE", "float16")
+# Rows scored per NumPy block, bounding memory per query regardless of corpus size
+BLOCK_ROWS = int(os.getenv("QUICKMEET_INDEX_BLOCK_ROWS", "65536"))
+# Default number of IVF partitions probed per query once the index is partitioned
+IVF_NPROBE = int(os.getenv("QUICKMEET_INDEX_NPROBE", "8"))
+# Most results one search may ask for
+MAX_TOP_K = int(os.getenv("QUICKMEET_SEARCH_MAX_TOP_K", "100"))
+
+SOURCES = ("transcript", "summary", "action_items")
+# Optional per-row fields returned with search results (set for timed transcript sentences)
+RESULT_EXTRAS = ("audio_start", "audio_end", "speaker")
+
+
+class VectorIndex:
+    """
+    Persistent vector index over every processed meeting.
+
+    Layout in index_dir:
+      vectors.bin   - row-major (count, dim) matrix, memory-mapped for search
+      meta.jsonl    - one metadata line per row (meeting_id, date, source, text, batch, and
+                      audio_start/audio_end/speaker for timed transcript sentences)
+      manifest.json - dim, dtype, committed row count and metadata length; written last,
+                      so it is the commit point
+      ivf.npz       - optional IVF centroids and per-row partition assignments
+
+    Re-indexing a (meeting_id, source) pair appends a new batch; earlier batches for
+    the same pair are ignored at search time, so the files stay append-only. Rows added
+    with append=True join the pair's current batch instead (e.g. the windows of a live
+    transcript), so earlier sentences are not encoded again.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR, dtype=INDEX_DTYPE, block_rows=BLOCK_ROWS):
+        self.index_dir = index_dir
+        self.dtype = np.dtype(dtype)
+        self.block_rows = block_rows
+        self._lock = threading.RLock()
+        self._loaded_count = -1
+        self._meta_bytes = 0
+        self._offsets = None
+        self._vectors = None
+        self._live = None
+        self._meeting_ids = None
+        self._dates = None
+        self._sources = None
+        self._latest_batch = {}
+        self._batch_hashes = {}
+        # (meeting_id, source) -> [start, stop) row ranges of the pair's current batch
+        self._live_ranges = {}
+        self._ivf_centroids = None
+        self._ivf_assign = None
+
+    # --- storage -------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    @contextmanager
+    def _file_lock(self):
+        # Serialises writers across processes (e.g. several gunicorn workers)
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._path(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self):
+        try:
+            with open(self._path("manifest.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"dim": None, "dtype": self.dtype.name, "count": 0}
+
+    def _write_manifest(self, manifest):
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path("manifest.json"))
+
+    def _refresh(self):
+        """
+        Picks up rows committed by other writers: reads new metadata lines and remaps the
+        vectors. Only the fields searches filter on are kept in memory, with each row's
+        offset in meta.jsonl; the text of a row is read from there when a search returns it.
+        """
+        manifest = self._read_manifest()
+        count = manifest["count"]
+        if count == self._loaded_count:
+            return
+        self.dtype = np.dtype(manifest.get("dtype", self.dtype.name))
+
+        if count < self._loaded_count or self._loaded_count < 0:
+            self._meta_bytes, self._latest_batch, self._batch_hashes, self._live_ranges = 0, {}, {}, {}
+            self._offsets = np.empty(0, dtype=np.int64)
+            self._live = np.empty(0, dtype=bool)
+            self._meeting_ids, self._dates, self._sources = (np.empty(0, dtype=object) for _ in range(3))
+        first = len(self._offsets)
+        new_rows, offsets = [], []
+        if count > first:
+            with open(self._path("meta.jsonl"), "rb") as f:
+                f.seek(self._meta_bytes)
+                while first + len(new_rows) < count:
+                    line = f.readline()
+                    offsets.append(self._meta_bytes)
+                    self._meta_bytes += len(line)
+                    new_rows.append(json.loads(line))
+
+        # Only the new rows and the rows of batches they replace change the live mask
+        self._live = np.concatenate([self._live, np.ones(len(new_rows), dtype=bool)])
+        for i, row in enumerate(new_rows, first):
+            pair = (row["meeting_id"], row["source"])
+            if self._latest_batch.get(pair) != row["batch"]:
+                for start, stop in self._live_ranges.pop(pair, ()):
+                    self._live[start:stop] = False
+                self._latest_batch[pair] = row["batch"]
+            ranges = self._live_ranges.setdefault(pair, [])
+            if ranges and ranges[-1][1] == i:
+                ranges[-1][1] = i + 1
+            else:
+                ranges.append([i, i + 1])
+            if "hash" in row:
+                self._batch_hashes[pair] = row["hash"]
+        self._offsets = np.concatenate([self._offsets, np.array(offsets, dtype=np.int64)])
+        self._meeting_ids = np.concatenate([self._meeting_ids, np.array([r["meeting_id"] for r in new_rows], dtype=object)])
+        self._dates = np.concatenate([self._dates, np.array([r["date"] for r in new_rows], dtype=object)])
+        self._sources = np.concatenate([self._sources, np.array([r["source"] for r in new_rows], dtype=object)])
+        self._vectors = (
+            np.memmap(self._path("vectors.bin"), dtype=self.dtype, mode="r", shape=(count, manifest["dim"]))
+            if count else None
+        )
+
+        self._ivf_centroids, self._ivf_assign = None, None
+        ivf_path = self._path("ivf.npz")
+        if count and os.path.exists(ivf_path):
+            with np.load(ivf_path) as ivf:
+                centroids, assign = ivf["centroids"], ivf["assign"]
+            if len(assign) < count:
+                # Rows added after the partitioning was built go to their nearest centroid
+                tail = np.asarray(self._vectors[len(assign):], dtype=np.float32)
+                assign = np.concatenate([assign, np.argmax(tail @ centroids.T, axis=1).astype(np.int32)])
+            self._ivf_centroids, self._ivf_assign = centroids, assign
+        self._loaded_count = count
+
+    # --- indexing ------------------------------------------------------
+
+    def add_texts(self, meeting_id, source, sentences, date=None, extras=None, append=False):
+        """
+        Indexes sentences for one (meeting_id, source) pair, replacing any earlier batch,
+        or adding to it when append is set.
+        extras, when given, holds one dict (or None) per sentence of further fields to
+        store and return with search results, e.g. the sentence's audio position.
+        Returns the number of rows added (0 if the content was already indexed).
+        """
+        if extras is None:
+            extras = [None] * len(sentences)
+        kept = [(s, extra) for s, extra in zip(sentences, extras) if s.strip()]
+        sentences = [s for s, _ in kept]
+        extras = [extra for _, extra in kept]
+        if not sentences:
+            return 0
+        date = date or datetime.date.today().isoformat()
+        content_hash = hashlib.sha256("\x00".join(sentences).encode("utf-8")).hexdigest()
+
+        # Embeddings come from the content-hash keyed store, so unchanged text is never re-encoded
+        embeddings = store.get_embeddings(sentences)
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            latest = self._latest_batch.get((meeting_id, source))
+            previous_hash = self._batch_hashes.get((meeting_id, source))
+            if append and latest is not None:
+                # The batch's hash now covers the appended sentences too, chained onto the previous one
+                content_hash = hashlib.sha256(f"{previous_hash}\x00{content_hash}".encode("utf-8")).hexdigest()
+            elif latest is not None and previous_hash == content_hash:
+                return 0
+
+            manifest = self._read_manifest()
+            if manifest["dim"] is None:
+                manifest["dim"] = int(embeddings.shape[1])
+                manifest["dtype"] = self.dtype.name
+            elif manifest["dim"] != embeddings.shape[1]:
+                raise ValueError(f"Embedding dimension {embeddings.shape[1]} does not match index ({manifest['dim']})")
+
+            start = manifest["count"]
+            batch = latest if append and latest is not None else start
+            with open(self._path("vectors.bin"), "r+b" if start else "wb") as f:
+                # Truncate any rows left behind by a writer that died before committing
+                f.truncate(start * manifest["dim"] * self.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(embeddings, dtype=self.dtype).tobytes())
+            meta_lines = [
+                json.dumps({
+                    "meeting_id": meeting_id,
+                    "date": date,
+                    "source": source,
+                    "text": sentence,
+                    "batch": batch,
+                    **({"hash": content_hash} if i == 0 else {}),
+                    **(extra or {}),
+                })
+                for i, (sentence, extra) in enumerate(zip(sentences, extras))
+            ]
+            manifest["meta_bytes"] = self._append_meta(manifest.get("meta_bytes", 0), meta_lines)
+            manifest["count"] = start + len(sentences)
+            self._write_manifest(manifest)
+            self._refresh()
+
+        logger.info(f"Indexed {len(sentences)} {source} sentences for meeting {meeting_id}")
+        return len(sentences)
+
+    def _append_meta(self, committed_bytes, lines):
+        """Appends metadata lines after the committed prefix and returns the new committed length."""
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        with open(self._path("meta.jsonl"), "r+b" if committed_bytes else "wb") as f:
+            # Drop uncommitted lines left by a writer that died before updating the manifest
+            f.truncate(committed_bytes)
+            f.seek(committed_bytes)
+            f.write(data)
+        return committed_bytes + len(data)
+
+    def build_ivf(self, nlist=None, iterations=10, sample_size=100000, seed=0):
+        """
+        Partitions the index into nlist clusters (IVF) with a few rounds of spherical k-means.
+        Searches then score only the rows in the nprobe partitions closest to the query.
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            count = self._loaded_count
+            if count <= 0:
+                return 0
+            nlist = nlist or max(1, int(np.sqrt(count)))
+            rng = np.random.default_rng(seed)
+            sample_idx = np.sort(rng.choice(count, size=min(sample_size, count), replace=False))
+            sample = np.asarray(self._vectors[sample_idx], dtype=np.float32)
+            centroids = sample[rng.choice(len(sample), size=min(nlist, len(sample)), replace=False)]
+            for _ in range(iterations):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(len(centroids)):
+                    members = sample[assign == c]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                        centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+            assign = np.empty(count, dtype=np.int32)
+            for start in range(0, count, self.block_rows):
+                block = np.asarray(self._vectors[start:start + self.block_rows], dtype=np.float32)
+                assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".npz.tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, centroids=centroids, assign=assign)
+            os.replace(tmp_path, self._path("ivf.npz"))
+            self._loaded_count = -1
+            self._refresh()
+        return len(centroids)
+
+    # --- search --------------------------------------------------------
+
+    def search(self, query, top_k=5, meeting_ids=None, date_from=None, date_to=None, sources=None, nprobe=None):
+        """
+        Returns the top_k rows most similar to query as dicts with text, score and metadata;
+        top_k must be at least 1 and is capped at MAX_TOP_K.
+        Filters: meeting_ids (iterable), date_from/date_to (inclusive ISO dates), sources (iterable).
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        top_k = min(top_k, MAX_TOP_K)
+        with self._lock:
+            self._refresh()
+            count = self._loaded_count
+            if count <= 0:
+                return []
+            vectors, offsets = self._vectors, self._offsets
+            mask = self._live.copy()
+            if meeting_ids:
+                mask &= np.isin(self._meeting_ids, list(meeting_ids))
+            if sources:
+                mask &= np.isin(self._sources, list(sources))
+            if date_from:
+                mask &= self._dates >= date_from
+            if date_to:
+                mask &= self._dates <= date_to
+            centroids, assign = self._ivf_centroids, self._ivf_assign
+
+        query_vec = encode_query(query).astype(np.float32)
+
+        if centroids is not None:
+            probes = np.argsort(centroids @ query_vec)[::-1][:nprobe or IVF_NPROBE]
+            mask &= np.isin(assign, probes)
+
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, len(candidates), self.block_rows):
+            rows = candidates[start:start + self.block_rows]
+            if rows[-1] - rows[0] + 1 == len(rows):
+                block = vectors[rows[0]:rows[-1] + 1]  # contiguous slice avoids a gather copy
+            else:
+                block = vectors[rows]
+            scores = np.asarray(block, dtype=np.float32) @ query_vec
+            best_scores = np.concatenate([best_scores, scores])
+            best_rows = np.concatenate([best_rows, rows])
+            if len(best_scores) > top_k:
+                keep = np.argpartition(best_scores, -top_k)[-top_k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(best_scores)[::-1]
+        results = []
+        for i, row in zip(order, self._read_rows(offsets[best_rows[order]])):
+            results.append({
+                "text": row["text"],
+                "score": round(float(best_scores[i]), 4),
+                "meeting_id": row["meeting_id"],
+                "date": row["date"],
+                "source": row["source"],
+                **{field: row[field] for field in RESULT_EXTRAS if field in row},
+            })
+        return results
+
+    def _read_rows(self, offsets):
+        """Reads the metadata lines at the given offsets of meta.jsonl."""
+        rows = []
+        with open(self._path("meta.jsonl"), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                rows.append(json.loads(f.readline()))
+        return rows
+
+    def stats(self):
+        with self._lock:
+            self._refresh()
+            return {
+                "rows": max(self._loaded_count, 0),
+                "live_rows": int(self._live.sum()) if self._live is not None else 0,
+                "meetings": len({m for m, _ in self._latest_batch}),
+                "dtype": self.dtype.name,
+                "ivf_partitions": len(self._ivf_centroids) if self._ivf_centroids is not None else 0,
+            }
+
+
+# Shared index for the whole process
+index = VectorIndex()
@@ -0,0 +1,322 @@
+# quickmeet-backend/video_jobs.py
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import re
+import shutil
+import socket
+import sqlite3
+import subprocess
+import tempfile
+import time
+import uuid
+from contextlib import closing
+
+from artifact_cache import ArtifactCache
+from heygen_client import client, poller, MAX_TEXT_CHARS, VIDEO_DEADLINE_SECONDS, PROCESSING, DOWNLOADING
+
+logger = logging.getLogger(__name__)
+
+VIDEO_DB_PATH = os.getenv("QUICKMEET_VIDEO_DB", "videos.db")
+VIDEO_OUTPUT_DIR = os.getenv("QUICKMEET_VIDEO_DIR", os.path.join("static", "videos"))
+# Rendered narration segments, keyed by text, avatar and voice
+SEGMENT_CACHE_DIR = os.getenv("QUICKMEET_VIDEO_SEGMENT_CACHE_DIR", os.path.join("cache", "video_segments"))
+SEGMENT_CACHE_MAX_ENTRIES = int(os.getenv("QUICKMEET_VIDEO_SEGMENT_CACHE_MAX_ENTRIES", "500"))
+FFMPEG_PATH = os.getenv("FFMPEG_PATH")
+# Average sentences per narration segment; fewer means smaller re-renders after an edit
+SENTENCES_PER_SEGMENT = 6
+
+COMPLETED, FAILED = "completed", "failed"
+
+# Shared cache for the whole process
+segment_cache = ArtifactCache(SEGMENT_CACHE_DIR, ".mp4", max_entries=SEGMENT_CACHE_MAX_ENTRIES)
+
+
+def _is_cut_point(sentence):
+    digest = hashlib.sha256(sentence.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % SENTENCES_PER_SEGMENT == 0
+
+
+def split_narration(text, max_chars=MAX_TEXT_CHARS - 1):
+    """
+    Splits narration into segments of at most max_chars characters, breaking between
+    sentences (and lines, so each action item stays whole). A single sentence longer than
+    max_chars is broken between words, and a longer word into pieces.
+
+    A segment ends at a paragraph break, after a sentence whose hash marks it as a cut
+    point, or when the next sentence would not fit. The boundaries depend only on the
+    sentences around them, so an edit changes the segments it falls in and every other
+    segment keeps its text, and its cached render.
+    """
+    sentences = []
+    for line in text.splitlines():
+        if not line.strip():
+            if sentences:
+                sentences[-1][1] = True
+            continue
+        for sentence in re.split(r"(?<=[.?!])\s+", line.strip()):
+            if len(sentence) <= max_chars:
+                if sentence:
+                    sentences.append([sentence, False])
+                continue
+            # A word longer than max_chars (e.g. a URL) is itself broken into max_chars pieces
+            words = [word[i:i + max_chars] for word in sentence.split() for i in range(0, len(word), max_chars)]
+            current = ""
+            for word in words:
+                if current and len(current) + 1 + len(word) > max_chars:
+                    sentences.append([current, False])
+                    current = ""
+                current = f"{current} {word}" if current else word
+            if current:
+                sentences.append([current, False])
+
+    segments, current = [], ""
+    for sentence, paragraph_end in sentences:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            segments.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+        if paragraph_end or _is_cut_point(sentence):
+            segments.append(current)
+            current = ""
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def segment_key(text, heygen_client=client):
+    """Cache key of a rendered segment: avatar, voice and the narrated text."""
+    payload = "\n".join([heygen_client.avatar_id, heygen_client.voice_id, text])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def concat_videos(paths, output_path):
+    """Joins segment videos into output_path with ffmpeg's concat demuxer (no re-encoding)."""
+    directory = os.path.dirname(output_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".mp4.part")
+    os.close(fd)
+    try:
+        if len(paths) == 1:
+            shutil.copyfile(paths[0], tmp_path)
+        else:
+            ffmpeg = FFMPEG_PATH or shutil.which("ffmpeg")
+            if not ffmpeg:
+                raise RuntimeError("ffmpeg is required to join narration segments; install it or set FFMPEG_PATH")
+            list_fd, list_path = tempfile.mkstemp(dir=directory, suffix=".txt")
+            try:
+                with os.fdopen(list_fd, "w", encoding="utf-8") as f:
+                    for path in paths:
+                        escaped = os.path.abspath(path).replace("'", r"'\''")
+                        f.write(f"file '{escaped}'\n")
+                subprocess.run(
+                    [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path,
+                     "-c", "copy", "-f", "mp4", tmp_path],
+                    check=True, capture_output=True,
+                )
+            finally:
+                os.unlink(list_path)
+        os.replace(tmp_path, output_path)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg failed: {e.stderr.decode('utf-8', 'replace').strip()}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return output_path
+
+
+async def render_narration(text, output_path, deadline_seconds=VIDEO_DEADLINE_SECONDS, on_update=None,
+                           heygen_client=client, video_poller=poller):
+    """
+    Renders narration of any length into output_path: the text is split into segments
+    HeyGen accepts, uncached segments are submitted concurrently and tracked by the poller,
+    and the segment videos are joined in order. on_update(status) runs on an executor
+    thread, so it may block.
+    Returns {"segments", "cached_segments"}.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = time.monotonic() + deadline_seconds
+    segments = split_narration(text)
+    if not segments:
+        raise ValueError("No narration text")
+    cached = 0
+
+    async def render_segment(segment):
+        nonlocal cached
+        key = segment_key(segment, heygen_client)
+        path = segment_cache.get_path(key)
+        if path:
+            cached += 1
+            return path
+        video_id = await loop.run_in_executor(None, heygen_client.submit, segment)
+        os.makedirs(segment_cache.cache_dir, exist_ok=True)
+        download_to = os.path.join(segment_cache.cache_dir, f"{key}.{uuid.uuid4().hex}.download")
+        await video_poller.poll(video_id, deadline, download_to=download_to)
+        return segment_cache.put_file(key, download_to)
+
+    if on_update:
+        await loop.run_in_executor(None, on_update, PROCESSING)
+    paths = await asyncio.gather(*(render_segment(segment) for segment in segments))
+    if on_update:
+        await loop.run_in_executor(None, on_update, DOWNLOADING)
+    await loop.run_in_executor(None, concat_videos, paths, output_path)
+    return {"segments": len(segments), "cached_segments": cached}
+
+
+class VideoJobs:
+    """
+    Video generation as background jobs: submit() returns a job id at once while the
+    shared poller renders the narration segments and joins them. Job state is kept in
+    SQLite, so any worker process can answer status requests.
+    """
+
+    def __init__(self, client, poller, db_path=VIDEO_DB_PATH, output_dir=VIDEO_OUTPUT_DIR,
+                 deadline_seconds=VIDEO_DEADLINE_SECONDS):
+        self.client = client
+        self.poller = poller
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.deadline_seconds = deadline_seconds
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS videos (
+                    id TEXT PRIMARY KEY,
+                    video_id TEXT,
+                    meeting_id TEXT,
+                    status TEXT NOT NULL,
+                    segments INTEGER,
+                    cached_segments INTEGER,
+                    path TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            # Databases from earlier versions lack the segment counts and the owner
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(videos)")}
+            for column, kind in (("segments", "INTEGER"), ("cached_segments", "INTEGER"), ("owner", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE videos ADD COLUMN {column} {kind}")
+            self._initialized = True
+        return conn
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with closing(self._connect()) as conn:
+            conn.execute(f"UPDATE videos SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def submit(self, text, output_path=None, meeting_id=None, on_complete=None):
+        """
+        Queues narration of text and returns a job id. The video is written to
+        output_path (by default <output_dir>/<job id>.mp4); on_complete(path) is called
+        from the poller thread once it is there.
+        """
+        segments = split_narration(text)
+        if not segments:
+            raise ValueError("No narration text")
+        job_id = uuid.uuid4().hex
+        output_path = output_path or os.path.join(self.output_dir, f"{job_id}.mp4")
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """INSERT INTO videos (id, meeting_id, status, segments, path, owner, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (job_id, meeting_id, PROCESSING, len(segments), output_path, _owner(), now, now),
+            )
+        self.poller.run(self._run(job_id, text, output_path, on_complete))
+        return job_id
+
+    async def _run(self, job_id, text, output_path, on_complete):
+        # SQLite and on_complete block, so they run on executor threads, off the poller's loop
+        loop = asyncio.get_running_loop()
+        try:
+            result = await render_narration(
+                text, output_path, self.deadline_seconds,
+                on_update=lambda status: self._update(job_id, status=status),
+                heygen_client=self.client, video_poller=self.poller,
+            )
+            await loop.run_in_executor(None, self._complete, job_id, output_path, result, on_complete)
+        except Exception as e:
+            logger.error(f"Video job {job_id} failed: {e}")
+            await loop.run_in_executor(None, functools.partial(self._update, job_id, status=FAILED, error=str(e)))
+
+    def _complete(self, job_id, output_path, result, on_complete):
+        if on_complete:
+            on_complete(output_path)
+        self._update(job_id, status=COMPLETED, **result)
+
+    def recover(self):
+        """
+        Fails the jobs left unfinished by a process that is gone: one on this host whose
+        pid no longer runs, or any job older than the render deadline. Segments that
+        finished rendering are cached, so submitting the video again is cheap.
+        Returns the number of jobs failed.
+        """
+        host = socket.gethostname()
+        stale_before = time.time() - self.deadline_seconds - 60
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT id, owner, created_at FROM videos WHERE status IN (?, ?)", (PROCESSING, DOWNLOADING),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not check for unfinished video jobs: {e}")
+            return 0
+        failed = 0
+        for row in rows:
+            owner_host, _, owner_pid = (row["owner"] or "").rpartition(":")
+            gone = owner_host == host and owner_pid.isdigit() and not _pid_alive(int(owner_pid))
+            if gone or row["created_at"] < stale_before:
+                with closing(self._connect()) as conn:
+                    cursor = conn.execute(
+                        "UPDATE videos SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                        (FAILED, "Interrupted by a server restart; submit the video again", time.time(), row["id"],
+                         PROCESSING, DOWNLOADING),
+                    )
+                failed += cursor.rowcount
+        if failed:
+            logger.warning(f"Failed {failed} video jobs left unfinished by a stopped process")
+        return failed
+
+    def get(self, job_id):
+        """Returns the job status dict, or None if the id is unknown."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM videos WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def wait(self, job_id, timeout=None, poll_interval=0.5):
+        """Blocks until the job finishes and returns its status dict."""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.deadline_seconds + 60)
+        while True:
+            job = self.get(job_id)
+            if job["status"] in (COMPLETED, FAILED) or time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+
+# Shared jobs for the whole process
+jobs = VideoJobs(client, poller)
@@ -0,0 +1,10 @@
+# quickmeet-backend/wsgi.py
+"""
+Production entry point:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`python app.py` runs Flask's single-threaded development server with the reloader,
+which is not meant for production traffic.
+"""
+from app import app  # noqa: F401